@@ -9,6 +9,7 @@ from minerva.api.routes.stripe import stripe_routes, stripe_webhooks
 from minerva.config import logging_config
 from minerva.core.services.browser_service import browser_service_instance
 from minerva.core.database.database import client
+from minerva.core.database.indexes import MONGO_ENSURE_INDEXES, ensure_indexes
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -104,6 +105,12 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Startup error: {e}")
 
+    if MONGO_ENSURE_INDEXES:
+        try:
+            await ensure_indexes()
+        except Exception as e:
+            logger.error(f"Index bootstrap failed: {e}")
+
 @app.on_event("shutdown")
 async def shutdown_event():
     client.close()
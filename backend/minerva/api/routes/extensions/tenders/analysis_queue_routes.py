@@ -90,20 +90,15 @@ async def clear_analysis_queue(current_user: User = Depends(get_current_user)):
     try:
         queue = AnalysisQueue()  # Use default Redis URL handling
         
-        # Clear the main queue
-        await queue.redis.delete("analysis_queue")
-        
-        # Clear task metadata (be careful in production)
-        keys = await queue.redis.keys("analysis_task:*")
-        if keys:
-            await queue.redis.delete(*keys)
+        # Clear the main queue and task metadata (be careful in production)
+        cleared_keys = await queue.clear()
         
         logger.info(f"Queue cleared by user {current_user.email}")
         
         return {
             "status": "success",
             "message": "Analysis queue cleared successfully",
-            "cleared_keys": len(keys)
+            "cleared_keys": cleared_keys
         }
     except Exception as e:
         logger.error(f"Error clearing queue: {str(e)}")
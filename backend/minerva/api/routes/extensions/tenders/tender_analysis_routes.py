@@ -1,9 +1,10 @@
 import asyncio
+import base64
 import os
 from pathlib import Path
-from pprint import pprint
 import shutil
 import tempfile
+import time
 from uuid import uuid4
 from minerva.tasks.sources.helpers import assign_order_numbers
 from minerva.core.helpers.s3_upload import delete_files_from_s3
@@ -20,7 +21,7 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 from minerva.core.middleware.auth.jwt import get_current_user
-from minerva.core.models.extensions.tenders.tender_analysis import CriteriaAnalysisUpdate, AnalysisCriteria, FilterStage, TenderAnalysis, TenderAnalysisResult, FilteredTenderAnalysisResult, TenderAnalysisResultSummary, TableLayout, ColumnConfiguration, ColumnConfigurationRequest, TableLayoutResponse, TableLayoutUpdate
+from minerva.core.models.extensions.tenders.tender_analysis import CriteriaAnalysisUpdate, AnalysisCriteria, FilterStage, TenderAnalysis, TenderAnalysisResult, FilteredTenderAnalysisResult, TenderAnalysisResultSummary, TableLayout, ColumnConfiguration, ColumnConfigurationRequest, TableLayoutResponse, TableLayoutUpdate, parse_submission_deadline
 from minerva.core.models.request.tender_analysis import (
     TenderAnalysisCreate,
     TenderAnalysisResultUpdate,
@@ -32,6 +33,7 @@ from minerva.core.services.keyword_search.elasticsearch import es_client
 from minerva.core.models.user import User
 from minerva.core.models.utils import PyObjectId
 from minerva.core.database.database import db
+from minerva.core.database.submission_deadline_backfill import backfill_submission_deadlines
 from bson import ObjectId
 from pydantic import ValidationError, BaseModel, Field
 import pytz
@@ -638,6 +640,7 @@ async def get_tender_analysis_results(
     include_criteria_for_filtering: bool = False,
     include_filtered: bool = False,  # NEW parameter
     include_external: bool = False,  # NEW parameter for external tenders
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -652,6 +655,7 @@ async def get_tender_analysis_results(
         include_criteria_for_filtering: Include minimal criteria data for client-side filtering
         include_filtered: Include filtered out tenders in the results
         include_external: Include external tenders in the results
+        cursor: next_cursor of the previous page; takes precedence over page
         current_user: Current authenticated user
     """
     try:
@@ -680,18 +684,19 @@ async def get_tender_analysis_results(
             )
         
         # Fetch results with the updated logic - now all from one collection
-        results, total = await _fetch_tender_results_paginated(
+        results, total, next_cursor = await _fetch_tender_results_paginated(
             analysis_id=analysis_id,
             include_historical=include_historical,
             include_criteria_for_filtering=include_criteria_for_filtering,
             include_filtered=include_filtered,
             include_external=include_external,
             page=page,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
         
         logger.info(f"Returning {len(results)} results (total: {total})")
-        payload = {"results": results, "total": total}
+        payload = {"results": results, "total": total, "next_cursor": next_cursor}
         return Response(
             content=json.dumps(payload, default=str, ensure_ascii=False),
             media_type="application/json",
@@ -708,6 +713,51 @@ async def get_tender_analysis_results(
         )
 
 
+# How long a results total is reused while paging through the same listing
+RESULTS_TOTAL_CACHE_SECONDS = int(os.getenv("RESULTS_TOTAL_CACHE_SECONDS", "60"))
+_results_total_cache: Dict[tuple, tuple] = {}
+
+
+def _encode_results_cursor(doc: dict) -> str:
+    created_at = doc.get("created_at")
+    payload = {
+        "c": created_at.isoformat() if isinstance(created_at, datetime) else None,
+        "id": str(doc["_id"]),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def _decode_results_cursor(cursor: str) -> dict:
+    """Match condition for the results after `cursor` in (created_at desc, _id desc) order"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        last_id = ObjectId(payload["id"])
+        created_at = datetime.fromisoformat(payload["c"]) if payload.get("c") else None
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if created_at is None:
+        # Results without created_at sort last; only the _id tiebreak is left
+        return {"created_at": None, "_id": {"$lt": last_id}}
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": last_id}},
+        {"created_at": None},
+    ]}
+
+
+async def _count_tender_results(cache_key: tuple, match_condition: dict) -> int:
+    cached = _results_total_cache.get(cache_key)
+    now = time.monotonic()
+    if cached and now - cached[0] < RESULTS_TOTAL_CACHE_SECONDS:
+        return cached[1]
+    total = await db.tender_analysis_results.count_documents(match_condition)
+    # Drop expired entries so the cache stays bounded by the analyses actually being viewed
+    for key in [k for k, (at, _) in _results_total_cache.items() if now - at >= RESULTS_TOTAL_CACHE_SECONDS]:
+        del _results_total_cache[key]
+    _results_total_cache[cache_key] = (now, total)
+    return total
+
+
 async def _fetch_tender_results_paginated(
     analysis_id: PyObjectId, 
     include_historical: bool, 
@@ -715,17 +765,15 @@ async def _fetch_tender_results_paginated(
     include_filtered: bool,
     include_external: bool,
     page: int,
-    limit: int
-) -> tuple[list, int]:
+    limit: int,
+    cursor: Optional[str] = None
+) -> tuple[list, int, Optional[str]]:
     """
-    Fetch tender analysis results with pagination support
-    Now handles main, filtered, and external results from the same collection
+    Fetch tender analysis results newest first, with keyset pagination over
+    (created_at, _id) when a cursor is given and offset pagination otherwise.
+    Handles main, filtered, and external results from the same collection.
+    Returns (results, total, next_cursor); totals are cached briefly per listing.
     """
-    current_date = datetime.utcnow()
-    
-    # Calculate skip for pagination
-    skip = (page - 1) * limit
-    
     # Build base match condition
     match_condition = {"tender_analysis_id": analysis_id}
     
@@ -752,187 +800,45 @@ async def _fetch_tender_results_paginated(
             ]
         })
     
-    # Apply the status filtering
-    match_condition["$or"] = status_conditions
-    
-    if include_historical:
-        # Simple query without deadline filtering for historical results
-        pipeline = [
-            {"$match": match_condition},
-            {"$project": _get_table_projection_with_criteria() if include_criteria_for_filtering else _get_projection_for_results(include_criteria_for_filtering)},
-            {"$sort": {"created_at": -1}},
-            {"$skip": skip},
-            {"$limit": limit}
-        ]
-        
-        # Get total count
-        total = await db.tender_analysis_results.count_documents(match_condition)
-    else:
-        # Filter by future submission deadlines while preserving status filtering
-        deadline_match = {
-            **match_condition,
-            "tender_metadata.submission_deadline": {"$exists": True, "$ne": None, "$ne": ""}
-        }
-        
-        pipeline = [
-            {"$match": deadline_match},
-            {
-                "$addFields": {
-                    "parsed_deadline": {
-                        "$switch": {
-                            "branches": [
-                                {
-                                    "case": {
-                                        "$regexMatch": {
-                                            "input": "$tender_metadata.submission_deadline",
-                                            "regex": r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}$"
-                                        }
-                                    },
-                                    "then": {
-                                        "$dateFromString": {
-                                            "dateString": "$tender_metadata.submission_deadline",
-                                            "format": "%Y-%m-%d %H:%M",
-                                            "onError": None
-                                        }
-                                    }
-                                },
-                                {
-                                    "case": {
-                                        "$regexMatch": {
-                                            "input": "$tender_metadata.submission_deadline",
-                                            "regex": r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}$"
-                                        }
-                                    },
-                                    "then": {
-                                        "$dateFromString": {
-                                            "dateString": "$tender_metadata.submission_deadline",
-                                            "format": "%d/%m/%Y %H:%M:%S",
-                                            "onError": None
-                                        }
-                                    }
-                                },
-                                {
-                                    "case": {
-                                        "$regexMatch": {
-                                            "input": "$tender_metadata.submission_deadline",
-                                            "regex": r"^\d{4}-\d{2}-\d{2}$"
-                                        }
-                                    },
-                                    "then": {
-                                        "$dateFromString": {
-                                            "dateString": "$tender_metadata.submission_deadline",
-                                            "format": "%Y-%m-%d",
-                                            "onError": None
-                                        }
-                                    }
-                                }
-                            ],
-                            "default": None
-                        }
-                    }
-                }
-            },
-            {
-                "$match": {
-                    "$or": [
-                        {"parsed_deadline": {"$gt": current_date}},
-                        {"parsed_deadline": None}
-                    ]
-                }
-            },
-            {"$project": _get_table_projection_with_criteria() if include_criteria_for_filtering else _get_projection_for_results(include_criteria_for_filtering)},
-            {"$sort": {"created_at": -1}},
-            {"$skip": skip},
-            {"$limit": limit}
-        ]
+    conditions = [match_condition, {"$or": status_conditions}]
 
-        # Get total count of future deadlines for this analysis with status filtering
-        count_pipeline = [
-            {"$match": deadline_match},
-            {
-                "$addFields": {
-                    "parsed_deadline": {
-                        "$switch": {
-                            "branches": [
-                                {
-                                    "case": {
-                                        "$regexMatch": {
-                                            "input": "$tender_metadata.submission_deadline",
-                                            "regex": r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}$"
-                                        }
-                                    },
-                                    "then": {
-                                        "$dateFromString": {
-                                            "dateString": "$tender_metadata.submission_deadline",
-                                            "format": "%Y-%m-%d %H:%M",
-                                            "onError": None
-                                        }
-                                    }
-                                },
-                                {
-                                    "case": {
-                                        "$regexMatch": {
-                                            "input": "$tender_metadata.submission_deadline",
-                                            "regex": r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}$"
-                                        }
-                                    },
-                                    "then": {
-                                        "$dateFromString": {
-                                            "dateString": "$tender_metadata.submission_deadline",
-                                            "format": "%d/%m/%Y %H:%M:%S",
-                                            "onError": None
-                                        }
-                                    }
-                                },
-                                {
-                                    "case": {
-                                        "$regexMatch": {
-                                            "input": "$tender_metadata.submission_deadline",
-                                            "regex": r"^\d{4}-\d{2}-\d{2}$"
-                                        }
-                                    },
-                                    "then": {
-                                        "$dateFromString": {
-                                            "dateString": "$tender_metadata.submission_deadline",
-                                            "format": "%Y-%m-%d",
-                                            "onError": None
-                                        }
-                                    }
-                                }
-                            ],
-                            "default": None
-                        }
-                    }
-                }
-            },
-            {
-                "$match": {
-                    "$or": [
-                        {"parsed_deadline": {"$gt": current_date}},
-                        {"parsed_deadline": None}
-                    ]
-                }
-            },
-            {"$count": "total"}
-        ]
+    if not include_historical:
+        # Future deadlines only; results whose deadline could not be parsed stay visible
+        conditions.append({"tender_metadata.submission_deadline": {"$exists": True, "$nin": [None, ""]}})
+        conditions.append({"$or": [
+            {"submission_deadline_at": {"$gt": datetime.utcnow()}},
+            {"submission_deadline_at": None},
+        ]})
+
+    listing_match = {"$and": conditions}
+    total = await _count_tender_results(
+        (str(analysis_id), include_historical, include_filtered, include_external),
+        listing_match
+    )
 
-        count_result = await db.tender_analysis_results.aggregate(count_pipeline).to_list(None)
-        total = count_result[0]["total"] if count_result else 0
+    pipeline = [
+        {"$match": {"$and": conditions + [_decode_results_cursor(cursor)]} if cursor else listing_match},
+        {"$sort": {"created_at": -1, "_id": -1}},
+    ]
+    if not cursor and page > 1:
+        pipeline.append({"$skip": (page - 1) * limit})
+    pipeline.extend([
+        {"$limit": limit},
+        {"$project": _get_table_projection_with_criteria() if include_criteria_for_filtering else _get_projection_for_results(include_criteria_for_filtering)},
+    ])
 
-    # Execute the aggregation pipeline
     raw_results = await db.tender_analysis_results.aggregate(pipeline).to_list(None)
-    
-    # Convert ObjectId instances to strings and ensure status field is present
+    next_cursor = _encode_results_cursor(raw_results[-1]) if len(raw_results) == limit else None
+
+    # Convert ObjectId instances to strings
     def _stringify_ids(doc):
         for k in ("_id", "tender_analysis_id", "user_id"):
             if k in doc and isinstance(doc[k], ObjectId):
                 doc[k] = str(doc[k])
-            if doc.get("status", "") == "external":
-                pprint(doc)
         return doc
 
     results = [_stringify_ids(r) for r in raw_results]
-    return results, total
+    return results, total, next_cursor
 
 @router.get("/tender-analysis/{analysis_id}/results/all")
 async def get_all_tender_analysis_results(
@@ -1199,6 +1105,12 @@ async def update_tender_result(
         if not update_dict:
             return TenderAnalysisResult(**existing)
         
+        # Listings filter on the stored deadline; keep it in step with edited metadata
+        if "tender_metadata" in update_dict:
+            update_dict["submission_deadline_at"] = parse_submission_deadline(
+                update_dict["tender_metadata"].get("submission_deadline")
+            )
+        
         # Perform update
         await db.tender_analysis_results.update_one(
             {"_id": result_id},
@@ -2556,6 +2468,11 @@ async def fix_platforma_zakupowa_deadlines(
             },
             pipeline
         )
+        # Keep the parsed deadline in sync with the rewritten strings
+        await backfill_submission_deadlines(
+            {"tender_analysis_id": analysis_id, "source_type": "platformazakupowa"},
+            recompute=True
+        )
 
         return {
             "message": "Deadline correction process completed for Platforma Zakupowa results.",
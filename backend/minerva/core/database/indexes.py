@@ -0,0 +1,134 @@
+"""
+Create the MongoDB indexes declared in minerva.core.models.indexes.
+
+Idempotent: existing indexes matching their spec are left alone. Indexes
+whose live definition differs from the registry are reported as drift and
+not touched, and indexes that are not in the registry are reported as
+unused (with their $indexStats usage count); dropping them is opt-in.
+
+    python -m minerva.core.database.indexes            # create missing, report
+    python -m minerva.core.database.indexes --check    # report only, exit 1 on missing/drift
+    python -m minerva.core.database.indexes --drop-unused
+"""
+import argparse
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from minerva.core.models.indexes import INDEXES
+
+logger = logging.getLogger(__name__)
+
+MONGO_ENSURE_INDEXES = os.getenv("MONGO_ENSURE_INDEXES", "true").lower() == "true"
+
+# Options that make two indexes on the same keys behave differently
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+
+def _spec(document: Dict[str, Any]) -> Dict[str, Any]:
+    # Older servers report key directions as floats
+    spec = {"key": [(field, int(d) if isinstance(d, float) else d) for field, d in dict(document["key"]).items()]}
+    for option in _COMPARED_OPTIONS:
+        if document.get(option) not in (None, False):
+            spec[option] = document[option]
+    return spec
+
+
+async def _usage(collection) -> Dict[str, int]:
+    try:
+        stats = await collection.aggregate([{"$indexStats": {}}]).to_list(None)
+        return {s["name"]: s["accesses"]["ops"] for s in stats}
+    except OperationFailure as e:
+        # $indexStats needs clusterMonitor on some deployments
+        logger.debug(f"$indexStats unavailable for {collection.name}: {e}")
+        return {}
+
+
+async def ensure_indexes(
+    database=None,
+    registry: Optional[Dict[str, List[IndexModel]]] = None,
+    create: bool = True,
+    drop_unused: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Bring `database` in line with `registry` (the INDEXES registry by default)
+    and return a per-collection report with the names of created, missing,
+    drifted and unused indexes.
+    """
+    if database is None:
+        from minerva.core.database.database import db as database
+    registry = INDEXES if registry is None else registry
+
+    report: Dict[str, Dict[str, Any]] = {}
+    for collection_name, models in registry.items():
+        collection = database[collection_name]
+        existing = await collection.index_information()
+        entry = {"created": [], "missing": [], "drift": [], "unused": {}}
+
+        for model in models:
+            wanted = model.document
+            name = wanted["name"]
+            if name in existing:
+                if _spec(existing[name]) != _spec(wanted):
+                    entry["drift"].append(name)
+                    logger.warning(
+                        f"Index {collection_name}.{name} differs from its definition: "
+                        f"live {_spec(existing[name])}, expected {_spec(wanted)}"
+                    )
+                continue
+            if not create:
+                entry["missing"].append(name)
+                continue
+            try:
+                await collection.create_indexes([model])
+                entry["created"].append(name)
+                logger.info(f"Created index {collection_name}.{name}")
+            except OperationFailure as e:
+                # Same keys under another name/options, or data violating a unique spec
+                entry["drift"].append(name)
+                logger.error(f"Could not create index {collection_name}.{name}: {e}")
+
+        declared = {model.document["name"] for model in models}
+        extra = [name for name in existing if name != "_id_" and name not in declared]
+        if extra:
+            usage = await _usage(collection)
+            for name in extra:
+                entry["unused"][name] = usage.get(name)
+                if drop_unused:
+                    await collection.drop_index(name)
+                    logger.info(f"Dropped index {collection_name}.{name} (not in registry)")
+                else:
+                    logger.info(
+                        f"Index {collection_name}.{name} is not in the registry "
+                        f"(ops since restart: {usage.get(name, 'unknown')})"
+                    )
+
+        report[collection_name] = entry
+    return report
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Create and check MongoDB indexes")
+    parser.add_argument("--check", action="store_true", help="Only report; exit 1 on missing or drifted indexes")
+    parser.add_argument("--drop-unused", action="store_true", help="Drop indexes not declared in the registry")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    report = asyncio.run(ensure_indexes(create=not args.check, drop_unused=args.drop_unused and not args.check))
+    for collection_name, entry in report.items():
+        for kind in ("created", "missing", "drift"):
+            for name in entry[kind]:
+                print(f"{kind:8} {collection_name}.{name}")
+        for name, ops in entry["unused"].items():
+            print(f"{'unused':8} {collection_name}.{name} ops={ops}")
+
+    if args.check and any(entry["missing"] or entry["drift"] for entry in report.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,69 @@
+"""
+Backfill tender_analysis_results.submission_deadline_at from
+tender_metadata.submission_deadline for results stored before the field
+existed (new results get it from TenderAnalysisResult).
+
+    python -m minerva.core.database.submission_deadline_backfill
+    python -m minerva.core.database.submission_deadline_backfill --recompute
+"""
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from pymongo import UpdateOne
+
+from minerva.core.models.extensions.tenders.tender_analysis import parse_submission_deadline
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_submission_deadlines(
+    query: Optional[Dict[str, Any]] = None,
+    recompute: bool = False,
+    batch_size: int = 1000,
+    database=None,
+) -> int:
+    """
+    Set submission_deadline_at on results matching `query`. Only results
+    without the field are touched unless `recompute` is set, e.g. after
+    tender_metadata.submission_deadline was rewritten in place. Returns the
+    number of updated results.
+    """
+    if database is None:
+        from minerva.core.database.database import db as database
+
+    match = dict(query or {})
+    if not recompute:
+        match["submission_deadline_at"] = {"$exists": False}
+
+    updated = 0
+    updates = []
+    cursor = database.tender_analysis_results.find(match, {"tender_metadata.submission_deadline": 1})
+    async for doc in cursor:
+        deadline = parse_submission_deadline((doc.get("tender_metadata") or {}).get("submission_deadline"))
+        updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"submission_deadline_at": deadline}}))
+        if len(updates) >= batch_size:
+            result = await database.tender_analysis_results.bulk_write(updates, ordered=False)
+            updated += result.modified_count
+            updates = []
+    if updates:
+        result = await database.tender_analysis_results.bulk_write(updates, ordered=False)
+        updated += result.modified_count
+
+    logger.info(f"Backfilled submission_deadline_at on {updated} tender results")
+    return updated
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="Backfill submission_deadline_at on tender results")
+    parser.add_argument("--recompute", action="store_true", help="Recompute the field on every result")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    updated = asyncio.run(backfill_submission_deadlines(recompute=args.recompute, batch_size=args.batch_size))
+    print(f"updated {updated}")
+
+
+if __name__ == "__main__":
+    _main()
@@ -1,7 +1,6 @@
 import os
 import json
 import re
-from urllib.parse import urlparse
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 import logging
@@ -11,6 +10,7 @@ from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysi
 from minerva.tasks.services.search_service import perform_tender_search
 from minerva.tasks.services.tender_initial_ai_filtering_service import perform_ai_filtering
 from minerva.core.database.database import db
+from minerva.core.helpers.tender_matching import pair_tenders
 
 def normalize_eb2b_id(tender_id: str) -> str:
     """Normalize eb2b.com.pl tender IDs to a canonical format."""
@@ -29,109 +29,6 @@ def as_dict(t):
         return t.dict()
     return dict(t if isinstance(t, dict) else vars(t))
 
-GENERIC_ORG_TOKENS: set = {
-    # ── administrative units ───────────────────────────────────────────────
-    "gmina", "gminy", "gminie", "gminę",                                # all cases
-    "miasto", "miasta", "miejski", "miejska", "miejskie",
-    "miejsko-wiejska", "miejsko-wiejskiej",
-    "powiat", "powiatu", "powiatowy", "powiatowa", "powiatowe",
-    "powiatowych", "starostwo", "starosta", "starosty", "starostwie",
-    "województwo", "wojewodztwo", "wojewódzki", "wojewodzki",
-    "wojewódzka", "wojewodzka", "wojewódzkie", "wojewodzkie",
-    "urząd", "urzad", "urzad_miasta", "urząd_miasta",
-    "urzad_gminy", "urząd_gminy", "urząd_marszałkowski",
-    "urzad_marszalkowski",
-
-    # ── institutional nouns ───────────────────────────────────────────────
-    "biuro", "wydział", "wydzial", "centrum", "jednostka",
-    "zakład", "zaklad", "zespół", "zespol", "ośrodek", "osrodek",
-    "instytucja", "organizacja", "komenda", "komenda_powiatowa",
-    "szpital", "przychodnia", "dom", "dom_kultury", "biblioteka",
-    "cuk", "cukit",
-
-    # ── sector adjectives / nouns ─────────────────────────────────────────
-    "komunalny", "komunalna", "komunalne", "komunalnych",
-    "techniczny", "techniczna", "techniczne", "technicznych",
-    "publiczny", "publiczna", "publiczne", "publicznych",
-    "samorządowy", "samorzadowy", "samorządowa", "samorządowe",
-    "usług", "uslug", "usługowy", "uslugowy", "usługowych", "uslugowych",
-    "mieszkaniowy", "mieszkaniowa", "mieszkaniowe",
-
-    # ── legal forms: “spółka …”, “SA”, “SK-A”, etc. ───────────────────────
-    "spółka", "spolka", "sp", "sp.",
-    "spółka_jawna", "sj", "s.j.", "spj",
-    "spółka_komandytowa", "sk", "s.k.", "sk-a", "spk", "sp.k.",
-    "spółka_komandytowo-akcyjna", "ska", "s.k.a.",
-    "spółka_akcyjna", "sa", "s.a.", "s.a",
-    "psa", "p.s.a.",                                              # prosta S.A.
-    "z", "oo", "o.o.", "zoo", "z_o_o", "z.o.o", "z.o.o.",
-    "sp_z_oo", "sp_z_o_o", "sp._z_o.o.",                          # all dots/spaces
-    "z_ograniczoną_odpowiedzialnością", "z_ograniczona_odpowiedzialnoscia",
-
-    # ── assorted abbreviations often seen in sigla ───────────────────────
-    "ag", "ti", "zzp", "dkw", "pcpr", "pcpr-powiat", "pcp", "pc", "zdp",
-    "pgk", "pgm", "pgn", "mpgn", "mpgk", "mpwik", "pgwik", "zgkim",
-}
-STOPWORDS = GENERIC_ORG_TOKENS | {"w", "im", "przy", "dla"}
-
-def is_same_tender(a: dict, b: dict) -> bool:
-    LEGAL_SUFFIXES = (
-        r"\b(sp[.\s]*z[.\s]*o[.\s]*o[.]?)\b",
-        r"\b(spółka z\s+ograniczoną\s+odpowiedzialnością)\b",
-        r"\b(gmina)\b",
-        r"\b(cukit|cul|cuk)\b",
-    )
-    LEGAL_SUFFIX_RX = re.compile("|".join(LEGAL_SUFFIXES), re.I)
-    NOTICE_ID_RX = re.compile(r"/(\d{4,})(?:/|$)")
-    STOPWORDS = (GENERIC_ORG_TOKENS or set()) | {"w", "im", "przy", "dla"}
-    def normalise(txt: str | None) -> str:
-        if not txt:
-            return ""
-        txt = re.sub(rf"[„”\"',()\-–{re.escape('.:/')}]", " ", txt.lower())
-        txt = LEGAL_SUFFIX_RX.sub(" ", txt)
-        txt = re.sub(r"\s+", " ", txt).strip()
-        return txt
-    def extract_numeric_id(url: str | None, title: str | None) -> str | None:
-        if url:
-            m = NOTICE_ID_RX.search(url)
-            if m:
-                host = urlparse(url).hostname or ""
-                return f"{host}:{m.group(1)}"
-        if title:
-            m = NOTICE_ID_RX.search(title)
-            if m:
-                return m.group(1)
-        return None
-    def portal_family(url: str | None) -> str:
-        if not url:
-            return ""
-        host = urlparse(url).hostname or ""
-        parts = host.lower().split(".")
-        return ".".join(parts[-2:]) if len(parts) >= 2 else host.lower()
-    def distinctive_tokens(org: str) -> set[str]:
-        return {tok for tok in org.split() if tok and tok not in STOPWORDS}
-    ida = extract_numeric_id(a.get("id"), a.get("name"))
-    idb = extract_numeric_id(b.get("id"), b.get("name"))
-    if ida and idb and ida == idb:
-        return True
-    if portal_family(a.get("id")) != portal_family(b.get("id")):
-        return False
-    org_a = normalise(a.get("organization"))
-    org_b = normalise(b.get("organization"))
-    if distinctive_tokens(org_a).isdisjoint(distinctive_tokens(org_b)):
-        return False
-    name_a = normalise(a.get("name"))
-    name_b = normalise(b.get("name"))
-    from rapidfuzz import fuzz
-    title_score = fuzz.token_set_ratio(name_a, name_b) / 100
-    if title_score >= 0.93:
-        return True
-    tokens_a, tokens_b = set(name_a.split()), set(name_b.split())
-    shorter, longer = (tokens_a, tokens_b) if len(tokens_a) < len(tokens_b) else (tokens_b, tokens_a)
-    if shorter.issubset(longer):
-        return title_score >= 0.80
-    return False
-
 def extract_tenders_from_file(json_path):
     with open(json_path, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -257,20 +154,10 @@ def calculate_tender_differences(oferent_filtered_tenders, search_filtered_tende
     oferent_tenders = [as_dict(t) for t in oferent_filtered_tenders]
     search_tenders = [as_dict(t) for t in search_filtered_tenders]
     matched_oferent, matched_search, overlaps = set(), set(), []
-    for i, t_o in enumerate(oferent_tenders):
-        for j, t_s in enumerate(search_tenders):
-            if j in matched_search:
-                continue
-            if t_o.get("id") == t_s.get("id"):
-                overlaps.append(t_o | {"matched_with": t_s["id"]})
-                matched_oferent.add(i)
-                matched_search.add(j)
-                break
-            if is_same_tender(t_o, t_s):
-                overlaps.append(t_o | {"matched_with": t_s["id"]})
-                matched_oferent.add(i)
-                matched_search.add(j)
-                break
+    for i, j, _ in pair_tenders(oferent_tenders, search_tenders):
+        overlaps.append(oferent_tenders[i] | {"matched_with": search_tenders[j]["id"]})
+        matched_oferent.add(i)
+        matched_search.add(j)
     unique_to_oferent = [t for i, t in enumerate(oferent_tenders) if i not in matched_oferent]
     unique_to_search  = [t for j, t in enumerate(search_tenders) if j not in matched_search]
     return {
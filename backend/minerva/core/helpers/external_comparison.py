@@ -1,7 +1,7 @@
 from datetime import datetime, date
 from pprint import pprint
 from typing import List, Dict, Optional, Tuple
-from minerva.core.helpers.biznespolska_oferent_shared import is_same_tender
+from minerva.core.helpers.tender_matching import pair_tenders
 from pymongo.database import Database
 from bson import ObjectId
 from urllib.parse import urlparse
@@ -42,50 +42,39 @@ class TenderExternalComparison:
         
         matched_external, matched_internal, overlaps = set(), set(), []
         
-        # Find overlaps between external and internal results
-        for i, t_ext in enumerate(external_tenders):
-            external_url = t_ext.get("external_best_url", "")
-            
-            for j, t_int in enumerate(internal_tenders):
-                if j in matched_internal:
-                    continue
-                
-                internal_url = t_int.get("tender_url", "")
-                
-                a = {
-                        "id": external_url,
-                        "name": t_ext.get("tender_metadata", {}).get("name", ""),
-                        "organization": t_ext.get("tender_metadata", {}).get("organization", "")
-                    }
-                b = {
-                        "id": internal_url,
-                        "name": t_int.get("tender_metadata", {}).get("name", ""),
-                        "organization": t_int.get("tender_metadata", {}).get("organization", "")
-                    }
-                
-                if internal_url == external_url:
-                    overlap_record = {
-                        "external_id": t_ext["id"],
-                        "internal_id": t_int["id"],
-                        "match_type": "id_match"
-                    }
-                    overlaps.append(overlap_record)
-                    matched_external.add(i)
-                    matched_internal.add(j)
-                    break   
-                elif is_same_tender(a, b):
-                    overlap_record = {
-                        "external_id": t_ext["id"],
-                        "internal_id": t_int["id"],
-                        "match_type": "url_match",
-                        "external_url": external_url,
-                        "internal_url": internal_url
-                    }
-                    overlaps.append(overlap_record)
-                    matched_external.add(i)
-                    matched_internal.add(j)
-                    break
-        
+        def comparable(tender: Dict, url_field: str) -> Dict:
+            return {
+                "id": tender.get(url_field, ""),
+                "name": tender.get("tender_metadata", {}).get("name", ""),
+                "organization": tender.get("tender_metadata", {}).get("organization", "")
+            }
+
+        # Find overlaps between external and internal results; candidates are
+        # blocked on notice number and organisation tokens instead of comparing all pairs
+        pairs = pair_tenders(
+            [comparable(t, "external_best_url") for t in external_tenders],
+            [comparable(t, "tender_url") for t in internal_tenders]
+        )
+        for i, j, urls_equal in pairs:
+            t_ext, t_int = external_tenders[i], internal_tenders[j]
+            if urls_equal:
+                overlap_record = {
+                    "external_id": t_ext["id"],
+                    "internal_id": t_int["id"],
+                    "match_type": "id_match"
+                }
+            else:
+                overlap_record = {
+                    "external_id": t_ext["id"],
+                    "internal_id": t_int["id"],
+                    "match_type": "url_match",
+                    "external_url": t_ext.get("external_best_url", ""),
+                    "internal_url": t_int.get("tender_url", "")
+                }
+            overlaps.append(overlap_record)
+            matched_external.add(i)
+            matched_internal.add(j)
+
         # Get unique tenders
         unique_external = [t for i, t in enumerate(external_tenders) if i not in matched_external]
         unique_internal = [t for j, t in enumerate(internal_tenders) if j not in matched_internal]
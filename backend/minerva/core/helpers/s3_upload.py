@@ -4,7 +4,14 @@ from __future__ import annotations
 # Provides an interface similar to the previous vercel_upload helper so that the rest
 # of the codebase can switch from Vercel Blob to S3 with minimal changes.
 
+import asyncio
+import functools
+import hashlib
+import io
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from urllib.parse import urlparse
 
 from dotenv import load_dotenv
@@ -12,6 +19,7 @@ from fastapi import HTTPException
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
     from botocore.exceptions import BotoCoreError, ClientError
 except ImportError as e:  # pragma: no cover
     # Provide a clear error if boto3 is missing
@@ -21,10 +29,26 @@ except ImportError as e:  # pragma: no cover
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "eu-north-1")
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
+# Threads reserved for uploads so they never block the event loop or the default executor
+S3_UPLOAD_WORKERS = int(os.getenv("S3_UPLOAD_WORKERS", "8"))
+S3_MULTIPART_THRESHOLD_BYTES = int(os.getenv("S3_MULTIPART_THRESHOLD_BYTES", str(16 * 1024 ** 2)))
+# Content-addressed objects live under <prefix>/<sha256>/<filename>
+S3_CONTENT_PREFIX = "sha256"
+# Fields that can hold a content-addressed blob URL; the sweep keeps any object referenced here
+S3_CONTENT_REFERENCES = {
+    "tender_analysis_results": "uploaded_files.blob_url",
+    "tender_analysis_updates": "updated_files.blob_url",
+    "tender_extraction_results": "processed_files.successful_files.blob_url",
+    # Project files created from tender files keep the tender's blob URL
+    "files": "blob_url",
+}
+S3_SWEEP_LOOKUP_BATCH_SIZE = 500
 
 if not all([AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, S3_BUCKET_NAME]):
     missing = [
@@ -48,6 +72,13 @@ s3_client = boto3.client(
     aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
 )
 
+_upload_executor = ThreadPoolExecutor(max_workers=S3_UPLOAD_WORKERS, thread_name_prefix="s3-upload")
+_transfer_config = TransferConfig(
+    multipart_threshold=S3_MULTIPART_THRESHOLD_BYTES,
+    multipart_chunksize=S3_MULTIPART_THRESHOLD_BYTES,
+    max_concurrency=4,
+)
+
 
 def _extract_key(key_or_url: str) -> str:
     """Return the S3 object key from a provided key or full https URL."""
@@ -58,6 +89,49 @@ def _extract_key(key_or_url: str) -> str:
     return key_or_url
 
 
+def _public_url(key: str) -> str:
+    # The default public URL format. Adjust if you use a custom domain/CLOUDFRONT.
+    return f"https://{S3_BUCKET_NAME}.s3.{AWS_REGION}.amazonaws.com/{key}"
+
+
+def _is_content_addressed(key: str) -> bool:
+    return key.startswith(f"{S3_CONTENT_PREFIX}/")
+
+
+def content_key(filename: str, file_content: bytes) -> str:
+    """Key for *file_content*: identical bytes under the same name map to one object."""
+    digest = hashlib.sha256(file_content).hexdigest()
+    return f"{S3_CONTENT_PREFIX}/{digest}/{filename}"
+
+
+def _head_object(key: str) -> dict | None:
+    """HEAD response for *key*, or None when the object does not exist."""
+    try:
+        return s3_client.head_object(Bucket=S3_BUCKET_NAME, Key=key)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+def _touch_object(key: str, head: dict) -> None:
+    """Refresh LastModified by copying the object onto itself, keeping its headers and ACL."""
+    extra = {
+        name: head[name]
+        for name in ("ContentType", "ContentDisposition")
+        if head.get(name)
+    }
+    s3_client.copy_object(
+        Bucket=S3_BUCKET_NAME,
+        Key=key,
+        CopySource={"Bucket": S3_BUCKET_NAME, "Key": key},
+        Metadata=head.get("Metadata", {}),
+        MetadataDirective="REPLACE",
+        ACL="public-read",
+        **extra,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Public helper functions (mirroring previous vercel_upload API)
 # ---------------------------------------------------------------------------
@@ -97,6 +171,47 @@ def upload_file_to_s3(filename: str, file_content: bytes) -> str:  # noqa: WPS11
         ) from exc
 
 
+def upload_content_to_s3(filename: str, file_content: bytes) -> str:  # noqa: WPS110
+    """Upload *file_content* under its content-addressed key and return the public URL.
+
+    A HEAD request first checks whether the same bytes were already stored
+    under this name (by another analysis or tender); if so nothing is sent,
+    but the object is touched so sweep_unreferenced_content's age guard
+    covers the reuse. Large files go up as multipart uploads.
+    """
+    key = content_key(filename, file_content)
+    try:
+        head = _head_object(key)
+        if head is not None:
+            logger.info(f"S3 object for '{filename}' already exists, skipping upload")
+            _touch_object(key, head)
+            return _public_url(key)
+
+        s3_client.upload_fileobj(
+            io.BytesIO(file_content),
+            S3_BUCKET_NAME,
+            key,
+            ExtraArgs={
+                # Preserve the original filename for download prompts
+                "ContentDisposition": f'attachment; filename="{filename}"',
+                "ACL": "public-read",
+            },
+            Config=_transfer_config,
+        )
+        return _public_url(key)
+    except (BotoCoreError, ClientError) as exc:  # pragma: no cover
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error uploading file to S3: {str(exc)}",
+        ) from exc
+
+
+async def upload_file_to_s3_async(filename: str, file_content: bytes) -> str:  # noqa: WPS110
+    """Non-blocking :func:`upload_content_to_s3`; hashing and upload run on the upload executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_upload_executor, upload_content_to_s3, filename, file_content)
+
+
 def delete_file_from_s3(key_or_url: str) -> None:  # noqa: WPS110
     """Delete a single file from S3 given its *key_or_url*.
 
@@ -104,6 +219,9 @@ def delete_file_from_s3(key_or_url: str) -> None:  # noqa: WPS110
     ``https://bucket.s3.region.amazonaws.com/folder/file.pdf`` URL.
     """
     key = _extract_key(key_or_url)
+    if _is_content_addressed(key):
+        # Possibly shared with other analyses; see sweep_unreferenced_content()
+        return
     try:
         s3_client.delete_object(Bucket=S3_BUCKET_NAME, Key=key)
     except (BotoCoreError, ClientError) as exc:  # pragma: no cover
@@ -121,7 +239,11 @@ def delete_files_from_s3(keys_or_urls: list[str]) -> None:  # noqa: WPS110
     if not keys_or_urls:
         return
 
-    objects = [{"Key": _extract_key(item)} for item in keys_or_urls]
+    # Content-addressed objects may be shared; see sweep_unreferenced_content()
+    keys = [_extract_key(item) for item in keys_or_urls]
+    objects = [{"Key": key} for key in keys if not _is_content_addressed(key)]
+    if not objects:
+        return
 
     try:
         s3_client.delete_objects(Bucket=S3_BUCKET_NAME, Delete={"Objects": objects})
@@ -129,4 +251,51 @@ def delete_files_from_s3(keys_or_urls: list[str]) -> None:  # noqa: WPS110
         raise HTTPException(
             status_code=500,
             detail=f"Error deleting files from S3: {str(exc)}",
-        ) from exc 
\ No newline at end of file
+        ) from exc 
+
+
+async def sweep_unreferenced_content(min_age_days: int = 7) -> int:
+    """Delete content-addressed objects nothing references any more.
+
+    Per-analysis cleanup never deletes these objects because other analyses
+    may point at the same key; this sweep reclaims the ones left orphaned.
+    An object is kept while any field in S3_CONTENT_REFERENCES holds its URL.
+    Objects younger than *min_age_days* are kept so in-flight analyses that
+    have uploaded but not yet saved their results are not affected.
+    Returns the number of deleted objects.
+    """
+    from minerva.core.database.database import db
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=min_age_days)
+    loop = asyncio.get_running_loop()
+
+    def list_candidates() -> list[str]:
+        keys = []
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=S3_BUCKET_NAME, Prefix=f"{S3_CONTENT_PREFIX}/"):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []) if obj["LastModified"] < cutoff)
+        return keys
+
+    candidates = await loop.run_in_executor(_upload_executor, list_candidates)
+    orphaned = []
+    for start in range(0, len(candidates), S3_SWEEP_LOOKUP_BATCH_SIZE):
+        urls = {_public_url(key): key for key in candidates[start:start + S3_SWEEP_LOOKUP_BATCH_SIZE]}
+        referenced = set()
+        for collection, field in S3_CONTENT_REFERENCES.items():
+            remaining = [url for url in urls if url not in referenced]
+            if not remaining:
+                break
+            referenced.update(
+                url for url in await db[collection].distinct(field, {field: {"$in": remaining}})
+                if url in urls
+            )
+        orphaned.extend(key for url, key in urls.items() if url not in referenced)
+
+    for start in range(0, len(orphaned), 1000):
+        batch = [{"Key": key} for key in orphaned[start:start + 1000]]
+        await loop.run_in_executor(
+            _upload_executor,
+            functools.partial(s3_client.delete_objects, Bucket=S3_BUCKET_NAME, Delete={"Objects": batch}),
+        )
+    logger.info(f"Swept {len(orphaned)} unreferenced content-addressed S3 objects")
+    return len(orphaned)
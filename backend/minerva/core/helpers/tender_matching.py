@@ -0,0 +1,195 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+GENERIC_ORG_TOKENS: set = {
+    # ── administrative units ───────────────────────────────────────────────
+    "gmina", "gminy", "gminie", "gminę",                                # all cases
+    "miasto", "miasta", "miejski", "miejska", "miejskie",
+    "miejsko-wiejska", "miejsko-wiejskiej",
+    "powiat", "powiatu", "powiatowy", "powiatowa", "powiatowe",
+    "powiatowych", "starostwo", "starosta", "starosty", "starostwie",
+    "województwo", "wojewodztwo", "wojewódzki", "wojewodzki",
+    "wojewódzka", "wojewodzka", "wojewódzkie", "wojewodzkie",
+    "urząd", "urzad", "urzad_miasta", "urząd_miasta",
+    "urzad_gminy", "urząd_gminy", "urząd_marszałkowski",
+    "urzad_marszalkowski",
+
+    # ── institutional nouns ───────────────────────────────────────────────
+    "biuro", "wydział", "wydzial", "centrum", "jednostka",
+    "zakład", "zaklad", "zespół", "zespol", "ośrodek", "osrodek",
+    "instytucja", "organizacja", "komenda", "komenda_powiatowa",
+    "szpital", "przychodnia", "dom", "dom_kultury", "biblioteka",
+    "cuk", "cukit",
+
+    # ── sector adjectives / nouns ─────────────────────────────────────────
+    "komunalny", "komunalna", "komunalne", "komunalnych",
+    "techniczny", "techniczna", "techniczne", "technicznych",
+    "publiczny", "publiczna", "publiczne", "publicznych",
+    "samorządowy", "samorzadowy", "samorządowa", "samorządowe",
+    "usług", "uslug", "usługowy", "uslugowy", "usługowych", "uslugowych",
+    "mieszkaniowy", "mieszkaniowa", "mieszkaniowe",
+
+    # ── legal forms: “spółka …”, “SA”, “SK-A”, etc. ───────────────────────
+    "spółka", "spolka", "sp", "sp.",
+    "spółka_jawna", "sj", "s.j.", "spj",
+    "spółka_komandytowa", "sk", "s.k.", "sk-a", "spk", "sp.k.",
+    "spółka_komandytowo-akcyjna", "ska", "s.k.a.",
+    "spółka_akcyjna", "sa", "s.a.", "s.a",
+    "psa", "p.s.a.",                                              # prosta S.A.
+    "z", "oo", "o.o.", "zoo", "z_o_o", "z.o.o", "z.o.o.",
+    "sp_z_oo", "sp_z_o_o", "sp._z_o.o.",                          # all dots/spaces
+    "z_ograniczoną_odpowiedzialnością", "z_ograniczona_odpowiedzialnoscia",
+
+    # ── assorted abbreviations often seen in sigla ───────────────────────
+    "ag", "ti", "zzp", "dkw", "pcpr", "pcpr-powiat", "pcp", "pc", "zdp",
+    "pgk", "pgm", "pgn", "mpgn", "mpgk", "mpwik", "pgwik", "zgkim",
+}
+STOPWORDS = GENERIC_ORG_TOKENS | {"w", "im", "przy", "dla"}
+
+LEGAL_SUFFIXES = (
+    r"\b(sp[.\s]*z[.\s]*o[.\s]*o[.]?)\b",
+    r"\b(spółka z\s+ograniczoną\s+odpowiedzialnością)\b",
+    r"\b(gmina)\b",
+    r"\b(cukit|cul|cuk)\b",
+)
+LEGAL_SUFFIX_RX = re.compile("|".join(LEGAL_SUFFIXES), re.I)
+NOTICE_ID_RX = re.compile(r"/(\d{4,})(?:/|$)")
+_PUNCTUATION_RX = re.compile(rf"[„”\"',()\-–{re.escape('.:/')}]")
+_WHITESPACE_RX = re.compile(r"\s+")
+
+
+def normalise(txt: Optional[str]) -> str:
+    if not txt:
+        return ""
+    txt = _PUNCTUATION_RX.sub(" ", txt.lower())
+    txt = LEGAL_SUFFIX_RX.sub(" ", txt)
+    return _WHITESPACE_RX.sub(" ", txt).strip()
+
+
+def extract_numeric_id(url: Optional[str], title: Optional[str]) -> Optional[str]:
+    if url:
+        m = NOTICE_ID_RX.search(url)
+        if m:
+            host = urlparse(url).hostname or ""
+            return f"{host}:{m.group(1)}"
+    if title:
+        m = NOTICE_ID_RX.search(title)
+        if m:
+            return m.group(1)
+    return None
+
+
+def portal_family(url: Optional[str]) -> str:
+    if not url:
+        return ""
+    host = urlparse(url).hostname or ""
+    parts = host.lower().split(".")
+    return ".".join(parts[-2:]) if len(parts) >= 2 else host.lower()
+
+
+def distinctive_tokens(org: str) -> Set[str]:
+    return {tok for tok in org.split() if tok and tok not in STOPWORDS}
+
+
+class PreparedTender:
+    """A tender dict (id, name, organization) normalised once for repeated comparisons"""
+
+    __slots__ = ("id", "numeric_id", "family", "org_tokens", "name", "name_tokens")
+
+    def __init__(self, tender: dict):
+        self.id = tender.get("id")
+        self.numeric_id = extract_numeric_id(tender.get("id"), tender.get("name"))
+        self.family = portal_family(tender.get("id"))
+        self.org_tokens = distinctive_tokens(normalise(tender.get("organization")))
+        self.name = normalise(tender.get("name"))
+        self.name_tokens = set(self.name.split())
+
+
+def is_same_prepared(a: PreparedTender, b: PreparedTender) -> bool:
+    if a.numeric_id and b.numeric_id and a.numeric_id == b.numeric_id:
+        return True
+    if a.family != b.family:
+        return False
+    if a.org_tokens.isdisjoint(b.org_tokens):
+        return False
+    from rapidfuzz import fuzz
+    title_score = fuzz.token_set_ratio(a.name, b.name) / 100
+    if title_score >= 0.93:
+        return True
+    tokens_a, tokens_b = a.name_tokens, b.name_tokens
+    shorter, longer = (tokens_a, tokens_b) if len(tokens_a) < len(tokens_b) else (tokens_b, tokens_a)
+    if shorter.issubset(longer):
+        return title_score >= 0.80
+    return False
+
+
+def is_same_tender(a: dict, b: dict) -> bool:
+    return is_same_prepared(PreparedTender(a), PreparedTender(b))
+
+
+class TenderMatchIndex:
+    """
+    Blocking index over candidate tenders for is_same_tender lookups.
+
+    is_same_tender can only hold for two tenders sharing a notice number, or
+    sharing a portal family and at least one distinctive organisation token,
+    so those are the blocking keys; equal ids form one more block. Only
+    candidates sharing a block with the probe get the full comparison, which
+    keeps results identical to comparing against every candidate.
+    """
+
+    def __init__(self, candidates: List[dict]):
+        self._prepared = [PreparedTender(c) for c in candidates]
+        self._by_id: Dict[object, List[int]] = defaultdict(list)
+        self._by_numeric_id: Dict[str, List[int]] = defaultdict(list)
+        self._by_org: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for j, p in enumerate(self._prepared):
+            self._by_id[p.id].append(j)
+            if p.numeric_id:
+                self._by_numeric_id[p.numeric_id].append(j)
+            for token in p.org_tokens:
+                self._by_org[(p.family, token)].append(j)
+
+    def _candidates(self, probe: PreparedTender) -> List[int]:
+        found = set(self._by_id.get(probe.id, ()))
+        if probe.numeric_id:
+            found.update(self._by_numeric_id.get(probe.numeric_id, ()))
+        for token in probe.org_tokens:
+            found.update(self._by_org.get((probe.family, token), ()))
+        return sorted(found)
+
+    def first_match(self, tender: dict, taken: Set[int]) -> Optional[Tuple[int, bool]]:
+        """
+        First candidate, in candidate order and not in `taken`, whose id equals
+        the tender's or that is_same_tender holds for. Returns (index, ids_equal).
+        """
+        probe = PreparedTender(tender)
+        for j in self._candidates(probe):
+            if j in taken:
+                continue
+            candidate = self._prepared[j]
+            if candidate.id == probe.id:
+                return j, True
+            if is_same_prepared(probe, candidate):
+                return j, False
+        return None
+
+
+def pair_tenders(left: List[dict], right: List[dict]) -> List[Tuple[int, int, bool]]:
+    """
+    Greedy one-to-one pairing: each left tender, in order, takes the first
+    unpaired right tender with the same id or for which is_same_tender holds.
+    Returns (left_index, right_index, ids_equal) tuples.
+    """
+    index = TenderMatchIndex(right)
+    taken: Set[int] = set()
+    pairs = []
+    for i, tender in enumerate(left):
+        match = index.first_match(tender, taken)
+        if match is not None:
+            j, ids_equal = match
+            taken.add(j)
+            pairs.append((i, j, ids_equal))
+    return pairs
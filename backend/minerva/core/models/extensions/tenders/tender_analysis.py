@@ -1,12 +1,34 @@
+import re
 from enum import Enum
 from minerva.core.models.file import File
 from minerva.core.services.vectorstore.pinecone.query import QueryConfig
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, model_validator
 from typing import Optional, List, Literal, Dict
 from datetime import datetime
 from minerva.core.models.utils import PyObjectId
 from bson import ObjectId
 
+# Deadline formats the sources store in tender_metadata.submission_deadline
+SUBMISSION_DEADLINE_FORMATS = [
+    (re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}$"), "%Y-%m-%d %H:%M"),
+    (re.compile(r"^\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}$"), "%d/%m/%Y %H:%M:%S"),
+    (re.compile(r"^\d{4}-\d{2}-\d{2}$"), "%Y-%m-%d"),
+]
+
+
+def parse_submission_deadline(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored submission deadline string; None when empty or in an unknown format"""
+    if not isinstance(value, str):
+        return None
+    for pattern, fmt in SUBMISSION_DEADLINE_FORMATS:
+        if pattern.match(value):
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                return None
+    return None
+
+
 class TenderMetadata(BaseModel):
     name: str
     organization: str
@@ -104,6 +126,15 @@ class TenderAnalysisResult(BaseModel):
     finished_id: Optional[str] = None
     external_best_url: Optional[str] = None  # NEW: URL to the best external source
     external_compare_status: Optional[Literal["our_unique", "overlap_oferent", "overlap_bizpol", "external_unique"]] = None  # NEW: Status of external comparison
+    run_id: Optional[str] = None  # Analysis run that saved this result
+    # tender_metadata.submission_deadline parsed for indexed filtering; None if unparseable
+    submission_deadline_at: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def _set_submission_deadline_at(self):
+        if self.submission_deadline_at is None:
+            self.submission_deadline_at = parse_submission_deadline(self.tender_metadata.submission_deadline)
+        return self
 
     class Config:
         arbitrary_types_allowed = True
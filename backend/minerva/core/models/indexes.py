@@ -0,0 +1,61 @@
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+# MongoDB indexes the application relies on, per collection. Applied by
+# minerva.core.database.indexes.ensure_indexes at startup or from the CLI;
+# index names are part of the spec, so changing a definition means changing
+# its name too (the bootstrap reports the old one as unused).
+INDEXES: Dict[str, List[IndexModel]] = {
+    "tender_analysis_results": [
+        # Results pages of an analysis, newest first; _id is the keyset tiebreaker
+        IndexModel(
+            [("tender_analysis_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="analysis_created_at_id",
+        ),
+        # Open-tender listings filter on the parsed deadline
+        IndexModel([("tender_analysis_id", ASCENDING), ("submission_deadline_at", ASCENDING)], name="analysis_deadline"),
+        # "Is this tender already a result elsewhere?" checks before deleting shared files
+        IndexModel([("tender_url", ASCENDING), ("tender_analysis_id", ASCENDING)], name="tender_url_analysis"),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at"),
+        # Results saved by one analysis run, for resuming or inspecting it
+        IndexModel([("run_id", ASCENDING)], name="run_id", sparse=True),
+        # Reference lookups of sweep_unreferenced_content()
+        IndexModel([("uploaded_files.blob_url", ASCENDING)], name="uploaded_files_blob_url", sparse=True),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email"),
+        IndexModel([("api_key_hash", ASCENDING)], name="api_key_hash", sparse=True),
+        IndexModel([("org_id", ASCENDING)], name="org_id", sparse=True),
+    ],
+    "files": [
+        # Reference lookups of sweep_unreferenced_content()
+        IndexModel([("blob_url", ASCENDING)], name="blob_url", sparse=True),
+    ],
+    "tender_analysis": [
+        # Producers pick up active analyses
+        IndexModel([("active", ASCENDING)], name="active"),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at"),
+    ],
+    "tender_search_results": [
+        IndexModel([("analysis_id", ASCENDING), ("created_at", DESCENDING)], name="analysis_created_at"),
+    ],
+    "tender_analysis_costs": [
+        IndexModel([("analysis_session_id", ASCENDING)], name="analysis_session_id"),
+        IndexModel([("tender_analysis_id", ASCENDING), ("status", ASCENDING)], name="analysis_status"),
+        # Cost summary and trend aggregations
+        IndexModel([("user_id", ASCENDING), ("started_at", DESCENDING)], name="user_started_at"),
+    ],
+    "tender_analysis_updates": [
+        IndexModel([("tender_analysis_result_id", ASCENDING)], name="tender_analysis_result_id"),
+        IndexModel([("updated_files.blob_url", ASCENDING)], name="updated_files_blob_url", sparse=True),
+    ],
+    "tender_extraction_results": [
+        IndexModel([("extraction_id", ASCENDING)], name="extraction_id"),
+        IndexModel(
+            [("processed_files.successful_files.blob_url", ASCENDING)],
+            name="successful_files_blob_url",
+            sparse=True,
+        ),
+    ],
+}
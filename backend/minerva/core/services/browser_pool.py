@@ -0,0 +1,282 @@
+# minerva/core/services/browser_pool.py
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Set
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from minerva.core.services.resource_policy import resource_policies
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+# Concurrent contexts per browser; callers beyond the pool's capacity wait
+BROWSER_POOL_MAX_CONTEXTS = int(os.getenv("BROWSER_POOL_MAX_CONTEXTS", "8"))
+# Pages a browser may open before it is replaced, to cap Chromium memory growth
+BROWSER_POOL_RECYCLE_AFTER_PAGES = int(os.getenv("BROWSER_POOL_RECYCLE_AFTER_PAGES", "500"))
+# How long a saved login (cookies + local storage) is reused before logging in again
+BROWSER_POOL_STORAGE_STATE_TTL_SECONDS = int(os.getenv("BROWSER_POOL_STORAGE_STATE_TTL_SECONDS", "1800"))
+
+LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+
+
+class _PooledInstance:
+    def __init__(self, browser: Browser, generation: int):
+        self.browser = browser
+        self.generation = generation
+        self.contexts: Set[BrowserContext] = set()
+        self.pages_served = 0
+        self.retiring = False
+
+
+class PooledBrowser:
+    """
+    Browser-like handle on the pool for code written against a Playwright
+    Browser. Contexts come from pooled browsers with the resource policy of
+    `source` applied; close() only closes the contexts opened through this
+    handle, never the browser itself.
+    """
+
+    def __init__(self, pool: "BrowserPool", source: Optional[str] = None):
+        self._pool = pool
+        self.source = source
+        self._contexts: List[BrowserContext] = []
+
+    async def new_context(
+        self,
+        storage_state_key: Optional[str] = None,
+        source: Optional[str] = None,
+        **kwargs
+    ) -> BrowserContext:
+        context = await self._pool.new_context(
+            storage_state_key=storage_state_key, source=source or self.source, **kwargs
+        )
+        self._contexts.append(context)
+        return context
+
+    async def close(self):
+        contexts, self._contexts = self._contexts, []
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing pooled context: {e}")
+
+
+class BrowserPool:
+    """
+    Process-wide pool of warm Chromium browsers for task processes.
+
+    Capacity is `size * max_contexts` concurrent contexts, handed out on the
+    least loaded browser. A browser that has served `recycle_after_pages`
+    pages stops taking new contexts and is closed once its last context is,
+    with a fresh browser launched in its place. Storage state saved under a
+    key (e.g. a logged-in ezamawiajacy session) is applied to later contexts
+    asking for the same key.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_contexts: int = BROWSER_POOL_MAX_CONTEXTS,
+        recycle_after_pages: int = BROWSER_POOL_RECYCLE_AFTER_PAGES,
+    ):
+        self.size = max(1, size)
+        self.max_contexts = max(1, max_contexts)
+        self.recycle_after_pages = recycle_after_pages
+        self._reset()
+
+    def _reset(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._playwright: Optional[Playwright] = None
+        self._instances: List[_PooledInstance] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._capacity: Optional[asyncio.Semaphore] = None
+        self._generation = 0
+        self._storage_states: Dict[str, Dict[str, Any]] = {}
+        self.browsers_launched = 0
+        self.browsers_recycled = 0
+
+    def _bind_loop(self):
+        # Playwright objects belong to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                logger.warning("Browser pool used from a new event loop, discarding previous browsers")
+            self._reset()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._capacity = asyncio.Semaphore(self.size * self.max_contexts)
+
+    async def _launch(self) -> _PooledInstance:
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        self._generation += 1
+        instance = _PooledInstance(browser, self._generation)
+        browser.on("disconnected", lambda _: self._on_disconnected(instance))
+        self.browsers_launched += 1
+        logger.info(f"Browser pool launched browser #{instance.generation}")
+        return instance
+
+    def _live_instances(self) -> List[_PooledInstance]:
+        return [i for i in self._instances if not i.retiring and i.browser.is_connected()]
+
+    async def start(self):
+        """Launch the pool's browsers up front"""
+        self._bind_loop()
+        async with self._lock:
+            while len(self._live_instances()) < self.size:
+                self._instances.append(await self._launch())
+
+    async def _pick_instance(self) -> _PooledInstance:
+        async with self._lock:
+            live = self._live_instances()
+            while len(live) < self.size:
+                instance = await self._launch()
+                self._instances.append(instance)
+                live.append(instance)
+            instance = min(live, key=lambda i: len(i.contexts))
+            return instance
+
+    def _count_page(self, instance: _PooledInstance):
+        instance.pages_served += 1
+        if (
+            self.recycle_after_pages
+            and not instance.retiring
+            and instance.pages_served >= self.recycle_after_pages
+        ):
+            instance.retiring = True
+            self.browsers_recycled += 1
+            logger.info(f"Browser pool retiring browser #{instance.generation} after {instance.pages_served} pages")
+
+    def _release(self, instance: _PooledInstance, context: BrowserContext):
+        if context not in instance.contexts:
+            return
+        instance.contexts.discard(context)
+        self._capacity.release()
+        if instance.retiring and not instance.contexts:
+            self._retire(instance)
+
+    def _retire(self, instance: _PooledInstance):
+        if instance in self._instances:
+            self._instances.remove(instance)
+        if instance.browser.is_connected():
+            asyncio.get_running_loop().create_task(self._close_browser(instance))
+
+    async def _close_browser(self, instance: _PooledInstance):
+        try:
+            await instance.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing retired browser #{instance.generation}: {e}")
+
+    def _on_disconnected(self, instance: _PooledInstance):
+        for context in list(instance.contexts):
+            self._release(instance, context)
+        if instance in self._instances:
+            logger.warning(f"Browser pool lost browser #{instance.generation}, it will be relaunched")
+            self._instances.remove(instance)
+
+    async def new_context(
+        self,
+        storage_state_key: Optional[str] = None,
+        source: Optional[str] = None,
+        **kwargs
+    ) -> BrowserContext:
+        """
+        Open a context on a pooled browser; it holds a pool slot until closed.
+        With `storage_state_key`, a fresh saved state for that key is applied.
+        Heavy resources are blocked according to the policy of `source`.
+        """
+        self._bind_loop()
+        if resource_policies.enabled:
+            # Service worker requests would bypass the route handler
+            kwargs.setdefault("service_workers", "block")
+        if storage_state_key and "storage_state" not in kwargs:
+            state = self.get_storage_state(storage_state_key)
+            if state is not None:
+                kwargs["storage_state"] = state
+
+        await self._capacity.acquire()
+        try:
+            instance = await self._pick_instance()
+            context = await instance.browser.new_context(**kwargs)
+        except Exception:
+            self._capacity.release()
+            raise
+
+        instance.contexts.add(context)
+        context.on("page", lambda _: self._count_page(instance))
+        context.on("close", lambda _: self._release(instance, context))
+        try:
+            await resource_policies.apply(context, source)
+        except Exception as e:
+            logger.warning(f"Could not apply resource policy for {source or 'default'}: {e}")
+        return context
+
+    @asynccontextmanager
+    async def context(self, storage_state_key: Optional[str] = None, source: Optional[str] = None, **kwargs):
+        context = await self.new_context(storage_state_key=storage_state_key, source=source, **kwargs)
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"Error closing pooled context: {e}")
+
+    def lease(self, source: Optional[str] = None) -> PooledBrowser:
+        return PooledBrowser(self, source)
+
+    @asynccontextmanager
+    async def browser(self, source: Optional[str] = None):
+        """Drop-in for `async with async_playwright() as p: browser = await p.chromium.launch()`"""
+        handle = self.lease(source)
+        try:
+            yield handle
+        finally:
+            await handle.close()
+            resource_policies.log_stats(source)
+
+    def get_storage_state(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._storage_states.get(key)
+        if entry is None or time.monotonic() - entry["saved_at"] > BROWSER_POOL_STORAGE_STATE_TTL_SECONDS:
+            self._storage_states.pop(key, None)
+            return None
+        return entry["state"]
+
+    async def save_storage_state(self, key: str, context: BrowserContext):
+        try:
+            self._storage_states[key] = {"state": await context.storage_state(), "saved_at": time.monotonic()}
+        except Exception as e:
+            logger.warning(f"Could not save storage state for {key}: {e}")
+
+    def forget_storage_state(self, key: str):
+        self._storage_states.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "browsers": len(self._instances),
+            "contexts_in_use": sum(len(i.contexts) for i in self._instances),
+            "browsers_launched": self.browsers_launched,
+            "browsers_recycled": self.browsers_recycled,
+            "resources": resource_policies.stats(),
+        }
+
+    async def close(self):
+        if self._loop is None:
+            return
+        for instance in list(self._instances):
+            await self._close_browser(instance)
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping playwright: {e}")
+        self._reset()
+
+
+browser_pool = BrowserPool()
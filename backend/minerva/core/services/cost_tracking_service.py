@@ -1,24 +1,153 @@
 import asyncio
 import logging
+import os
 from contextvars import ContextVar
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, Optional
 from uuid import uuid4
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from minerva.core.database.database import db
 
 logger = logging.getLogger("minerva.cost_tracking")
 
+# Write-behind settings for cost increments
+COST_FLUSH_INTERVAL_SECONDS = float(os.getenv("COST_FLUSH_INTERVAL_SECONDS", "5"))
+COST_FLUSH_BATCH_SIZE = int(os.getenv("COST_FLUSH_BATCH_SIZE", "200"))
+
 # Context variable to store current cost tracking session
 _current_cost_context: ContextVar[Optional['CostTrackingContext']] = ContextVar('cost_context', default=None)
 
+
+class CostAccumulator:
+    """
+    In-process write-behind buffer for cost record increments.
+
+    Increments are coalesced per cost record and written with a single
+    bulk_write, either when `batch_size` operations are pending or every
+    `flush_interval` seconds, whichever comes first.
+    """
+
+    def __init__(self, flush_interval: float = COST_FLUSH_INTERVAL_SECONDS, batch_size: int = COST_FLUSH_BATCH_SIZE):
+        self.flush_interval = flush_interval
+        self.batch_size = max(1, batch_size)
+        self._pending: Dict[str, Dict[str, float]] = {}
+        self._pending_ops = 0
+        self._deferred: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio primitives belong to the loop that created them; pending increments carry over
+            self._lock = asyncio.Lock()
+            self._flush_task = None
+            self._loop = loop
+
+    async def add(self, cost_record_id: str, increments: Dict[str, float]):
+        """Queue increments for a cost record, flushing if the batch is full"""
+        totals = self._pending.setdefault(cost_record_id, {})
+        for field, value in increments.items():
+            totals[field] = totals.get(field, 0) + value
+        self._pending_ops += 1
+
+        if self._pending_ops >= self.batch_size:
+            await self.flush()
+        else:
+            self._ensure_flush_task()
+
+    def discard(self, cost_record_id: str):
+        """Drop a record's pending increments, e.g. before its totals are overwritten with $set"""
+        self._pending.pop(cost_record_id, None)
+        if not self._pending:
+            self._pending_ops = 0
+
+    def defer_until_flushed(self, key: str, callback: Callable[[], Awaitable[Any]]):
+        """Run callback after the next flush that writes every pending increment"""
+        self._deferred[key] = callback
+        self._ensure_flush_task()
+
+    def _ensure_flush_task(self):
+        self._bind_loop()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._periodic_flush())
+
+    async def _periodic_flush(self):
+        while self._pending or self._deferred:
+            await asyncio.sleep(self.flush_interval)
+            if await self.flush() and self._deferred:
+                deferred, self._deferred = self._deferred, {}
+                for key, callback in deferred.items():
+                    try:
+                        await callback()
+                    except Exception as e:
+                        logger.error(f"Error running deferred cost callback {key}: {str(e)}")
+
+    async def flush(self) -> bool:
+        """
+        Write all pending increments in one bulk_write. Returns False when
+        some increments were not written: those a BulkWriteError reports as
+        failed are kept for the next flush, anything else is dropped since
+        part of the batch may already have been applied.
+        """
+        self._bind_loop()
+        async with self._lock:
+            if not self._pending:
+                return True
+            pending, self._pending = self._pending, {}
+            coalesced_ops, self._pending_ops = self._pending_ops, 0
+
+            updates = [
+                UpdateOne({"_id": ObjectId(record_id)}, {"$inc": increments})
+                for record_id, increments in pending.items()
+            ]
+            try:
+                await db.tender_analysis_costs.bulk_write(updates, ordered=False)
+                logger.debug(f"Flushed {coalesced_ops} cost operations into {len(updates)} record updates")
+                return True
+            except BulkWriteError as e:
+                # Only the failed updates were not applied; retry just those
+                record_ids = list(pending)
+                failed = {record_ids[err["index"]] for err in e.details.get("writeErrors", [])}
+                logger.error(f"Error flushing {len(failed)} cost record updates, keeping them for the next flush: {str(e)}")
+                self._requeue({record_id: pending[record_id] for record_id in failed}, len(failed))
+                return False
+            except Exception as e:
+                # Unknown how much of the unordered batch landed; retrying could double-count
+                logger.error(f"Error flushing cost increments, dropping {len(updates)} record updates: {str(e)}")
+                return False
+
+    def _requeue(self, pending: Dict[str, Dict[str, float]], ops: int):
+        """Merge unwritten increments back into the buffer so the next flush retries them"""
+        for record_id, increments in pending.items():
+            totals = self._pending.setdefault(record_id, {})
+            for field, value in increments.items():
+                totals[field] = totals.get(field, 0) + value
+        self._pending_ops += ops
+        if self._pending:
+            self._ensure_flush_task()
+
+
+_cost_accumulator = CostAccumulator()
+
+
 class CostTrackingContext:
-    """Context manager for automatic cost tracking during analysis sessions"""
+    """
+    Context manager for automatic cost tracking during analysis sessions.
+
+    A shared context (see for_run) attaches to the one cost record of a
+    fanned-out run instead of inserting its own; its costs only go in as
+    increments, and the record is closed once by complete_run.
+    """
     
-    def __init__(self, user_id: str, tender_analysis_id: str, analysis_session_id: str):
+    def __init__(self, user_id: str, tender_analysis_id: str, analysis_session_id: str, shared: bool = False):
         self.user_id = user_id
         self.tender_analysis_id = tender_analysis_id
         self.analysis_session_id = analysis_session_id
+        self.shared = shared
         self.cost_record_id: Optional[str] = None
         self.total_ai_cost = 0.0
         self.total_embedding_cost = 0.0
@@ -43,8 +172,20 @@ class CostTrackingContext:
                 "total_embedding_tokens": 0
             }
             
-            result = await db.tender_analysis_costs.insert_one(cost_record)
-            self.cost_record_id = str(result.inserted_id)
+            if self.shared:
+                # The first stage of the run creates the record, later ones attach to it
+                cost_record.update({"total_cost_usd": 0.0, "total_tokens": 0, "billed_tokens": 0})
+                record = await db.tender_analysis_costs.find_one_and_update(
+                    {"analysis_session_id": self.analysis_session_id},
+                    {"$setOnInsert": cost_record},
+                    projection={"_id": 1},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+                self.cost_record_id = str(record["_id"])
+            else:
+                result = await db.tender_analysis_costs.insert_one(cost_record)
+                self.cost_record_id = str(result.inserted_id)
             
             # Set this context as current
             _current_cost_context.set(self)
@@ -60,10 +201,19 @@ class CostTrackingContext:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Complete cost tracking for this analysis session"""
         try:
-            if self.cost_record_id:
+            # Drain buffered increments before writing the final totals
+            await _cost_accumulator.flush()
+
+            if self.cost_record_id and self.shared:
+                # Totals are shared with the run's other stages; complete_run closes the record
+                logger.debug(f"Detached from run cost record {self.cost_record_id}")
+            elif self.cost_record_id:
                 status = "failed" if exc_type else "completed"
                 total_cost = self.total_ai_cost + self.total_embedding_cost
                 total_tokens = self.total_ai_input_tokens + self.total_ai_output_tokens + self.total_embedding_tokens
+
+                # The $set below carries the full totals; increments left over from a failed flush must not land on top
+                _cost_accumulator.discard(self.cost_record_id)
                 
                 # Update final totals only - no operation arrays
                 await db.tender_analysis_costs.update_one(
@@ -112,18 +262,15 @@ class CostTrackingContext:
             self.total_ai_input_tokens += input_tokens
             self.total_ai_output_tokens += output_tokens
             
-            # Update database totals directly - no operation arrays
+            # Buffer database increments - flushed in bulk by the accumulator
             if self.cost_record_id:
-                await db.tender_analysis_costs.update_one(
-                    {"_id": ObjectId(self.cost_record_id)},
-                    {"$inc": {
-                        "total_ai_cost_usd": total_cost,
-                        "total_ai_input_tokens": input_tokens,
-                        "total_ai_output_tokens": output_tokens,
-                        "total_cost_usd": total_cost,
-                        "total_tokens": input_tokens + output_tokens
-                    }}
-                )
+                await _cost_accumulator.add(self.cost_record_id, {
+                    "total_ai_cost_usd": total_cost,
+                    "total_ai_input_tokens": input_tokens,
+                    "total_ai_output_tokens": output_tokens,
+                    "total_cost_usd": total_cost,
+                    "total_tokens": input_tokens + output_tokens
+                })
             
             logger.debug(f"Tracked AI operation: with {model_name}, "
                         f"${total_cost:.6f} ({input_tokens}+{output_tokens} tokens)")
@@ -145,17 +292,14 @@ class CostTrackingContext:
             self.total_embedding_cost += total_cost
             self.total_embedding_tokens += input_tokens
             
-            # Update database totals directly - no operation arrays
+            # Buffer database increments - flushed in bulk by the accumulator
             if self.cost_record_id:
-                await db.tender_analysis_costs.update_one(
-                    {"_id": ObjectId(self.cost_record_id)},
-                    {"$inc": {
-                        "total_embedding_cost_usd": total_cost,
-                        "total_embedding_tokens": input_tokens,
-                        "total_cost_usd": total_cost,
-                        "total_tokens": input_tokens
-                    }}
-                )
+                await _cost_accumulator.add(self.cost_record_id, {
+                    "total_embedding_cost_usd": total_cost,
+                    "total_embedding_tokens": input_tokens,
+                    "total_cost_usd": total_cost,
+                    "total_tokens": input_tokens
+                })
             
             logger.debug(f"Tracked embedding operation: with {model_name}, "
                         f"${total_cost:.6f} ({input_tokens} tokens)")
@@ -163,6 +307,59 @@ class CostTrackingContext:
         except Exception as e:
             logger.error(f"Error tracking embedding operation: {str(e)}")
     
+    @classmethod
+    def for_run(cls, user_id: str, tender_analysis_id: str, run_id: str):
+        """Attach to the single cost record of a fanned-out analysis run"""
+        return cls(user_id, tender_analysis_id, run_id, shared=True)
+
+    @staticmethod
+    async def complete_run(run_id: str, failed: bool = False):
+        """
+        Close a run's shared cost record and add its tokens to the user's
+        usage. Only tokens not billed yet are added, and the bill is claimed
+        atomically, so concurrent or repeated completions (e.g. a retried
+        finalizer) do not double-count.
+        """
+        try:
+            if not await _cost_accumulator.flush():
+                # total_tokens is missing the increments still buffered; claim once they are written
+                _cost_accumulator.defer_until_flushed(
+                    f"complete_run:{run_id}", lambda: CostTrackingContext.complete_run(run_id, failed)
+                )
+                logger.warning(f"Deferring billing for run {run_id} until buffered cost increments are flushed")
+                return
+            closing = {
+                "completed_at": datetime.utcnow(),
+                "status": "failed" if failed else "completed",
+            }
+            # Claims the unbilled tokens: billed_tokens moves to total_tokens in the same update
+            previous = await db.tender_analysis_costs.find_one_and_update(
+                {
+                    "analysis_session_id": run_id,
+                    "$expr": {"$lt": [{"$ifNull": ["$billed_tokens", 0]}, {"$ifNull": ["$total_tokens", 0]}]},
+                },
+                [{"$set": {**closing, "billed_tokens": "$total_tokens"}}],
+                projection={"user_id": 1, "total_tokens": 1, "billed_tokens": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+            if previous is None:
+                # Nothing left to bill; just close the record
+                result = await db.tender_analysis_costs.update_one(
+                    {"analysis_session_id": run_id}, {"$set": closing}
+                )
+                if not result.matched_count:
+                    logger.warning(f"No cost record found for run {run_id}")
+                return
+
+            unbilled = previous.get("total_tokens", 0) - previous.get("billed_tokens", 0)
+            from minerva.core.middleware.token_tracking import update_user_token_usage
+            await update_user_token_usage(str(previous["user_id"]), unbilled)
+
+            logger.info(f"Completed run cost record {previous['_id']} for run {run_id} (billed {unbilled} tokens)")
+
+        except Exception as e:
+            logger.error(f"Error completing run cost record for {run_id}: {str(e)}")
+
     @classmethod
     def for_analysis(cls, user_id: str, tender_analysis_id: str, analysis_session_id: Optional[str] = None):
         """Create a cost tracking context for an analysis session"""
@@ -0,0 +1,224 @@
+# minerva/core/services/http_fetcher.py
+import asyncio
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import unquote, urlparse
+
+import httpx
+from playwright.async_api import BrowserContext
+
+from minerva.core.services.rate_limiter import host_limiter
+
+logger = logging.getLogger(__name__)
+
+HTTP_FETCH_ENABLED = os.getenv("HTTP_FETCH_ENABLED", "true").lower() == "true"
+HTTP_FETCH_TIMEOUT_SECONDS = float(os.getenv("HTTP_FETCH_TIMEOUT_SECONDS", "30"))
+HTTP_FETCH_MAX_CONNECTIONS = int(os.getenv("HTTP_FETCH_MAX_CONNECTIONS", "50"))
+HTTP_FETCH_MAX_DOWNLOAD_BYTES = int(os.getenv("HTTP_FETCH_MAX_DOWNLOAD_BYTES", str(200 * 1024 ** 2)))
+# Per-source overrides as JSON, e.g. '{"pge": {"pages": "http"}}'
+HTTP_FETCH_RULES = os.getenv("HTTP_FETCH_RULES", "")
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
+# How each source's detail pages and attachments can be fetched: "http" means
+# plain GET is enough, "browser" means the content only exists after JS runs.
+# Sources not listed get browser pages and HTTP-first downloads.
+SOURCE_FETCH_RULES: Dict[str, Dict[str, str]] = {
+    "platformazakupowa": {"pages": "http", "downloads": "http"},
+    # Angular app; document links are plain endpoints once the page has rendered
+    "ezamowienia": {"pages": "browser", "downloads": "http"},
+    # Client-rendered notice view; notice PDFs are static files
+    "ted": {"pages": "browser", "downloads": "http"},
+    # Bot protection answers plain clients with a challenge page
+    "egospodarka": {"pages": "browser", "downloads": "browser"},
+}
+
+_FILENAME_STAR_RE = re.compile(r"filename\*\s*=\s*[^']*'[^']*'([^;]+)", re.I)
+_FILENAME_RE = re.compile(r'filename\s*=\s*"?([^";]+)"?', re.I)
+
+
+def filename_from_response(response: httpx.Response, fallback: Optional[str] = None) -> str:
+    disposition = response.headers.get("content-disposition", "")
+    match = _FILENAME_STAR_RE.search(disposition) or _FILENAME_RE.search(disposition)
+    if match:
+        name = unquote(match.group(1).strip())
+    else:
+        name = fallback or unquote(Path(urlparse(str(response.url)).path).name) or "download"
+    # Never let a server-supplied name escape the target directory
+    return Path(name.replace("\\", "/")).name or "download"
+
+
+class HttpFetcher:
+    """
+    Plain-HTTP path for detail pages and attachments, shared by the source
+    extractors so they only open a Playwright page when a source needs JS.
+
+    Uses one pooled httpx.AsyncClient (HTTP/2 when `h2` is installed) per
+    event loop. Cookies of a browser context can be sent along, so downloads
+    behind a browser login still work. Every method returns None instead of
+    raising when the HTTP path does not apply or fails; callers then fall
+    back to their Playwright code.
+    """
+
+    def __init__(self, enabled: bool = HTTP_FETCH_ENABLED):
+        self.enabled = enabled
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._rules: Dict[str, Dict[str, str]] = {k: dict(v) for k, v in SOURCE_FETCH_RULES.items()}
+        if HTTP_FETCH_RULES:
+            try:
+                for source, rule in json.loads(HTTP_FETCH_RULES).items():
+                    self._rules.setdefault(source, {}).update(rule)
+            except (ValueError, AttributeError) as e:
+                logger.error(f"Ignoring invalid HTTP_FETCH_RULES: {e}")
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                follow_redirects=True,
+                timeout=httpx.Timeout(HTTP_FETCH_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=HTTP_FETCH_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_FETCH_MAX_CONNECTIONS,
+                ),
+                headers={"User-Agent": USER_AGENT, "Accept-Language": "pl,en;q=0.8"},
+            )
+            self._loop = loop
+        return self._client
+
+    def _rule(self, source: Optional[str], kind: str) -> str:
+        default = "browser" if kind == "pages" else "http"
+        if not source:
+            return default
+        rule = self._rules.get(source) or self._rules.get(source.split("_")[0], {})
+        return rule.get(kind, default)
+
+    def page_requires_browser(self, source: Optional[str]) -> bool:
+        return not self.enabled or self._rule(source, "pages") == "browser"
+
+    def download_requires_browser(self, source: Optional[str]) -> bool:
+        return not self.enabled or self._rule(source, "downloads") == "browser"
+
+    async def _headers(self, url: str, context: Optional[BrowserContext]) -> Dict[str, str]:
+        if context is None:
+            return {}
+        try:
+            cookies = await context.cookies(url)
+        except Exception as e:
+            logger.debug(f"Could not read browser cookies for {url}: {e}")
+            return {}
+        if not cookies:
+            return {}
+        return {"Cookie": "; ".join(f"{c['name']}={c['value']}" for c in cookies)}
+
+    async def get_html(
+        self,
+        url: str,
+        source: Optional[str] = None,
+        context: Optional[BrowserContext] = None,
+        must_contain: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Fetch a page over plain HTTP if the source's rule allows it. Returns
+        None for JS-only sources, errors, and responses missing `must_contain`
+        (e.g. a consent or challenge page instead of the detail page).
+        """
+        if self.page_requires_browser(source):
+            return None
+        stats = self._stats[source or "default"]
+        try:
+            headers = await self._headers(url, context)
+            async with host_limiter.slot(url, source) as slot:
+                response = await self._get_client().get(url, headers=headers)
+                slot.record(response.status_code, response.headers.get("retry-after"))
+            response.raise_for_status()
+            html = response.text
+        except Exception as e:
+            logger.info(f"{source}: HTTP fetch of {url} failed, using browser: {e}")
+            stats["page_fallbacks"] += 1
+            return None
+        if must_contain and must_contain not in html:
+            logger.info(f"{source}: HTTP response for {url} lacks expected content, using browser")
+            stats["page_fallbacks"] += 1
+            return None
+        stats["http_pages"] += 1
+        stats["bytes"] += len(response.content)
+        return html
+
+    async def download(
+        self,
+        url: str,
+        dest_dir: Path,
+        source: Optional[str] = None,
+        context: Optional[BrowserContext] = None,
+        filename: Optional[str] = None,
+        fallback_filename: Optional[str] = None,
+    ) -> Optional[Path]:
+        """
+        Stream an attachment to `dest_dir`, named `filename`, else after
+        Content-Disposition, else `fallback_filename` or the URL path. An HTML
+        answer means a login or JS page rather than the file, so it counts as
+        a miss.
+        """
+        if self.download_requires_browser(source) or not url or not url.startswith(("http://", "https://")):
+            return None
+        stats = self._stats[source or "default"]
+        target: Optional[Path] = None
+        try:
+            headers = await self._headers(url, context)
+            async with host_limiter.slot(url, source) as slot, \
+                    self._get_client().stream("GET", url, headers=headers) as response:
+                slot.record(response.status_code, response.headers.get("retry-after"))
+                response.raise_for_status()
+                if response.headers.get("content-type", "").startswith("text/html"):
+                    raise ValueError("got an HTML page instead of a file")
+                target = Path(dest_dir) / (
+                    Path(filename).name if filename else filename_from_response(response, fallback_filename)
+                )
+                size = 0
+                with open(target, "wb") as fh:
+                    async for chunk in response.aiter_bytes(256 * 1024):
+                        size += len(chunk)
+                        if size > HTTP_FETCH_MAX_DOWNLOAD_BYTES:
+                            raise ValueError(f"larger than {HTTP_FETCH_MAX_DOWNLOAD_BYTES} bytes")
+                        fh.write(chunk)
+            if size == 0:
+                raise ValueError("empty response body")
+        except Exception as e:
+            logger.info(f"{source}: HTTP download of {url} failed, using browser: {e}")
+            stats["download_fallbacks"] += 1
+            if target is not None:
+                target.unlink(missing_ok=True)
+            return None
+        stats["http_downloads"] += 1
+        stats["bytes"] += size
+        return target
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {source: dict(s) for source, s in self._stats.items()}
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+http_fetcher = HttpFetcher()
@@ -4,7 +4,7 @@ import json
 import os
 from typing import Union
 from contextvars import ContextVar
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from minerva.core.models.request.ai import LLMSearchRequest, LLMSearchResponse, SearchResult
 from minerva.core.services.llm_providers.anthropic import AnthropicLLM
 from minerva.core.services.llm_providers.google_gemini import GeminiLLM
@@ -345,10 +345,11 @@ async def rag_search_logic(query: str, vector_store_config: QueryConfig, tender_
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def llm_rag_search_logic(request: LLMSearchRequest, tender_pinecone_id: str = None, top_k: int = 4):
+async def llm_rag_search_logic(request: LLMSearchRequest, tender_pinecone_id: str = None, top_k: int = 4, query_vector: Optional[List[float]] = None):
     """
     Internal function that performs the LLM RAG search with automatic cost tracking.
     Returns either a LLMSearchResponse (non-streaming) or an async generator (for streaming).
+    If query_vector is given it is used instead of embedding request.rag_query again.
     """
     try:
         # Build the initial prompt
@@ -366,7 +367,8 @@ async def llm_rag_search_logic(request: LLMSearchRequest, tender_pinecone_id: st
                 query_text=request.rag_query,
                 top_k=top_k,
                 score_threshold=0.1,
-                filter_conditions=filter_conditions
+                filter_conditions=filter_conditions,
+                query_vector=query_vector
             )
             
             if search_results.get("status") == "error":
@@ -0,0 +1,211 @@
+# ocr_engine.py
+#
+# Page-parallel Tesseract OCR backed by a process pool.
+#
+# Worker processes are spawned, and a spawn child re-imports the parent's
+# __main__ (e.g. minerva.tasks.analyses.analysis_worker), so everything that
+# entrypoint imports must stay cheap at import time: pdf_extractor loads CLIP
+# on first use rather than on import for this reason. Concurrency is bounded
+# by the pool size (OCR_PROCESSES) alone.
+
+import atexit
+import concurrent.futures
+import itertools
+import logging
+import multiprocessing
+import os
+import statistics
+import tempfile
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from typing import Generator, List, Optional
+
+import cv2
+import numpy as np
+import pytesseract
+from PIL import Image
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+logger = logging.getLogger(__name__)
+
+OCR_PROCESSES = int(os.getenv("OCR_PROCESSES", str(max(1, (os.cpu_count() or 2) - 1))))
+OCR_PAGES_PER_TASK = int(os.getenv("OCR_PAGES_PER_TASK", "4"))
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+OCR_CONFIDENCE_THRESHOLD = float(os.getenv("OCR_CONFIDENCE_THRESHOLD", "60"))
+
+
+# --------------------------------------------------------------------------- #
+#                  IMAGE PREPROCESSING & TESSERACT HELPERS                    #
+# --------------------------------------------------------------------------- #
+def fix_orientation(gray: np.ndarray) -> np.ndarray:
+    try:
+        rot = pytesseract.image_to_osd(gray, output_type=pytesseract.Output.DICT)["rotate"]
+    except pytesseract.TesseractError:
+        rot = 0
+    return cv2.rotate(gray, cv2.ROTATE_90_CLOCKWISE) if rot == 270 else \
+           cv2.rotate(gray, cv2.ROTATE_90_COUNTERCLOCKWISE) if rot == 90 else gray
+
+
+def deskew_small(bw: np.ndarray) -> np.ndarray:
+    coords = np.column_stack(np.where(bw == 0))
+    if coords.size == 0:
+        return bw
+    angle = cv2.minAreaRect(coords)[-1]
+    angle = angle + 90 if angle < -45 else angle
+    if abs(angle) < 1 or abs(angle) > 15:
+        return bw
+    h, w = bw.shape
+    M = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(bw, M, (w, h),
+                          flags=cv2.INTER_CUBIC,
+                          borderMode=cv2.BORDER_REPLICATE)
+
+
+def preprocess_pil(img: Image.Image) -> tuple[Image.Image, Image.Image]:
+    gray = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2GRAY)
+    gray = fix_orientation(gray)
+    _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    if (bw == 0).mean() > 0.75:
+        bw = cv2.bitwise_not(bw)
+    bw = deskew_small(bw)
+    return Image.fromarray(bw), Image.fromarray(gray)
+
+
+def pick_psm(img: Image.Image) -> str:
+    w, h = img.size
+    aspect = h / w
+    return "4" if aspect < 0.7 else "6" if aspect > 1.4 else "3"
+
+
+def tess_data(img: Image.Image, psm: str, lang: str = "pol+eng") -> tuple[str, float]:
+    cfg = f"--oem 3 --dpi 300 --psm {psm}"
+    data = pytesseract.image_to_data(
+        img, lang=lang, config=cfg, output_type=pytesseract.Output.DICT
+    )
+    rows = [
+        (w, l, float(c))
+        for w, l, c in zip(data["text"], data["line_num"], data["conf"])
+        if w.strip() and c != "-1"
+    ]
+    if not rows:
+        return "", 0.0
+    grouped = itertools.groupby(rows, key=lambda r: r[1])
+    page_text = "\n".join(" ".join(w for w, *_ in grp) for _, grp in grouped)
+    mean_conf = statistics.fmean(c for *_, c in rows)
+    return page_text, mean_conf
+
+
+def ocr_image(img: Image.Image, confidence_threshold: float = OCR_CONFIDENCE_THRESHOLD) -> str:
+    """OCR one page; the second PSM pass only runs when the first is below the confidence threshold."""
+    bin_img, gray = preprocess_pil(img)
+    psm = pick_psm(bin_img)
+    txt1, conf1 = tess_data(bin_img, psm)
+    if conf1 >= confidence_threshold:
+        return txt1
+    psm2 = "4" if psm != "4" else "6"
+    txt2, conf2 = tess_data(gray, psm2)
+    return txt2 if conf2 > conf1 else txt1
+
+
+# --------------------------------------------------------------------------- #
+#                              WORKER PROCESS SIDE                            #
+# --------------------------------------------------------------------------- #
+def _init_worker():
+    # One Tesseract thread per process – parallelism comes from the pool
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    cv2.setNumThreads(1)
+
+
+def ocr_page_range(pdf_path: str, first_page: int, last_page: int,
+                   dpi: int = OCR_DPI,
+                   confidence_threshold: float = OCR_CONFIDENCE_THRESHOLD) -> List[str]:
+    """Render a page range with a single poppler call and OCR each page."""
+    images = convert_from_path(
+        pdf_path, first_page=first_page, last_page=last_page, dpi=dpi, thread_count=1
+    )
+    texts = []
+    for img in images:
+        texts.append(ocr_image(img, confidence_threshold))
+        img.close()
+    return texts
+
+
+# --------------------------------------------------------------------------- #
+#                                   ENGINE                                    #
+# --------------------------------------------------------------------------- #
+class OCREngine:
+    """
+    Splits a PDF into page ranges, OCRs them concurrently on a process pool and
+    yields page texts back in document order.
+    """
+
+    def __init__(self, processes: int = OCR_PROCESSES, pages_per_task: int = OCR_PAGES_PER_TASK):
+        self.processes = processes
+        self.pages_per_task = max(1, pages_per_task)
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: never fork a process that holds torch/CLIP threads
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def iter_page_texts(self, pdf_bytes: bytes, *, dpi: int = OCR_DPI,
+                        confidence_threshold: float = OCR_CONFIDENCE_THRESHOLD) -> Generator[str, None, None]:
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+            tmp.write(pdf_bytes)
+            tmp.flush()
+
+            page_count = pdfinfo_from_path(tmp.name)["Pages"]
+            ranges = [
+                (first, min(first + self.pages_per_task - 1, page_count))
+                for first in range(1, page_count + 1, self.pages_per_task)
+            ]
+
+            try:
+                pool = self._get_pool()
+                futures = [
+                    pool.submit(ocr_page_range, tmp.name, first, last, dpi, confidence_threshold)
+                    for first, last in ranges
+                ]
+            except BrokenProcessPool:
+                self._reset_pool()
+                futures = None
+
+            if futures is None:
+                logger.warning("OCR process pool unavailable – running OCR in-process")
+                for first, last in ranges:
+                    yield from ocr_page_range(tmp.name, first, last, dpi, confidence_threshold)
+                return
+
+            try:
+                for (first, last), future in zip(ranges, futures):
+                    try:
+                        yield from future.result()
+                    except BrokenProcessPool:
+                        # A worker died (e.g. OOM); redo this range locally and rebuild the pool next time
+                        logger.error("OCR worker crashed on pages %d-%d – retrying in-process", first, last)
+                        self._reset_pool()
+                        yield from ocr_page_range(tmp.name, first, last, dpi, confidence_threshold)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def shutdown(self):
+        self._reset_pool()
+
+
+ocr_engine = OCREngine()
+atexit.register(ocr_engine.shutdown)
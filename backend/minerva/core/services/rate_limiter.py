@@ -0,0 +1,240 @@
+# minerva/core/services/rate_limiter.py
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_RATE_LIMITS_ENABLED = os.getenv("SCRAPER_RATE_LIMITS_ENABLED", "true").lower() == "true"
+# Per-source overrides as JSON, e.g. '{"ted": {"rate": 0.5, "max_concurrency": 2}}'
+SCRAPER_RATE_LIMITS = os.getenv("SCRAPER_RATE_LIMITS", "")
+
+# rate: requests per second refilled into the bucket; burst: bucket size;
+# concurrency starts at initial_concurrency and moves between the bounds;
+# backoff_seconds: first pause after a 429/503, doubled on repeats.
+DEFAULT_LIMITS: Dict[str, float] = {
+    "rate": 2.0,
+    "burst": 4,
+    "initial_concurrency": 2,
+    "min_concurrency": 1,
+    "max_concurrency": 8,
+    "backoff_seconds": 15,
+    "max_backoff_seconds": 300,
+}
+
+# Keyed by TenderSourceType value; "ted_germany" falls back to "ted"
+SOURCE_LIMITS: Dict[str, Dict[str, float]] = {
+    # TED answers bursts with 429 and long lockouts
+    "ted": {"rate": 1.0, "burst": 2, "max_concurrency": 4, "backoff_seconds": 30, "max_backoff_seconds": 600},
+    "ezamowienia": {"rate": 3.0, "burst": 6, "max_concurrency": 6},
+    "platformazakupowa": {"rate": 2.0, "burst": 4, "max_concurrency": 6},
+    "egospodarka": {"rate": 0.5, "burst": 1, "initial_concurrency": 1, "max_concurrency": 1},
+}
+
+THROTTLE_STATUSES = {429, 503}
+
+
+def _is_timeout(exc: BaseException) -> bool:
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    text = f"{type(exc).__name__} {exc}".lower()
+    return "timeout" in text or "net::err" in text
+
+
+class HostLimiter:
+    """
+    Token bucket plus AIMD concurrency window for one host.
+
+    Each healthy response grows the window by 1/window (about +1 per full
+    window), each throttle or timeout halves it. A 429/503 also pauses the
+    bucket, honouring Retry-After when the site sends one.
+    """
+
+    def __init__(self, host: str, limits: Dict[str, float]):
+        self.host = host
+        self.rate = float(limits["rate"])
+        self.burst = float(limits["burst"])
+        self.min_concurrency = float(limits["min_concurrency"])
+        self.max_concurrency = float(limits["max_concurrency"])
+        self.base_backoff = float(limits["backoff_seconds"])
+        self.max_backoff = float(limits["max_backoff_seconds"])
+        self.window = min(max(float(limits["initial_concurrency"]), self.min_concurrency), self.max_concurrency)
+        self.in_flight = 0
+        self._tokens = self.burst
+        self._last_refill: Optional[float] = None
+        self._paused_until = 0.0
+        self._backoff = self.base_backoff
+        self._cond = asyncio.Condition()
+        self._bucket_lock = asyncio.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.failures = 0
+
+    async def _take_token(self):
+        loop = asyncio.get_running_loop()
+        async with self._bucket_lock:
+            while True:
+                now = loop.time()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self._last_refill is not None:
+                    self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.window))
+            self.in_flight += 1
+        try:
+            await self._take_token()
+        except BaseException:
+            await self._finish()
+            raise
+        self.requests += 1
+
+    async def _finish(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        self.window = min(self.max_concurrency, self.window + 1 / self.window)
+        self._backoff = self.base_backoff
+
+    def on_overload(self, throttled: bool, retry_after: Optional[float] = None):
+        self.window = max(self.min_concurrency, self.window / 2)
+        if throttled:
+            self.throttled += 1
+            pause = retry_after if retry_after is not None else self._backoff
+            self._paused_until = max(self._paused_until, asyncio.get_running_loop().time() + pause)
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+            logger.warning(f"{self.host}: throttled, pausing {pause:.0f}s, concurrency {self.window:.1f}")
+        else:
+            self.failures += 1
+            logger.info(f"{self.host}: slow or failing responses, concurrency {self.window:.1f}")
+
+    async def release(self):
+        await self._finish()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": round(self.window, 2),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "failures": self.failures,
+        }
+
+
+class RequestSlot:
+    """Handed out by HostRateLimiter.slot(); record the response status if there is one."""
+
+    def __init__(self):
+        self.status: Optional[int] = None
+        self.retry_after: Optional[float] = None
+
+    def record(self, status: Optional[int], retry_after: Optional[str] = None):
+        self.status = status
+        if retry_after:
+            try:
+                self.retry_after = float(retry_after)
+            except ValueError:
+                self.retry_after = None
+
+
+class HostRateLimiter:
+    """
+    Shared politeness governor for scrapers: one HostLimiter per host,
+    configured from the limits of the source that first uses it.
+
+        async with host_limiter.slot(url, source=self.source_type) as slot:
+            response = await page.goto(url)
+            slot.record(response.status if response else None)
+
+    Exceptions that look like timeouts count as overload; other exceptions
+    leave the window unchanged.
+    """
+
+    def __init__(self, enabled: bool = SCRAPER_RATE_LIMITS_ENABLED):
+        self.enabled = enabled
+        self._overrides: Dict[str, Dict[str, float]] = {k: dict(v) for k, v in SOURCE_LIMITS.items()}
+        if SCRAPER_RATE_LIMITS:
+            try:
+                for source, override in json.loads(SCRAPER_RATE_LIMITS).items():
+                    self._overrides.setdefault(source, {}).update(override)
+            except (ValueError, AttributeError) as e:
+                logger.error(f"Ignoring invalid SCRAPER_RATE_LIMITS: {e}")
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def limits_for(self, source: Optional[str]) -> Dict[str, float]:
+        limits = dict(DEFAULT_LIMITS)
+        if source:
+            limits.update(self._overrides.get(source) or self._overrides.get(source.split("_")[0], {}))
+        return limits
+
+    def max_concurrency(self, source: Optional[str]) -> int:
+        return int(self.limits_for(source)["max_concurrency"])
+
+    def _limiter(self, url: str, source: Optional[str]) -> HostLimiter:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio primitives belong to the loop that created them
+            self._hosts = {}
+            self._loop = loop
+        host = urlparse(url).hostname or url
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = HostLimiter(host, self.limits_for(source))
+            self._hosts[host] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, url: str, source: Optional[str] = None):
+        slot = RequestSlot()
+        if not self.enabled:
+            yield slot
+            return
+        limiter = self._limiter(url, source)
+        await limiter.acquire()
+        try:
+            yield slot
+        except BaseException as e:
+            if slot.status is not None:
+                self._settle(limiter, slot)
+            elif _is_timeout(e):
+                limiter.on_overload(throttled=False)
+            raise
+        else:
+            self._settle(limiter, slot)
+        finally:
+            await limiter.release()
+
+    @staticmethod
+    def _settle(limiter: HostLimiter, slot: RequestSlot):
+        if slot.status in THROTTLE_STATUSES:
+            limiter.on_overload(throttled=True, retry_after=slot.retry_after)
+        elif slot.status is not None and slot.status >= 500:
+            limiter.on_overload(throttled=False)
+        else:
+            limiter.on_success()
+
+    def report_throttled(self, url: str, source: Optional[str] = None):
+        """Signal throttling seen outside a slot, e.g. a page that rendered without its data"""
+        if self.enabled:
+            self._limiter(url, source).on_overload(throttled=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {host: limiter.stats() for host, limiter in self._hosts.items()}
+
+
+host_limiter = HostRateLimiter()
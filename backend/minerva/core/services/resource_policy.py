@@ -0,0 +1,199 @@
+# minerva/core/services/resource_policy.py
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from playwright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+BROWSER_BLOCK_RESOURCES = os.getenv("BROWSER_BLOCK_RESOURCES", "true").lower() == "true"
+# Playwright resource types scrapers never read. Stylesheets stay loaded by
+# default: visibility checks and clicks depend on them on several sources.
+BROWSER_BLOCKED_RESOURCE_TYPES = [
+    t.strip() for t in os.getenv("BROWSER_BLOCKED_RESOURCE_TYPES", "image,media,font").split(",") if t.strip()
+]
+# Per-source overrides as JSON, e.g. '{"ted": {"allow_types": ["image"], "allow_urls": ["cdn\\\\.example"]}}'
+BROWSER_RESOURCE_POLICIES = os.getenv("BROWSER_RESOURCE_POLICIES", "")
+
+# Analytics, ads and chat widgets loaded by tender platforms
+BLOCKED_URL_PATTERNS = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"facebook\.(net|com)/tr",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"smartlook\.",
+    r"yandex\.ru/metrika",
+    r"mc\.yandex\.",
+    r"tawk\.to",
+    r"livechatinc\.com",
+    r"cookiebot\.com",
+    r"onetrust\.com",
+]
+
+# Requests a source needs even though they match the block rules
+SOURCE_ALLOWLISTS: Dict[str, Dict[str, List[str]]] = {
+    # The oneplace login form is protected by reCAPTCHA
+    "ezamawiajacy": {"allow_urls": [r"google\.com/recaptcha", r"gstatic\.com/recaptcha"]},
+    # Consent banner must load or it covers the search form
+    "platformazakupowa": {"allow_urls": [r"cookiebot\.com"]},
+}
+
+# Typical transfer size per blocked resource type, used until real responses
+# of that type have been observed for the source
+_DEFAULT_SIZES = {"image": 40_000, "media": 500_000, "font": 35_000, "stylesheet": 25_000, "script": 60_000}
+
+
+class ResourcePolicy:
+    """Which requests a context aborts: by resource type or URL pattern, minus allowlisted URLs."""
+
+    def __init__(
+        self,
+        blocked_types: Iterable[str] = (),
+        blocked_urls: Iterable[str] = (),
+        allow_types: Iterable[str] = (),
+        allow_urls: Iterable[str] = (),
+    ):
+        self.blocked_types = set(blocked_types) - set(allow_types)
+        self._blocked_urls = re.compile("|".join(blocked_urls)) if blocked_urls else None
+        self._allow_urls = re.compile("|".join(allow_urls)) if allow_urls else None
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if self._allow_urls is not None and self._allow_urls.search(url):
+            return False
+        if resource_type in self.blocked_types:
+            return True
+        return self._blocked_urls is not None and bool(self._blocked_urls.search(url))
+
+
+class _SourceStats:
+    def __init__(self):
+        self.requests = 0
+        self.blocked = 0
+        self.blocked_by_type: Dict[str, int] = defaultdict(int)
+        self._seen_bytes: Dict[str, int] = defaultdict(int)
+        self._seen_count: Dict[str, int] = defaultdict(int)
+
+    def observe_response(self, resource_type: str, size: int):
+        self._seen_bytes[resource_type] += size
+        self._seen_count[resource_type] += 1
+
+    def estimated_bytes_saved(self) -> int:
+        total = 0
+        for resource_type, count in self.blocked_by_type.items():
+            if self._seen_count[resource_type]:
+                avg = self._seen_bytes[resource_type] / self._seen_count[resource_type]
+            else:
+                avg = _DEFAULT_SIZES.get(resource_type, 10_000)
+            total += int(avg * count)
+        return total
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "blocked_by_type": dict(self.blocked_by_type),
+            "estimated_bytes_saved": self.estimated_bytes_saved(),
+        }
+
+
+def _policy_key(source: Optional[str]) -> str:
+    return source or "default"
+
+
+class ResourcePolicyRegistry:
+    """
+    Resolves the policy for a source and installs it on browser contexts.
+
+    A source without its own entry falls back to its family ("ted_germany"
+    uses "ted", "ezamowienia_historical" uses "ezamowienia"), then to the
+    default policy. Request and block counts are kept per source.
+    """
+
+    def __init__(self, enabled: bool = BROWSER_BLOCK_RESOURCES):
+        self.enabled = enabled
+        self._overrides: Dict[str, Dict[str, List[str]]] = {k: dict(v) for k, v in SOURCE_ALLOWLISTS.items()}
+        if BROWSER_RESOURCE_POLICIES:
+            try:
+                for source, override in json.loads(BROWSER_RESOURCE_POLICIES).items():
+                    self._overrides.setdefault(source, {}).update(override)
+            except (ValueError, AttributeError) as e:
+                logger.error(f"Ignoring invalid BROWSER_RESOURCE_POLICIES: {e}")
+        self._policies: Dict[str, ResourcePolicy] = {}
+        self._stats: Dict[str, _SourceStats] = defaultdict(_SourceStats)
+
+    def _override_for(self, source: Optional[str]) -> Dict[str, List[str]]:
+        if not source:
+            return {}
+        if source in self._overrides:
+            return self._overrides[source]
+        return self._overrides.get(source.split("_")[0], {})
+
+    def policy_for(self, source: Optional[str]) -> ResourcePolicy:
+        key = _policy_key(source)
+        policy = self._policies.get(key)
+        if policy is None:
+            override = self._override_for(source)
+            policy = ResourcePolicy(
+                blocked_types=override.get("block_types", BROWSER_BLOCKED_RESOURCE_TYPES),
+                blocked_urls=BLOCKED_URL_PATTERNS + override.get("block_urls", []),
+                allow_types=override.get("allow_types", []),
+                allow_urls=override.get("allow_urls", []),
+            )
+            self._policies[key] = policy
+        return policy
+
+    async def apply(self, context: BrowserContext, source: Optional[str] = None):
+        """Route every request of `context` through the source's policy"""
+        if not self.enabled:
+            return
+        policy = self.policy_for(source)
+        stats = self._stats[_policy_key(source)]
+
+        async def handle(route: Route):
+            request = route.request
+            stats.requests += 1
+            try:
+                if policy.should_block(request.resource_type, request.url):
+                    stats.blocked += 1
+                    stats.blocked_by_type[request.resource_type] += 1
+                    await route.abort("blockedbyclient")
+                else:
+                    await route.continue_()
+            except Exception as e:
+                # The page or context may already be gone
+                logger.debug(f"Resource route for {request.url} failed: {e}")
+
+        def on_response(response):
+            try:
+                size = int(response.headers.get("content-length", 0))
+            except (TypeError, ValueError):
+                return
+            if size:
+                stats.observe_response(response.request.resource_type, size)
+
+        await context.route("**/*", handle)
+        context.on("response", on_response)
+
+    def stats(self, source: Optional[str] = None) -> Dict[str, Any]:
+        if source is not None:
+            return self._stats[_policy_key(source)].as_dict()
+        return {key: s.as_dict() for key, s in self._stats.items()}
+
+    def log_stats(self, source: Optional[str] = None):
+        s = self._stats.get(_policy_key(source))
+        if not s or not s.requests:
+            return
+        logger.info(
+            f"{_policy_key(source)}: blocked {s.blocked}/{s.requests} requests, "
+            f"~{s.estimated_bytes_saved() / 1024 ** 2:.1f} MB saved"
+        )
+
+
+resource_policies = ResourcePolicyRegistry()
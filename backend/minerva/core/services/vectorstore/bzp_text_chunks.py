@@ -1,5 +1,4 @@
-from minerva.core.services.vectorstore.helpers import ChunkingConfig
-import tiktoken
+from minerva.core.services.vectorstore.helpers import ChunkingConfig, get_encoding
 from nltk.tokenize import sent_tokenize
 from typing import List, Optional
 from pydantic import BaseModel
@@ -12,7 +11,7 @@ class BZPDocumentChunker:
     
     def __init__(self, config: Optional[ChunkingConfig] = None):
         self.config = config or ChunkingConfig()
-        self.tokenizer = tiktoken.get_encoding(self.config.tokenizer_name)
+        self.tokenizer = get_encoding(self.config.tokenizer_name)
     
     @staticmethod
     def is_bzp_document(text: str) -> bool:
@@ -0,0 +1,182 @@
+import hashlib
+import logging
+import os
+from array import array
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_MAX_ITEMS = int(os.getenv("EMBEDDING_CACHE_MAX_ITEMS", "2000"))
+# Optional persistent tier shared between processes, e.g. redis://localhost:6379/2
+EMBEDDING_CACHE_REDIS_URL = os.getenv("EMBEDDING_CACHE_REDIS_URL")
+EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+
+def embedding_cache_key(model: str, dimensions: Optional[int], text: str) -> str:
+    """Content-addressed key: (model, dimensions, sha256(text))"""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"emb:{model}:{dimensions or 'default'}:{digest}"
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache.
+
+    The in-memory tier is an LRU of packed float64 arrays; the optional Redis
+    tier persists vectors across processes and re-scrapes. Vectors are stored
+    as raw doubles so cache hits return exactly what the API returned.
+    """
+
+    def __init__(self, max_items: int = EMBEDDING_CACHE_MAX_ITEMS, redis_url: Optional[str] = EMBEDDING_CACHE_REDIS_URL):
+        self.max_items = max_items
+        self._memory: "OrderedDict[str, array]" = OrderedDict()
+        self._redis = None
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis tier disabled: {e}")
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+
+    def _remember(self, key: str, vector: array):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        persistent_lookup: List[int] = []
+
+        for i, key in enumerate(keys):
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                results[i] = vector.tolist()
+            else:
+                persistent_lookup.append(i)
+
+        if persistent_lookup and self._redis is not None:
+            try:
+                raw_values = await self._redis.mget([keys[i] for i in persistent_lookup])
+                for i, raw in zip(persistent_lookup, raw_values):
+                    if raw:
+                        vector = array("d")
+                        vector.frombytes(raw)
+                        self._remember(keys[i], vector)
+                        results[i] = vector.tolist()
+                        self.persistent_hits += 1
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis lookup failed: {e}")
+
+        found = sum(1 for r in results if r is not None)
+        self.hits += found
+        self.misses += len(keys) - found
+        return results
+
+    async def set_many(self, entries: Dict[str, List[float]]):
+        packed = {key: array("d", vector) for key, vector in entries.items()}
+        for key, vector in packed.items():
+            self._remember(key, vector)
+
+        if packed and self._redis is not None:
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for key, vector in packed.items():
+                    pipe.set(key, vector.tobytes(), ex=EMBEDDING_CACHE_TTL_SECONDS)
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis write failed: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "persistent_hits": self.persistent_hits,
+            "hit_rate": (self.hits / total) if total else 0.0,
+            "memory_items": len(self._memory),
+        }
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Return the process-wide embedding cache, or None when disabled"""
+    global _embedding_cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache()
+    return _embedding_cache
+
+
+async def _track_embedding_cost(model: str, texts: List[str], token_counts: List[Optional[int]]):
+    """Charge the active cost tracking context for texts actually sent to the embeddings API"""
+    try:
+        # Import here to avoid circular imports
+        from minerva.core.services.llm_logic import get_current_cost_context
+        context = get_current_cost_context()
+        if context is None:
+            return
+        from minerva.core.services.vectorstore.helpers import count_tokens
+        tokens = sum(
+            count if count is not None else count_tokens(text, model)
+            for text, count in zip(texts, token_counts)
+        )
+        await context.track_embedding_operation(model, tokens)
+    except Exception as e:
+        logger.debug(f"Error tracking embedding costs: {str(e)}")
+
+
+async def cached_embeddings(
+    texts: List[str],
+    model: str,
+    dimensions: Optional[int],
+    embed: Callable[[List[str]], Awaitable[List[List[float]]]],
+    token_counts: Optional[List[Optional[int]]] = None,
+) -> List[List[float]]:
+    """
+    Resolve embeddings for `texts` through the cache, calling `embed` once
+    with the de-duplicated misses. Results are returned in input order.
+
+    Only the misses are charged to the active cost tracking context, using
+    `token_counts` where the caller already knows them.
+    """
+    if token_counts is None:
+        token_counts = [None] * len(texts)
+
+    cache = get_embedding_cache()
+    if cache is None:
+        vectors = await embed(texts)
+        await _track_embedding_cost(model, texts, token_counts)
+        return vectors
+
+    keys = [embedding_cache_key(model, dimensions, text) for text in texts]
+    results = await cache.get_many(keys)
+
+    missing: Dict[str, str] = {}
+    missing_counts: List[Optional[int]] = []
+    for key, text, count, vector in zip(keys, texts, token_counts, results):
+        if vector is None and key not in missing:
+            missing[key] = text
+            missing_counts.append(count)
+
+    if missing:
+        fresh = await embed(list(missing.values()))
+        await _track_embedding_cost(model, list(missing.values()), missing_counts)
+        fresh_by_key = dict(zip(missing.keys(), fresh))
+        await cache.set_many(fresh_by_key)
+        results = [vector if vector is not None else fresh_by_key[key] for key, vector in zip(keys, results)]
+
+    return results
@@ -0,0 +1,166 @@
+# minerva/core/services/vectorstore/file_content_extract/cache.py
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .base import BaseFileExtractor, FileContent
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", "/tmp/minerva-extraction-cache")
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+# Bump when extractor output changes so stale entries are ignored
+EXTRACTION_CACHE_VERSION = "1"
+
+# Extractors whose results reference temp files or raw bytes cannot be replayed
+_UNCACHEABLE_METADATA_KEYS = {"inner_temp_path", "original_bytes"}
+
+
+class ExtractionCache:
+    """
+    Content-addressed, size-bounded on-disk cache of extraction results.
+
+    Entries are keyed by sha256 of the raw file bytes plus the extractor class,
+    and hold the extracted text with its metadata (extractor, source_type,
+    is_technical_drawing, preview_chars, ...) as gzipped JSON. Hits refresh
+    the entry's mtime; once the cache exceeds max_bytes the least recently
+    used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str = EXTRACTION_CACHE_DIR, max_bytes: int = EXTRACTION_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._approx_size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, file_path: Path, extractor: BaseFileExtractor) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as fh:
+            for block in iter(lambda: fh.read(1024 * 1024), b""):
+                digest.update(block)
+        return f"{extractor.__class__.__name__}-v{EXTRACTION_CACHE_VERSION}-{digest.hexdigest()}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[-2:] / f"{key}.json.gz"
+
+    def get(self, key: str) -> Optional[List[FileContent]]:
+        path = self._entry_path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as fh:
+                payload = json.load(fh)
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as exc:
+            logger.warning("Discarding unreadable extraction cache entry %s: %s", path, exc)
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [FileContent(content=item["content"], metadata=item["metadata"]) for item in payload["contents"]]
+
+    def put(self, key: str, contents: List[FileContent]):
+        path = self._entry_path(key)
+        payload = {
+            "contents": [{"content": c.content, "metadata": c.metadata} for c in contents]
+        }
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+                json.dump(payload, fh, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as exc:
+            logger.warning("Could not write extraction cache entry %s: %s", path, exc)
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            if self._approx_size is None:
+                self._approx_size = self._disk_usage()
+            else:
+                self._approx_size += path.stat().st_size
+            if self._approx_size > self.max_bytes:
+                self._evict()
+
+    def _disk_usage(self) -> int:
+        return sum(p.stat().st_size for p in self.cache_dir.glob("*/*.json.gz"))
+
+    def _evict(self):
+        """Delete least recently used entries until the cache is at 90% of max_bytes."""
+        entries = []
+        for p in self.cache_dir.glob("*/*.json.gz"):
+            try:
+                stat = p.stat()
+                entries.append((stat.st_mtime, stat.st_size, p))
+            except FileNotFoundError:
+                continue
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for _, size, p in sorted(entries):
+            if total <= target:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        self._approx_size = total
+        logger.info("Extraction cache evicted %d entries (%.1f MB remaining)", evicted, total / 1024 ** 2)
+
+
+extraction_cache = ExtractionCache()
+
+
+def extract_file_content_cached(extractor: BaseFileExtractor, file_path: Path) -> Iterator[FileContent]:
+    """
+    Run extractor.extract_file_content(file_path), reusing the result of any
+    earlier extraction of byte-identical content.
+
+    Items are yielded as the extractor produces them: ZipFileExtractor's
+    inner_temp_path files only exist until its generator advances, and an
+    archive's text is never held in memory at once. The result is stored
+    once the extractor has finished.
+    """
+    if not EXTRACTION_CACHE_ENABLED:
+        yield from extractor.extract_file_content(file_path)
+        return
+
+    try:
+        key = extraction_cache.key_for(file_path, extractor)
+    except OSError as exc:
+        logger.warning("Extraction cache bypassed for %s: %s", file_path, exc)
+        yield from extractor.extract_file_content(file_path)
+        return
+
+    cached = extraction_cache.get(key)
+    if cached is not None:
+        logger.info("Extraction cache hit for %s (%s)", file_path.name, extractor.__class__.__name__)
+        for item in cached:
+            # The same bytes may arrive under a different name
+            if "filename" in item.metadata:
+                item.metadata["filename"] = file_path.name
+        yield from cached
+        return
+
+    contents: Optional[List[FileContent]] = []
+    for item in extractor.extract_file_content(file_path):
+        if contents is not None:
+            # Snapshot before the caller adds its own metadata (e.g. archive provenance)
+            metadata = dict(item.metadata or {})
+            if _UNCACHEABLE_METADATA_KEYS & set(metadata):
+                contents = None
+            else:
+                contents.append(FileContent(content=item.content, metadata=metadata))
+        yield item
+    if contents:
+        extraction_cache.put(key, contents)
@@ -0,0 +1,77 @@
+# minerva/core/services/vectorstore/file_content_extract/executor.py
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+from functools import partial
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 4)))
+# Extractions allowed to be running or queued on the pool before callers wait
+EXTRACTION_MAX_PENDING = int(os.getenv("EXTRACTION_MAX_PENDING", str(EXTRACTION_WORKERS * 2)))
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "900"))
+
+
+class ExtractionExecutor:
+    """
+    Bounded executor for synchronous file extraction (pypdf, CLIP, Tesseract).
+
+    Work runs on a dedicated thread pool so it never blocks the event loop.
+    Callers wait for a free slot once EXTRACTION_MAX_PENDING jobs are in flight,
+    and each job is awaited for at most EXTRACTION_TIMEOUT_SECONDS. A timed-out
+    job keeps its slot until its thread actually finishes, so backpressure
+    reflects the real pool load.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = EXTRACTION_WORKERS,
+        max_pending: int = EXTRACTION_MAX_PENDING,
+        timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+    ):
+        self.pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="extraction"
+        )
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.timed_out = 0
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run func(*args, **kwargs) on the extraction pool and await its result."""
+        slots = self._get_slots()
+        await slots.acquire()
+        self.in_flight += 1
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, partial(func, *args, **kwargs))
+
+        def _release(_):
+            self.in_flight -= 1
+            slots.release()
+
+        future.add_done_callback(_release)
+
+        try:
+            # shield() keeps the pool future alive so the slot is released only when the thread is done
+            return await asyncio.wait_for(asyncio.shield(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            logger.error(f"Extraction exceeded {timeout or self.timeout:.0f}s timeout ({self.in_flight} in flight)")
+            raise
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+
+
+extraction_executor = ExtractionExecutor()
+atexit.register(extraction_executor.shutdown)
@@ -5,45 +5,54 @@
 #   as either a technical drawing (skip) or a normal document (OCR).
 
 import io
-import itertools
 import logging
-import os
 import re
-import statistics
 import threading
 import time
 from pathlib import Path
 from typing import Generator, List, Literal
 
 import gc
-import pytesseract
-import cv2
-import numpy as np
 from PIL import Image
-from pdf2image import convert_from_bytes, pdfinfo_from_bytes
+from pdf2image import convert_from_bytes
 from pypdf import PdfReader
-from transformers import pipeline
 
+from minerva.core.services.ocr_engine import OCR_CONFIDENCE_THRESHOLD, ocr_engine
 from .base import BaseFileExtractor, FileContent
 
 # --------------------------------------------------------------------------- #
 #                       GLOBAL CONFIG, LOGGER & MODELS                        #
 # --------------------------------------------------------------------------- #
 logger = logging.getLogger(__name__)
-OCR_SEMAPHORE = threading.Semaphore(int(os.getenv("OCR_PARALLELISM", "4")))
-
-logger.info("Loading CLIP model (CPU)…")
-_CLIP = pipeline(
-    "zero-shot-image-classification",
-    model="openai/clip-vit-base-patch32",
-    device=-1,  # force CPU
-    use_fast=True
-)
+
+_CLIP = None
+_CLIP_LOCK = threading.Lock()
 _CLIP_LABELS = [
     "a technical drawing, blueprint or CAD schematic",
     "a normal page of text or scanned document",
 ]
-logger.info("CLIP model ready.")
+
+
+def _get_clip():
+    """
+    Load CLIP on first use. Not at import time: OCR pool workers are spawned
+    and re-import the parent's __main__, which reaches this module, so an
+    eager load would put a CLIP copy in every OCR process.
+    """
+    global _CLIP
+    with _CLIP_LOCK:
+        if _CLIP is None:
+            from transformers import pipeline
+
+            logger.info("Loading CLIP model (CPU)…")
+            _CLIP = pipeline(
+                "zero-shot-image-classification",
+                model="openai/clip-vit-base-patch32",
+                device=-1,  # force CPU
+                use_fast=True
+            )
+            logger.info("CLIP model ready.")
+        return _CLIP
 
 # --------------------------------------------------------------------------- #
 #                              TEXT NORMALISATION                             #
@@ -115,7 +124,7 @@ def _first_page_is_drawing(pdf_bytes: bytes, *, dpi: int = 150) -> bool:
         raise ValueError("Empty PDF or pdf2image failure")
 
     pil_img: Image.Image = page_imgs[0].convert("RGB")
-    outputs = _CLIP(pil_img, candidate_labels=_CLIP_LABELS)
+    outputs = _get_clip()(pil_img, candidate_labels=_CLIP_LABELS)
     top = outputs[0]  # highest-prob label
 
     label: Literal["drawing", "document"] = (
@@ -183,8 +192,7 @@ class PDFFileExtractor(BaseFileExtractor):
 
         # 3) Fallback OCR
         self.logger.info("%s: running OCR…", file_path.name)
-        with OCR_SEMAPHORE:
-            ocr_text = self._run_ocr(pdf_bytes)
+        ocr_text = self._run_ocr(pdf_bytes)
         return ocr_text.strip()
 
     # ------------------------------ generator ------------------------------ #
@@ -254,8 +262,7 @@ class PDFFileExtractor(BaseFileExtractor):
 
         # 3) OCR & yield
         self.logger.info("%s: performing OCR (generator)…", file_path.name)
-        with OCR_SEMAPHORE:
-            ocr_text = self._run_ocr(pdf_bytes)
+        ocr_text = self._run_ocr(pdf_bytes)
         if ocr_text.strip():
             yield FileContent(
                 content=ocr_text.strip(),
@@ -284,27 +291,17 @@ class PDFFileExtractor(BaseFileExtractor):
         return "\n".join(out)
 
     # ------------------------------ OCR stuff ------------------------------ #
-    def _run_ocr(self, pdf_bytes: bytes, *, confidence_threshold: float = 60.0) -> str:
+    def _run_ocr(self, pdf_bytes: bytes, *, confidence_threshold: float = OCR_CONFIDENCE_THRESHOLD) -> str:
+        """OCR all pages in parallel on the OCR process pool, joined in page order."""
         t0 = time.perf_counter()
         texts = []
         
-        for idx, img in enumerate(self._iter_pdf_pages(pdf_bytes)):
-            bin_img, gray = self.preprocess_pil(img)
-            psm = self._pick_psm(bin_img)
-            txt1, conf1 = self._tess_data(bin_img, psm)
-            if conf1 < confidence_threshold:
-                psm2 = "4" if psm != "4" else "6"
-                txt2, conf2 = self._tess_data(gray, psm2)
-                txt = txt2 if conf2 > conf1 else txt1
-            else:
-                txt = txt1
+        for idx, txt in enumerate(ocr_engine.iter_page_texts(pdf_bytes, confidence_threshold=confidence_threshold)):
             texts.append(txt)
             
             if idx and idx % 5 == 0:
                 self.logger.debug("… OCR page %d done (%d chars): %s", 
                                 idx + 1, len(txt), txt[:200] + "..." if len(txt) > 200 else txt)
-            if idx and idx % 10 == 0:
-                gc.collect()
                 
         res = "\n\n".join(texts)
         total_time = time.perf_counter() - t0
@@ -313,68 +310,5 @@ class PDFFileExtractor(BaseFileExtractor):
         self.logger.info(f"{context_str}OCR finished: %d pages in %.1fs (%.1f kchars)",
                          len(texts), total_time, len(res) / 1000)
         
-        
+        gc.collect()
         return res
-
-    # ---------- image preprocessing & Tesseract helpers (unchanged) -------- #
-    def preprocess_pil(self, img: Image.Image) -> tuple[Image.Image, Image.Image]:
-        gray = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2GRAY)
-        gray = self._fix_orientation(gray)
-        _, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        if (bw == 0).mean() > 0.75:
-            bw = cv2.bitwise_not(bw)
-        bw = self._deskew_small(bw)
-        return Image.fromarray(bw), Image.fromarray(gray)
-
-    # ---------- rotation / deskew / tess helpers (unchanged) --------------- #
-    def _fix_orientation(self, gray: np.ndarray) -> np.ndarray:
-        try:
-            rot = pytesseract.image_to_osd(gray, output_type=pytesseract.Output.DICT)["rotate"]
-        except pytesseract.TesseractError:
-            rot = 0
-        return cv2.rotate(gray, cv2.ROTATE_90_CLOCKWISE) if rot == 270 else \
-               cv2.rotate(gray, cv2.ROTATE_90_COUNTERCLOCKWISE) if rot == 90 else gray
-
-    def _deskew_small(self, bw: np.ndarray) -> np.ndarray:
-        coords = np.column_stack(np.where(bw == 0))
-        if coords.size == 0:
-            return bw
-        angle = cv2.minAreaRect(coords)[-1]
-        angle = angle + 90 if angle < -45 else angle
-        if abs(angle) < 1 or abs(angle) > 15:
-            return bw
-        h, w = bw.shape
-        M = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
-        return cv2.warpAffine(bw, M, (w, h),
-                              flags=cv2.INTER_CUBIC,
-                              borderMode=cv2.BORDER_REPLICATE)
-
-    def _pick_psm(self, img: Image.Image) -> str:
-        w, h = img.size
-        aspect = h / w
-        return "4" if aspect < 0.7 else "6" if aspect > 1.4 else "3"
-
-    def _tess_data(self, img: Image.Image, psm: str,
-                   lang: str = "pol+eng") -> tuple[str, float]:
-        cfg = f"--oem 3 --dpi 300 --psm {psm}"
-        data = pytesseract.image_to_data(
-            img, lang=lang, config=cfg, output_type=pytesseract.Output.DICT
-        )
-        rows = [
-            (w, l, float(c))
-            for w, l, c in zip(data["text"], data["line_num"], data["conf"])
-            if w.strip() and c != "-1"
-        ]
-        if not rows:
-            return "", 0.0
-        grouped = itertools.groupby(rows, key=lambda r: r[1])
-        page_text = "\n".join(" ".join(w for w, *_ in grp) for _, grp in grouped)
-        mean_conf = statistics.fmean(c for *_, c in rows)
-        return page_text, mean_conf
-
-    def _iter_pdf_pages(self, pdf_bytes: bytes, dpi: int = 300) -> Generator[Image.Image, None, None]:
-        info = pdfinfo_from_bytes(pdf_bytes)
-        for p in range(1, info["Pages"] + 1):
-            yield from convert_from_bytes(
-                pdf_bytes, first_page=p, last_page=p, dpi=dpi, thread_count=2
-            )
@@ -13,6 +13,7 @@ import gc
 from minerva.core.services.vectorstore.file_content_extract.odt_extractor import OpenOfficeOdtFileExtractor
 
 from .base import ExtractorRegistry
+from .cache import extract_file_content_cached
 from .zip_extractor import ZipFileExtractor
 from .word_extractor import WordFileExtractor
 from .pdf_extractor import PDFFileExtractor
@@ -84,7 +85,7 @@ class FileExtractionService:
         original_bytes_top_level = None  # MODIFIED: Initialize to None
         read_top_level_bytes_once = False # MODIFIED: Flag to read only once
 
-        for chunk in extractor.extract_file_content(file_path):
+        for chunk in extract_file_content_cached(extractor, file_path):
             extracted_filename = chunk.metadata.get("filename", original_filename) # Use original_filename as fallback
             preview_chars = chunk.metadata.get("preview_chars", "")
             extracted_bytes = chunk.content.encode("utf-8", errors="replace")
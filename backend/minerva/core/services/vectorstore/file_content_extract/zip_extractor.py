@@ -10,6 +10,7 @@ import py7zr
 import rarfile
 
 from .base import BaseFileExtractor, FileContent, ExtractorRegistry
+from .cache import extract_file_content_cached
 
 class ZipFileExtractor(BaseFileExtractor):
     """
@@ -60,7 +61,7 @@ class ZipFileExtractor(BaseFileExtractor):
                             self.logger.info(
                                 f"Extracting '{extracted_path.name}' inside archive with '{extractor.__class__.__name__}'."
                             )
-                            for content in extractor.extract_file_content(extracted_path):
+                            for content in extract_file_content_cached(extractor, extracted_path):
                                 if content.metadata is None:
                                     content.metadata = {}
                                 # Always keep the inner extractor’s own fields
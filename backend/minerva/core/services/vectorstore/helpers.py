@@ -1,3 +1,7 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator
+
 import tiktoken
 from pydantic import BaseModel
 
@@ -7,29 +11,64 @@ class ChunkingConfig(BaseModel):
     tokenizer_name: str = "cl100k_base"
 
 
+@dataclass
+class TextChunk:
+    """A chunk of text together with its token count, computed once by the chunker."""
+    text: str
+    token_count: int
+
+
+@lru_cache(maxsize=None)
+def get_encoding(encoding_name: str = "cl100k_base") -> tiktoken.Encoding:
+    """Process-wide cached tiktoken encoding by name"""
+    return tiktoken.get_encoding(encoding_name)
+
+
+@lru_cache(maxsize=None)
+def get_model_encoding(model: str = "text-embedding-3-large") -> tiktoken.Encoding:
+    """Process-wide cached tiktoken encoding for a model"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return get_encoding("cl100k_base")
+
+
 def count_tokens(text, model="text-embedding-3-large"):
-    enc = tiktoken.encoding_for_model(model)
-    return len(enc.encode(text))
+    return len(get_model_encoding(model).encode(text))
 
 MAX_TOKENS = 8192 - 100
 
-def safe_chunk_text(text, chunker, embedding_model):
-    for chunk in chunker.create_chunks(text):
-        if count_tokens(chunk, embedding_model) <= MAX_TOKENS:
-            yield chunk
+def safe_token_chunks(text, chunker, embedding_model) -> Iterator[TextChunk]:
+    """
+    Chunk text into TextChunk objects that fit within MAX_TOKENS, reusing the
+    token counts computed by the chunker when it shares the model's encoding.
+    """
+    model_encoding = get_model_encoding(embedding_model)
+    reuse_counts = chunker.tokenizer.name == model_encoding.name
+
+    for chunk in chunker.create_token_chunks(text):
+        tokens = chunk.token_count if reuse_counts else len(model_encoding.encode(chunk.text))
+        if tokens <= MAX_TOKENS:
+            yield TextChunk(chunk.text, tokens)
         else:
             # Split further if needed (rare, but possible with huge sentences)
-            words = chunk.split()
+            words = chunk.text.split()
             subchunk = []
             sublen = 0
             for word in words:
-                wlen = count_tokens(word, embedding_model)
+                wlen = len(model_encoding.encode(word))
                 if sublen + wlen > MAX_TOKENS:
-                    yield " ".join(subchunk)
+                    subtext = " ".join(subchunk)
+                    yield TextChunk(subtext, len(model_encoding.encode(subtext)))
                     subchunk = [word]
                     sublen = wlen
                 else:
                     subchunk.append(word)
                     sublen += wlen
             if subchunk:
-                yield " ".join(subchunk)
\ No newline at end of file
+                subtext = " ".join(subchunk)
+                yield TextChunk(subtext, len(model_encoding.encode(subtext)))
+
+def safe_chunk_text(text, chunker, embedding_model):
+    for chunk in safe_token_chunks(text, chunker, embedding_model):
+        yield chunk.text
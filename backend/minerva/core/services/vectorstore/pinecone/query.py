@@ -7,10 +7,13 @@ from dotenv import load_dotenv
 import asyncio
 from functools import partial
 from pinecone import Pinecone
+from minerva.core.services.vectorstore.embedding_cache import cached_embeddings
 
 load_dotenv()
 async_openai_client = AsyncOpenAI()
 pinecone = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+# Inputs per embeddings request; the API rejects more than 2048
+QUERY_EMBEDDING_BATCH_SIZE = int(os.getenv("QUERY_EMBEDDING_BATCH_SIZE", "512"))
 
 class QueryConfig(BaseModel):
     index_name: str
@@ -25,12 +28,23 @@ class QueryTool:
         self.loop = asyncio.get_running_loop()
 
     async def create_query_embedding(self, query_text: str) -> List[float]:
-        response = await self.async_openai.embeddings.create(
-            input=query_text,
-            model=self.config.embedding_model
+        embeddings = await cached_embeddings(
+            [query_text],
+            model=self.config.embedding_model,
+            dimensions=None,
+            embed=self._request_embeddings,
         )
+        return embeddings[0]
 
-        return response.data[0].embedding
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        embeddings = []
+        for start in range(0, len(texts), QUERY_EMBEDDING_BATCH_SIZE):
+            response = await self.async_openai.embeddings.create(
+                input=texts[start:start + QUERY_EMBEDDING_BATCH_SIZE],
+                model=self.config.embedding_model
+            )
+            embeddings.extend(data.embedding for data in response.data)
+        return embeddings
 
     def _build_filter(
         self,
@@ -100,12 +114,48 @@ class QueryTool:
                 "error": str(e)
             }
 
+    async def create_query_embeddings(self, query_texts: List[str]) -> List[List[float]]:
+        """Embed several query texts, QUERY_EMBEDDING_BATCH_SIZE inputs per request."""
+        return await cached_embeddings(
+            query_texts,
+            model=self.config.embedding_model,
+            dimensions=None,
+            embed=self._request_embeddings,
+        )
+
+    async def fetch_metadata_by_ids(
+        self,
+        ids: List[str],
+        batch_size: int = 100
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch stored metadata for many vector IDs with Pinecone fetch, in
+        concurrent batches. IDs that do not exist are absent from the result.
+        """
+        unique_ids = list(dict.fromkeys(i for i in ids if i))
+        batches = [unique_ids[i:i + batch_size] for i in range(0, len(unique_ids), batch_size)]
+
+        responses = await asyncio.gather(*[
+            self.loop.run_in_executor(
+                None,
+                partial(self.index.fetch, ids=batch, namespace=self.config.namespace),
+            )
+            for batch in batches
+        ])
+
+        metadata_by_id = {}
+        for response in responses:
+            for vector_id, vector in response.vectors.items():
+                metadata_by_id[vector_id] = vector.metadata or {}
+        return metadata_by_id
+
     async def query_by_text(
         self,
         query_text: str,
         top_k: int = 3,
         score_threshold: float = 0.7,
-        filter_conditions: Optional[Dict[str, Any]] = None
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        query_vector: Optional[List[float]] = None
     ) -> Dict[str, Any]:
         """
         Query Pinecone by text with optional filter conditions.
@@ -115,10 +165,40 @@ class QueryTool:
             top_k: Number of results to return
             score_threshold: Minimum similarity score threshold
             filter_conditions: Optional dictionary of filter conditions
+            query_vector: Optional pre-computed embedding of query_text
+        """
+        try:
+            query_embedding = query_vector or await self.create_query_embedding(query_text)
+            return await self.query_by_vector(
+                query_vector=query_embedding,
+                top_k=top_k,
+                score_threshold=score_threshold,
+                filter_conditions=filter_conditions
+            )
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    async def query_by_vector(
+        self,
+        query_vector: List[float],
+        top_k: int = 3,
+        score_threshold: float = 0.7,
+        filter_conditions: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Query Pinecone with a pre-computed embedding and optional filter conditions.
+        
+        Args:
+            query_vector: The query embedding
+            top_k: Number of results to return
+            score_threshold: Minimum similarity score threshold
+            filter_conditions: Optional dictionary of filter conditions
         """
         try:
-            query_embedding = await self.create_query_embedding(query_text)
-            
             filter_dict = self._build_filter(filter_conditions)
 
             query_response = await self.loop.run_in_executor(
@@ -126,7 +206,7 @@ class QueryTool:
                 partial(
                     self.index.query,
                     namespace=self.config.namespace,
-                    vector=query_embedding,
+                    vector=query_vector,
                     top_k=top_k,
                     include_metadata=True,
                     filter=filter_dict,
@@ -7,6 +7,7 @@ import concurrent.futures
 import atexit
 from typing import List, Dict, Any, Union, Optional
 from minerva.core.services.vectorstore.helpers import MAX_TOKENS, count_tokens
+from minerva.core.services.vectorstore.embedding_cache import cached_embeddings
 from pinecone import Pinecone
 from openai import AsyncOpenAI
 from pydantic import BaseModel
@@ -37,10 +38,24 @@ class EmbeddingTool:
         self.config = config
         self.loop = asyncio.get_running_loop()
 
-    async def create_embedding(self, input: Union[str, List[str]]) -> List[List[float]]:
-        """Create embeddings for input text(s)"""
+    async def create_embedding(
+        self,
+        input: Union[str, List[str]],
+        token_counts: Optional[List[int]] = None
+    ) -> List[List[float]]:
+        """Create embeddings for input text(s), serving repeated texts from the embedding cache"""
+        texts = [input] if isinstance(input, str) else list(input)
+        return await cached_embeddings(
+            texts,
+            model=self.config.embedding_model,
+            dimensions=self.config.dimensions,
+            embed=self._request_embeddings,
+            token_counts=token_counts,
+        )
+
+    async def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
         response = await self.openai.embeddings.create(
-            input=input,
+            input=texts,
             model=self.config.embedding_model,
             encoding_format=self.config.encoding_format,
             dimensions=self.config.dimensions
@@ -55,7 +70,10 @@ class EmbeddingTool:
         self,
         items: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Batch create and store embeddings with metadata, with extractor/source logging."""
+        """
+        Batch create and store embeddings with metadata, with extractor/source logging.
+        Items may carry a pre-computed "token_count" to skip re-tokenizing their input.
+        """
         processed_count = 0
         failed_items = []
 
@@ -67,11 +85,14 @@ class EmbeddingTool:
             batch_items_to_process = items[i:i + batch_size]
             
             batch_texts_for_embedding = []
+            batch_token_counts = []
             valid_items_for_batch = []
 
             for item in batch_items_to_process:
                 item_input = item["input"]
-                tokens = count_tokens(item_input, self.config.embedding_model)
+                tokens = item.get("token_count")
+                if tokens is None:
+                    tokens = count_tokens(item_input, self.config.embedding_model)
                 extractor = item["metadata"].get("extractor", "unknown")
                 source_type = item["metadata"].get("source_type", "unknown")
 
@@ -88,6 +109,7 @@ class EmbeddingTool:
                     continue
 
                 batch_texts_for_embedding.append(item_input)
+                batch_token_counts.append(tokens)
                 valid_items_for_batch.append(item)
 
             if not valid_items_for_batch:
@@ -95,7 +117,7 @@ class EmbeddingTool:
 
             try:
                 logging.info(f"Creating embeddings for batch starting at index {i} (size: {len(batch_texts_for_embedding)})")
-                embeddings = await self.create_embedding(batch_texts_for_embedding)
+                embeddings = await self.create_embedding(batch_texts_for_embedding, batch_token_counts)
 
                 vectors_to_upsert: list[dict[str, Any]] = []
                 for item_data, embedding_values in zip(valid_items_for_batch, embeddings):
@@ -1,6 +1,5 @@
 from minerva.core.services.vectorstore.bzp_text_chunks import BZPDocumentChunker
-from minerva.core.services.vectorstore.helpers import ChunkingConfig
-import tiktoken
+from minerva.core.services.vectorstore.helpers import ChunkingConfig, TextChunk, get_encoding
 from nltk.tokenize import sent_tokenize
 from typing import List, Optional
 from pydantic import BaseModel
@@ -14,9 +13,20 @@ logger = logging.getLogger(__name__)
 class TextChunker:
     def __init__(self, config: Optional[ChunkingConfig] = None):
         self.config = config or ChunkingConfig()
-        self.tokenizer = tiktoken.get_encoding(self.config.tokenizer_name)
+        self.tokenizer = get_encoding(self.config.tokenizer_name)
         self.bzp_chunker = BZPDocumentChunker(config)
 
+    def create_token_chunks(self, text: str, chunk_size: Optional[int] = None) -> List[TextChunk]:
+        """
+        Like create_chunks, but each chunk carries its token count for downstream
+        embedding and cost tracking. The count is taken once over the chunk text
+        that is embedded; summed sentence counts differ from it at the joins.
+        """
+        return [
+            TextChunk(chunk, len(self.tokenizer.encode(chunk)))
+            for chunk in self.create_chunks(text, chunk_size)
+        ]
+
     def create_chunks(self, text: str, chunk_size: Optional[int] = None) -> List[str]:
         if not text or text.isspace():
             return []
@@ -39,6 +49,7 @@ class TextChunker:
 
         chunks = []
         current_chunk_sentences = []
+        current_chunk_sentence_tokens = []
         current_chunk_tokens = 0
 
         for sentence_text in sentences:
@@ -51,6 +62,7 @@ class TextChunker:
                 if current_chunk_sentences:
                     chunks.append(" ".join(current_chunk_sentences).strip())
                     current_chunk_sentences = []
+                    current_chunk_sentence_tokens = []
                     current_chunk_tokens = 0
                 
                 # Now, split the oversized sentence_token_ids
@@ -77,16 +89,19 @@ class TextChunker:
                 # Start a new chunk with overlap from the previous one
                 # Build overlap based on sentences from the end of the previous chunk
                 overlap_sentences_for_new_chunk = []
+                overlap_sentence_tokens = []
                 overlap_tokens_count = 0
                 for prev_sentence_idx in range(len(current_chunk_sentences) - 1, -1, -1):
                     prev_sentence_text = current_chunk_sentences[prev_sentence_idx]
-                    prev_sentence_tokens = len(self.tokenizer.encode(prev_sentence_text))
+                    prev_sentence_tokens = current_chunk_sentence_tokens[prev_sentence_idx]
                     if overlap_tokens_count + prev_sentence_tokens > effective_overlap_tokens:
                         break
                     overlap_sentences_for_new_chunk.insert(0, prev_sentence_text) # Add to the beginning
+                    overlap_sentence_tokens.insert(0, prev_sentence_tokens)
                     overlap_tokens_count += prev_sentence_tokens
                 
                 current_chunk_sentences = overlap_sentences_for_new_chunk
+                current_chunk_sentence_tokens = overlap_sentence_tokens
                 current_chunk_tokens = overlap_tokens_count
 
                 # If the current sentence *still* makes the new chunk (with overlap) too big,
@@ -95,14 +110,17 @@ class TextChunker:
                 # This assumes sentence_token_count <= effective_chunk_size (handled by Case 1).
                 if current_chunk_tokens + sentence_token_count > effective_chunk_size:
                     current_chunk_sentences = [sentence_text] # current_chunk has only this sentence
+                    current_chunk_sentence_tokens = [sentence_token_count]
                     current_chunk_tokens = sentence_token_count
                 else:
                     current_chunk_sentences.append(sentence_text)
+                    current_chunk_sentence_tokens.append(sentence_token_count)
                     current_chunk_tokens += sentence_token_count
             
             # Case 3: Sentence fits into the current chunk
             else:
                 current_chunk_sentences.append(sentence_text)
+                current_chunk_sentence_tokens.append(sentence_token_count)
                 current_chunk_tokens += sentence_token_count
 
         # Add any remaining sentences in current_chunk_sentences
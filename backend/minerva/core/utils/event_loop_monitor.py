@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", "1.0"))
+LOOP_LAG_WARN_SECONDS = float(os.getenv("LOOP_LAG_WARN_SECONDS", "0.5"))
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a fixed-interval sleep.
+    Sustained lag means synchronous work is running on the loop and starving
+    other coroutines (Playwright callbacks, HTTP clients, Redis heartbeats).
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS, warn_threshold: float = LOOP_LAG_WARN_SECONDS):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.total_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.samples += 1
+            self.total_lag += lag
+            if lag > self.warn_threshold:
+                logger.warning(f"Event loop lag {lag * 1000:.0f} ms")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "last_lag_ms": round(self.last_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "avg_lag_ms": round(self.total_lag / self.samples * 1000, 1) if self.samples else 0.0,
+            "samples": self.samples,
+        }
+
+
+loop_lag_monitor = EventLoopLagMonitor()
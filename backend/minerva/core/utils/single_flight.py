@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from bson import json_util
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+# Falls back to the task Redis; without either, calls simply run locally
+SINGLE_FLIGHT_REDIS_URL = os.getenv("SINGLE_FLIGHT_REDIS_URL") or os.getenv("REDIS_URL")
+SINGLE_FLIGHT_LOCK_SECONDS = int(os.getenv("SINGLE_FLIGHT_LOCK_SECONDS", "60"))
+SINGLE_FLIGHT_RESULT_TTL_SECONDS = int(os.getenv("SINGLE_FLIGHT_RESULT_TTL_SECONDS", str(12 * 3600)))
+# How long a follower waits for the leader before doing the work itself
+SINGLE_FLIGHT_WAIT_SECONDS = int(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "1800"))
+
+# Delete the lock only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Extend the lock only if we still own it
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisSingleFlight:
+    """
+    Distributed single-flight: for a given key only one caller across all
+    processes runs the work; the others wait for its published result.
+
+    The leader holds `sf:lock:<key>` (renewed while it works) and stores the
+    result under `sf:result:<key>`. Followers poll for the result; if the lock
+    disappears without a result (leader failed, or the result was not
+    shareable) one of them takes over. Any Redis failure degrades to running
+    the work locally.
+    """
+
+    def __init__(self, redis_url: Optional[str] = SINGLE_FLIGHT_REDIS_URL):
+        self._redis = None
+        if SINGLE_FLIGHT_ENABLED and redis_url:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(redis_url)
+                self._release = self._redis.register_script(_RELEASE_SCRIPT)
+                self._renew = self._redis.register_script(_RENEW_SCRIPT)
+            except Exception as e:
+                logger.warning(f"Single-flight disabled: {e}")
+                self._redis = None
+        self.led = 0
+        self.shared = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    async def _keep_lock(self, lock_key: str, token: str):
+        while True:
+            await asyncio.sleep(SINGLE_FLIGHT_LOCK_SECONDS / 3)
+            try:
+                await self._renew(keys=[lock_key], args=[token, SINGLE_FLIGHT_LOCK_SECONDS * 1000])
+            except Exception as e:
+                logger.warning(f"Single-flight lock renewal failed for {lock_key}: {e}")
+
+    async def _lead(self, key: str, token: str, work: Callable[[], Awaitable[Any]], shareable: Callable[[Any], bool]):
+        lock_key = f"sf:lock:{key}"
+        keeper = asyncio.create_task(self._keep_lock(lock_key, token))
+        try:
+            result = await work()
+            if shareable(result):
+                try:
+                    await self._redis.set(f"sf:result:{key}", json_util.dumps(result), ex=SINGLE_FLIGHT_RESULT_TTL_SECONDS)
+                except Exception as e:
+                    logger.warning(f"Single-flight could not publish result for {key}: {e}")
+            self.led += 1
+            return result
+        finally:
+            keeper.cancel()
+            try:
+                await self._release(keys=[lock_key], args=[token])
+            except Exception as e:
+                logger.warning(f"Single-flight could not release lock for {key}: {e}")
+
+    async def run(
+        self,
+        key: str,
+        work: Callable[[], Awaitable[Any]],
+        shareable: Callable[[Any], bool] = lambda result: result is not None,
+    ) -> Any:
+        """
+        Return the shared result for `key`, running `work` only if no other
+        caller is already doing so. Results are JSON-serialized with bson's
+        json_util, so shared ones come back as fresh copies.
+        """
+        if not self.enabled:
+            return await work()
+
+        token = uuid.uuid4().hex
+        deadline = asyncio.get_running_loop().time() + SINGLE_FLIGHT_WAIT_SECONDS
+        delay = 0.5
+        try:
+            while True:
+                cached = await self._redis.get(f"sf:result:{key}")
+                if cached is not None:
+                    self.shared += 1
+                    logger.info(f"Single-flight reused result for {key}")
+                    return json_util.loads(cached)
+
+                if await self._redis.set(f"sf:lock:{key}", token, nx=True, ex=SINGLE_FLIGHT_LOCK_SECONDS):
+                    break
+
+                if asyncio.get_running_loop().time() > deadline:
+                    logger.warning(f"Single-flight wait for {key} timed out, running locally")
+                    return await work()
+
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, 5.0)
+        except Exception as e:
+            logger.warning(f"Single-flight unavailable for {key}, running locally: {e}")
+            return await work()
+
+        return await self._lead(key, token, work, shareable)
+
+
+tender_single_flight = RedisSingleFlight()
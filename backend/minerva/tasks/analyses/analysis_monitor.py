@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 class AnalysisMonitor:
     def __init__(self):
         self.queue = AnalysisQueue(os.getenv("REDIS_URL", "redis://localhost:6379/1"))
-        self.processed_analyses = set()
+        # Completion cursor: newest completed_at already handled
         self.last_check = datetime.utcnow().isoformat()
         self.daily_summary_sent = False
     
@@ -26,13 +26,9 @@ class AnalysisMonitor:
                 # Check for newly completed analyses
                 completed_tasks = await self.queue.get_completed_tasks_since(self.last_check)
                 
-                for task_id, task_data in completed_tasks.items():
-                    if task_id not in self.processed_analyses:
-                        await self._handle_completed_analysis(task_data)
-                        self.processed_analyses.add(task_id)
-                
-                # Update last check time
-                self.last_check = datetime.utcnow().isoformat()
+                for task_id, task_data in sorted(completed_tasks.items(), key=lambda item: item[1].get("completed_at", "")):
+                    await self._handle_completed_analysis(task_data)
+                    self.last_check = max(self.last_check, task_data.get("completed_at", ""))
                 
                 # Send daily summary if it's time
                 await self._check_and_send_daily_summary()
@@ -2,13 +2,137 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
 import redis.asyncio as redis
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 
 logger = logging.getLogger(__name__)
 
+TASK_TTL_SECONDS = 86400
+TASK_STATUSES = ("pending", "processing", "completed", "failed")
+# One sorted set per status holding task ids scored by the time they entered
+# that status; "completed" doubles as the completion timeline.
+STATUS_INDEX_KEY = "analysis_tasks:status:{status}"
+
+# Claimed tasks live on a per-worker processing list until acked; a lease key
+# renewed by the worker's heartbeat marks them as still owned.
+PROCESSING_LIST_KEY = "analysis_processing:{worker_id}"
+LEASE_KEY = "analysis_lease:{task_id}"
+WORKERS_KEY = "analysis_workers"
+# Payloads a reaper found on a processing list without a lease, with the time
+# first seen that way. A claim takes its lease one round trip after BLMOVE, so
+# a payload is only reaped once it stayed leaseless for the grace period.
+LEASELESS_KEY = "analysis_leaseless:{worker_id}"
+ANALYSIS_LEASE_SECONDS = int(os.getenv("ANALYSIS_LEASE_SECONDS", "120"))
+ANALYSIS_REAP_GRACE_SECONDS = int(os.getenv("ANALYSIS_REAP_GRACE_SECONDS", "30"))
+ANALYSIS_MAX_DELIVERIES = int(os.getenv("ANALYSIS_MAX_DELIVERIES", "3"))
+
+# Tender-level fan-out: the analysis stage pushes one job per tender onto
+# TENDER_JOB_QUEUE_KEY; the run's shared context, per-job results and the
+# count of outstanding jobs live under analysis_run:<run_id>. The job that
+# brings the count to zero enqueues a "finalize" task on the analysis queue.
+TENDER_JOB_QUEUE_KEY = "analysis_tender_jobs"
+RUN_KEY = "analysis_run:{run_id}"
+RUN_RESULTS_KEY = "analysis_run:{run_id}:results"
+RUN_PENDING_KEY = "analysis_run:{run_id}:pending"
+RUN_DELIVERIES_KEY = "analysis_run:{run_id}:deliveries"
+
+# Move a payload off a processing list back onto the queue unless its lease is
+# alive or it has not been leaseless for the grace period yet; atomic so
+# concurrent reapers cannot requeue the same task twice.
+# ARGV: payload, retry, force, now, grace seconds, leaseless-mark ttl.
+_REQUEUE_SCRIPT = """
+if ARGV[3] == "0" then
+    if redis.call('EXISTS', KEYS[3]) == 1 then
+        redis.call('HDEL', KEYS[4], ARGV[1])
+        return 0
+    end
+    local seen = redis.call('HGET', KEYS[4], ARGV[1])
+    if not seen then
+        redis.call('HSET', KEYS[4], ARGV[1], ARGV[4])
+        redis.call('EXPIRE', KEYS[4], ARGV[6])
+        return 0
+    end
+    if tonumber(ARGV[4]) - tonumber(seen) < tonumber(ARGV[5]) then
+        return 0
+    end
+end
+redis.call('HDEL', KEYS[4], ARGV[1])
+if redis.call('LREM', KEYS[1], 1, ARGV[1]) == 0 then
+    return 0
+end
+if ARGV[2] == "1" then
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+end
+return 1
+"""
+
+# Create a fanned-out run and push its tender jobs, unless the run already
+# exists (a redelivered analysis stage must not reset `pending` or push its
+# jobs twice). ARGV: context, finalize_task, ttl, then (job_id, payload) pairs.
+_START_RUN_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'context', ARGV[1], 'finalize_task', ARGV[2])
+redis.call('SET', KEYS[2], (#ARGV - 3) / 2)
+for i = 4, #ARGV, 2 do
+    redis.call('HSET', KEYS[3], ARGV[i], 0)
+    redis.call('LPUSH', KEYS[4], ARGV[i + 1])
+end
+for i = 1, 3 do
+    redis.call('EXPIRE', KEYS[i], ARGV[3])
+end
+return 1
+"""
+
+# Record a tender job's result exactly once and hand the run to a finalizer
+# when it was the last outstanding job.
+_RECORD_RESULT_SCRIPT = """
+if redis.call('HSETNX', KEYS[1], ARGV[1], ARGV[2]) == 0 then
+    return 0
+end
+if redis.call('DECR', KEYS[2]) == 0 then
+    redis.call('RPUSH', KEYS[3], ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+def task_lease_id(task: Dict[str, Any]) -> str:
+    """
+    Lease identity of a claimed payload: tender jobs by job id, analysis tasks
+    by task id. The finalize stage shares its task id with the analysis stage,
+    so it gets a lease of its own that the analysis stage's ack cannot delete.
+    """
+    if task.get("job_id"):
+        return task["job_id"]
+    if task.get("stage") == "finalize":
+        return f"{task['task_id']}:finalize"
+    return task["task_id"]
+
+
+def _delivery_counter(task: Dict[str, Any]) -> tuple:
+    """(hash key, field) counting how often a payload has been claimed"""
+    if task.get("job_id"):
+        return RUN_DELIVERIES_KEY.format(run_id=task["run_id"]), task["job_id"]
+    field = "finalize_deliveries" if task.get("stage") == "finalize" else "deliveries"
+    return f"analysis_task:{task['task_id']}", field
+
+
+def _iso_to_score(timestamp: str) -> float:
+    """Naive UTC ISO timestamp (as written by the queue) -> epoch seconds"""
+    return datetime.fromisoformat(timestamp).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _decode_hash(task_data: Dict[Any, Any]) -> Dict[str, Any]:
+    return {
+        k.decode() if isinstance(k, bytes) else k: v.decode() if isinstance(v, bytes) else v
+        for k, v in task_data.items()
+    }
+
 class CustomJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle datetime objects"""
     def default(self, obj):
@@ -38,52 +162,298 @@ class AnalysisQueue:
         
         logger.info(f"Connecting to Redis at: {redis_url}")
         self.redis = redis.from_url(redis_url)
+        self._requeue_script = self.redis.register_script(_REQUEUE_SCRIPT)
+        self._record_result_script = self.redis.register_script(_RECORD_RESULT_SCRIPT)
+        self._start_run_script = self.redis.register_script(_START_RUN_SCRIPT)
+    
+    def _set_status(self, pipe, task_id: str, status: str, timestamp: str):
+        """Queue the index updates for a status transition on `pipe`"""
+        for other in TASK_STATUSES:
+            if other != status:
+                pipe.zrem(STATUS_INDEX_KEY.format(status=other), task_id)
+        pipe.zadd(STATUS_INDEX_KEY.format(status=status), {task_id: _iso_to_score(timestamp)})
+    
+    async def _trim_indexes(self):
+        """Drop index entries older than the task hashes' TTL"""
+        cutoff = datetime.now(timezone.utc).timestamp() - TASK_TTL_SECONDS
+        pipe = self.redis.pipeline(transaction=False)
+        for status in TASK_STATUSES:
+            pipe.zremrangebyscore(STATUS_INDEX_KEY.format(status=status), "-inf", cutoff)
+        await pipe.execute()
+    
+    async def _get_tasks(self, task_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch task hashes in one pipelined round trip, skipping expired ones"""
+        task_ids = [t.decode() if isinstance(t, bytes) else t for t in task_ids]
+        if not task_ids:
+            return {}
+        
+        pipe = self.redis.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.hgetall(f"analysis_task:{task_id}")
+        results = await pipe.execute()
+        
+        return {
+            task_id: _decode_hash(task_data)
+            for task_id, task_data in zip(task_ids, results)
+            if task_data
+        }
     
     async def enqueue_analysis(self, analysis_doc: Dict[str, Any], target_date: str) -> str:
         """Enqueue a complete analysis for processing"""
         task_id = str(uuid.uuid4())
+        created_at = datetime.utcnow().isoformat()
         
         task = {
             "task_id": task_id,
             "analysis_doc": analysis_doc,
             "target_date": target_date,
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": created_at,
             "status": "pending"
         }
         
-        # Single queue for all analyses - workers pick up as available
-        await self.redis.lpush("analysis_queue", json.dumps(task, cls=CustomJSONEncoder))
-        await self.redis.hset(f"analysis_task:{task_id}", mapping={
+        # Write the task hash and its index entry before it becomes visible to workers
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(f"analysis_task:{task_id}", mapping={
             "task_id": task_id,
             "analysis_doc": json.dumps(analysis_doc, cls=CustomJSONEncoder),
             "target_date": target_date,
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": created_at,
             "status": "pending"
         })
-        await self.redis.expire(f"analysis_task:{task_id}", 86400)  # 24h expiry
+        pipe.expire(f"analysis_task:{task_id}", TASK_TTL_SECONDS)
+        self._set_status(pipe, task_id, "pending", created_at)
+        # Single queue for all analyses - workers pick up as available
+        pipe.lpush("analysis_queue", json.dumps(task, cls=CustomJSONEncoder))
+        await pipe.execute()
         
         logger.info(f"Enqueued analysis {analysis_doc['_id']} as task {task_id}")
         return task_id
     
-    async def get_next_analysis(self, worker_id: str) -> Optional[Dict[str, Any]]:
-        """Get next analysis to process"""
-        task_data = await self.redis.brpop("analysis_queue", timeout=10)
+    async def _claim(self, queue_key: str, worker_id: str, timeout: int) -> Optional[Dict[str, Any]]:
+        """Atomically move the next payload of `queue_key` onto this worker's processing list"""
+        processing_key = PROCESSING_LIST_KEY.format(worker_id=worker_id)
+        await self.redis.sadd(WORKERS_KEY, worker_id)
+        raw = await self.redis.blmove(queue_key, processing_key, timeout=timeout, src="RIGHT", dest="LEFT")
+        if not raw:
+            return None
+        
+        task = json.loads(raw)
+        task["_raw"] = raw
+        return task
+    
+    def _take_lease(self, pipe, task: Dict[str, Any], worker_id: str):
+        pipe.set(LEASE_KEY.format(task_id=task_lease_id(task)), worker_id, ex=ANALYSIS_LEASE_SECONDS)
+        # A reaper may have seen the payload between BLMOVE and this lease
+        pipe.hdel(LEASELESS_KEY.format(worker_id=worker_id), task["_raw"])
+        # Re-register in case a reaper dropped this worker while it was idle
+        pipe.sadd(WORKERS_KEY, worker_id)
+        counter_key, field = _delivery_counter(task)
+        pipe.hincrby(counter_key, field, 1)
+        # The increment recreates an expired hash; never leave it without a TTL
+        pipe.expire(counter_key, TASK_TTL_SECONDS)
+    
+    async def get_next_analysis(self, worker_id: str, timeout: int = 10) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next analysis onto this worker's processing list and take a lease
+        on it. The claim must be released with ack_analysis once the task is done.
+        """
+        task = await self._claim("analysis_queue", worker_id, timeout)
         
-        if task_data:
-            task = json.loads(task_data[1])
+        if task:
             task_id = task["task_id"]
+            started_at = datetime.utcnow().isoformat()
             
             # Mark as processing
-            await self.redis.hset(f"analysis_task:{task_id}", mapping={
+            pipe = self.redis.pipeline(transaction=True)
+            self._take_lease(pipe, task, worker_id)
+            pipe.hset(f"analysis_task:{task_id}", mapping={
                 "status": "processing",
                 "worker_id": worker_id,
-                "started_at": datetime.utcnow().isoformat()
+                "started_at": started_at
             })
+            self._set_status(pipe, task_id, "processing", started_at)
+            await pipe.execute()
             
             return task
         
         return None
     
+    async def get_next_tender_job(self, worker_id: str, timeout: int = 10) -> Optional[Dict[str, Any]]:
+        """Claim the next tender job; released with ack_analysis like analysis tasks"""
+        job = await self._claim(TENDER_JOB_QUEUE_KEY, worker_id, timeout)
+        
+        if job:
+            pipe = self.redis.pipeline(transaction=True)
+            self._take_lease(pipe, job, worker_id)
+            await pipe.execute()
+        
+        return job
+    
+    async def start_run(self, task: Dict[str, Any], context: Dict[str, Any], tender_jobs: List[Dict[str, Any]]) -> bool:
+        """
+        Fan an analysis task out into tender jobs. `context` is the state shared by
+        every job and the finalizer; `tender_jobs` are the per-tender payloads.
+        Returns False, without touching the run, when it was already started.
+        """
+        run_id = task["task_id"]
+        finalize_task = {k: v for k, v in task.items() if k != "_raw"}
+        finalize_task["stage"] = "finalize"
+        
+        args = [
+            json.dumps(context, cls=CustomJSONEncoder),
+            json.dumps(finalize_task, cls=CustomJSONEncoder),
+            TASK_TTL_SECONDS,
+        ]
+        for index, job in enumerate(tender_jobs):
+            job_id = f"{run_id}:{index:05d}"
+            payload = {**job, "task_id": run_id, "job_id": job_id, "run_id": run_id}
+            args += [job_id, json.dumps(payload, cls=CustomJSONEncoder)]
+        
+        started = await self._start_run_script(
+            keys=[
+                RUN_KEY.format(run_id=run_id),
+                RUN_PENDING_KEY.format(run_id=run_id),
+                RUN_DELIVERIES_KEY.format(run_id=run_id),
+                TENDER_JOB_QUEUE_KEY,
+            ],
+            args=args,
+        )
+        if not started:
+            logger.warning(f"Run {run_id} was already started, not fanning out again")
+            return False
+        
+        logger.info(f"Analysis task {run_id} fanned out into {len(tender_jobs)} tender jobs")
+        return True
+    
+    async def record_tender_result(self, job: Dict[str, Any], result: Optional[str]) -> bool:
+        """
+        Store a tender job's serialized result ("" when the tender produced none).
+        Returns True when this was the run's last outstanding job.
+        """
+        run_id = job["run_id"]
+        finalize_task = await self.redis.hget(RUN_KEY.format(run_id=run_id), "finalize_task")
+        if finalize_task is None:
+            logger.warning(f"Run {run_id} no longer exists, dropping result of {job['job_id']}")
+            return False
+        
+        results_key = RUN_RESULTS_KEY.format(run_id=run_id)
+        finished = await self._record_result_script(
+            keys=[results_key, RUN_PENDING_KEY.format(run_id=run_id), "analysis_queue"],
+            args=[job["job_id"], result or "", finalize_task],
+        )
+        await self.redis.expire(results_key, TASK_TTL_SECONDS)
+        if finished:
+            logger.info(f"All tender jobs of run {run_id} finished, queued finalization")
+        return bool(finished)
+    
+    async def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Shared context plus tender job results (ordered by job id) of a fanned-out run"""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hget(RUN_KEY.format(run_id=run_id), "context")
+        pipe.hgetall(RUN_RESULTS_KEY.format(run_id=run_id))
+        context, results = await pipe.execute()
+        if context is None:
+            return None
+        
+        results = _decode_hash(results)
+        return {
+            "context": json.loads(context),
+            "results": [results[job_id] for job_id in sorted(results)]
+        }
+    
+    async def renew_lease(self, task_id: str, worker_id: str):
+        """Heartbeat: extend the lease on a claimed task"""
+        await self.redis.set(LEASE_KEY.format(task_id=task_id), worker_id, ex=ANALYSIS_LEASE_SECONDS)
+    
+    async def ack_analysis(self, worker_id: str, task: Dict[str, Any]):
+        """
+        Release a claimed task or tender job after it was completed or failed.
+        Acking a finalize task also removes its run's state: a finalize that is
+        redelivered before the ack still needs it.
+        """
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.lrem(PROCESSING_LIST_KEY.format(worker_id=worker_id), 1, task["_raw"])
+        pipe.delete(LEASE_KEY.format(task_id=task_lease_id(task)))
+        pipe.hdel(LEASELESS_KEY.format(worker_id=worker_id), task["_raw"])
+        if task.get("stage") == "finalize":
+            run_id = task["task_id"]
+            pipe.delete(
+                RUN_KEY.format(run_id=run_id),
+                RUN_RESULTS_KEY.format(run_id=run_id),
+                RUN_PENDING_KEY.format(run_id=run_id),
+                RUN_DELIVERIES_KEY.format(run_id=run_id),
+            )
+        await pipe.execute()
+    
+    async def requeue_worker_tasks(self, worker_id: str, force: bool = False) -> int:
+        """
+        Return a worker's claimed tasks to the queue. Without `force` only tasks
+        found without a lease for at least ANALYSIS_REAP_GRACE_SECONDS are moved. Tasks that already used up
+        ANALYSIS_MAX_DELIVERIES are failed instead of requeued.
+        """
+        processing_key = PROCESSING_LIST_KEY.format(worker_id=worker_id)
+        leaseless_key = LEASELESS_KEY.format(worker_id=worker_id)
+        payloads = await self.redis.lrange(processing_key, 0, -1)
+        now = int(datetime.now(timezone.utc).timestamp())
+        requeued = 0
+        
+        for raw in payloads:
+            try:
+                task = json.loads(raw)
+                task_id = task["task_id"]
+            except (ValueError, KeyError):
+                await self.redis.lrem(processing_key, 1, raw)
+                continue
+            
+            is_tender_job = bool(task.get("job_id"))
+            deliveries = int(await self.redis.hget(*_delivery_counter(task)) or 0)
+            retry = deliveries < ANALYSIS_MAX_DELIVERIES
+            moved = await self._requeue_script(
+                keys=[
+                    processing_key,
+                    TENDER_JOB_QUEUE_KEY if is_tender_job else "analysis_queue",
+                    LEASE_KEY.format(task_id=task_lease_id(task)),
+                    leaseless_key,
+                ],
+                args=[
+                    raw, "1" if retry else "0", "1" if force else "0",
+                    now, ANALYSIS_REAP_GRACE_SECONDS, TASK_TTL_SECONDS,
+                ],
+            )
+            if not moved:
+                continue
+            
+            if is_tender_job:
+                if retry:
+                    requeued += 1
+                    logger.warning(f"Requeued tender job {task['job_id']} abandoned by worker {worker_id} (delivery {deliveries})")
+                else:
+                    # Count it as a tender without result so the run can still finish
+                    logger.error(f"Tender job {task['job_id']} abandoned {deliveries} times, giving up")
+                    await self.record_tender_result(task, None)
+            elif retry:
+                requeued_at = datetime.utcnow().isoformat()
+                pipe = self.redis.pipeline(transaction=True)
+                pipe.hset(f"analysis_task:{task_id}", mapping={"status": "pending", "requeued_at": requeued_at})
+                self._set_status(pipe, task_id, "pending", requeued_at)
+                await pipe.execute()
+                requeued += 1
+                logger.warning(f"Requeued analysis task {task_id} abandoned by worker {worker_id} (delivery {deliveries})")
+            else:
+                await self.fail_analysis(task_id, f"Abandoned by workers {deliveries} times, giving up")
+        
+        return requeued
+    
+    async def reap_expired_leases(self) -> int:
+        """Requeue tasks from every worker's processing list that stayed without a lease past the grace period"""
+        requeued = 0
+        for worker_id in await self.redis.smembers(WORKERS_KEY):
+            worker_id = worker_id.decode() if isinstance(worker_id, bytes) else worker_id
+            requeued += await self.requeue_worker_tasks(worker_id)
+            if not await self.redis.llen(PROCESSING_LIST_KEY.format(worker_id=worker_id)):
+                await self.redis.srem(WORKERS_KEY, worker_id)
+        return requeued
+    
     async def complete_analysis(self, task_id: str, result: Dict[str, Any], analysis_stats: Optional[Dict[str, Any]] = None):
         """Mark analysis as completed with detailed statistics"""
         completion_data = {
@@ -98,76 +468,83 @@ class AnalysisQueue:
         if analysis_stats:
             completion_data["analysis_stats"] = json.dumps(analysis_stats, cls=CustomJSONEncoder)
         
-        await self.redis.hset(f"analysis_task:{task_id}", mapping=completion_data)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(f"analysis_task:{task_id}", mapping=completion_data)
+        self._set_status(pipe, task_id, "completed", completion_data["completed_at"])
+        await pipe.execute()
         logger.info(f"Analysis task {task_id} completed with {result.get('total_tenders_analyzed', 0)} tenders")
     
     async def fail_analysis(self, task_id: str, error: str):
         """Mark analysis as failed"""
-        await self.redis.hset(f"analysis_task:{task_id}", mapping={
+        failed_at = datetime.utcnow().isoformat()
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(f"analysis_task:{task_id}", mapping={
             "status": "failed",
-            "failed_at": datetime.utcnow().isoformat(),
+            "failed_at": failed_at,
             "error": error
         })
+        self._set_status(pipe, task_id, "failed", failed_at)
+        await pipe.execute()
         logger.error(f"Analysis task {task_id} failed: {error}")
     
     async def get_queue_stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
-        queue_length = await self.redis.llen("analysis_queue")
-        
-        # Get task status counts
-        keys = await self.redis.keys("analysis_task:*")
-        stats = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
+        await self._trim_indexes()
         
-        for key in keys:
-            task_data = await self.redis.hgetall(key)
-            status = task_data.get("status", "unknown")
-            if status in stats:
-                stats[status] += 1
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.llen("analysis_queue")
+        for status in TASK_STATUSES:
+            pipe.zcard(STATUS_INDEX_KEY.format(status=status))
+        queue_length, *counts = await pipe.execute()
         
+        stats = dict(zip(TASK_STATUSES, counts))
         stats["queue_length"] = queue_length
         return stats
     
     async def get_completed_tasks_since(self, since_timestamp: str) -> Dict[str, Dict[str, Any]]:
         """Get all completed analysis tasks since a timestamp"""
-        keys = await self.redis.keys("analysis_task:*")
-        completed_tasks = {}
-        
-        for key in keys:
-            task_data = await self.redis.hgetall(key)
-            if (task_data.get("status") == "completed" and 
-                task_data.get("completed_at", "") > since_timestamp):
-                task_id = key.decode().split(":")[1]
-                # Convert bytes to strings
-                completed_tasks[task_id] = {k.decode() if isinstance(k, bytes) else k: 
-                                          v.decode() if isinstance(v, bytes) else v 
-                                          for k, v in task_data.items()}
-        
-        return completed_tasks
+        task_ids = await self.redis.zrangebyscore(
+            STATUS_INDEX_KEY.format(status="completed"),
+            f"({_iso_to_score(since_timestamp)}",
+            "+inf",
+        )
+        return await self._get_tasks(task_ids)
     
     async def get_all_completed_tasks(self) -> Dict[str, Dict[str, Any]]:
         """Get all completed analysis tasks for today's summary"""
-        keys = await self.redis.keys("analysis_task:*")
-        completed_tasks = {}
-        
-        for key in keys:
-            task_data = await self.redis.hgetall(key)
-            if task_data.get("status") == "completed":
-                task_id = key.decode().split(":")[1] if isinstance(key, bytes) else key.split(":")[1]
-                # Convert bytes to strings and handle analysis_stats JSON
-                task_dict = {}
-                for k, v in task_data.items():
-                    key_str = k.decode() if isinstance(k, bytes) else k
-                    value_str = v.decode() if isinstance(v, bytes) else v
-                    
-                    # Parse analysis_stats JSON if present
-                    if key_str == "analysis_stats" and value_str:
-                        try:
-                            task_dict[key_str] = json.loads(value_str)
-                        except json.JSONDecodeError:
-                            task_dict[key_str] = {}
-                    else:
-                        task_dict[key_str] = value_str
-                
-                completed_tasks[task_id] = task_dict
-        
-        return completed_tasks 
\ No newline at end of file
+        await self._trim_indexes()
+        task_ids = await self.redis.zrange(STATUS_INDEX_KEY.format(status="completed"), 0, -1)
+        completed_tasks = await self._get_tasks(task_ids)
+        
+        # Parse analysis_stats JSON if present
+        for task_dict in completed_tasks.values():
+            if task_dict.get("analysis_stats"):
+                try:
+                    task_dict["analysis_stats"] = json.loads(task_dict["analysis_stats"])
+                except json.JSONDecodeError:
+                    task_dict["analysis_stats"] = {}
+        
+        return completed_tasks
+    
+    async def clear(self) -> int:
+        """Delete the queue, every indexed task hash and the indexes; returns the number of keys removed"""
+        index_keys = [STATUS_INDEX_KEY.format(status=status) for status in TASK_STATUSES]
+        
+        pipe = self.redis.pipeline(transaction=False)
+        for key in index_keys:
+            pipe.zrange(key, 0, -1)
+        task_ids = {t.decode() if isinstance(t, bytes) else t for ids in await pipe.execute() for t in ids}
+        
+        worker_ids = [w.decode() if isinstance(w, bytes) else w for w in await self.redis.smembers(WORKERS_KEY)]
+        
+        keys = [
+            "analysis_queue", TENDER_JOB_QUEUE_KEY, WORKERS_KEY, *index_keys,
+            *(PROCESSING_LIST_KEY.format(worker_id=worker_id) for worker_id in worker_ids),
+            *(LEASELESS_KEY.format(worker_id=worker_id) for worker_id in worker_ids),
+            *(f"analysis_task:{task_id}" for task_id in task_ids),
+            *(LEASE_KEY.format(task_id=task_id) for task_id in task_ids),
+            *(LEASE_KEY.format(task_id=f"{task_id}:finalize") for task_id in task_ids),
+            *(key.format(run_id=task_id) for task_id in task_ids
+              for key in (RUN_KEY, RUN_RESULTS_KEY, RUN_PENDING_KEY, RUN_DELIVERIES_KEY)),
+        ]
+        return await self.redis.delete(*keys)
@@ -5,30 +5,70 @@ import os
 from datetime import datetime
 from typing import Dict, Any
 from minerva.core.helpers.external_comparison import TenderExternalComparison
-from minerva.tasks.analyses.analysis_queue import AnalysisQueue
+from minerva.tasks.analyses.analysis_queue import ANALYSIS_LEASE_SECONDS, AnalysisQueue, task_lease_id
+from minerva.tasks.analyses.tender_fanout import (
+    ANALYSIS_TENDER_FANOUT,
+    TenderJobRunner,
+    fan_out_analysis,
+    finalize_analysis_run,
+)
 from minerva.tasks.services.analysis_service import analyze_relevant_tenders_with_our_rag
 from minerva.tasks.sources.helpers import assign_order_numbers
 from minerva.core.database.database import db
 from minerva.core.models.user import User
 from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysis
+from minerva.core.services.vectorstore.file_content_extract.executor import extraction_executor
+from minerva.core.utils.event_loop_monitor import loop_lag_monitor
 from bson import ObjectId
 
 logger = logging.getLogger(__name__)
 
+# Analyses run concurrently per worker; most of their time is spent waiting on LLMs
+ANALYSIS_WORKER_CONCURRENCY = int(os.getenv("ANALYSIS_WORKER_CONCURRENCY", "2"))
+# Tender pipelines (browser + extraction + criteria) in flight across all of this worker's analyses
+ANALYSIS_PIPELINE_BUDGET = int(os.getenv("ANALYSIS_PIPELINE_BUDGET", "7"))
+ANALYSIS_REAPER_INTERVAL_SECONDS = int(os.getenv("ANALYSIS_REAPER_INTERVAL_SECONDS", "60"))
+
+ANALYSIS_RUN_SETTINGS = {
+    "tender_names_index_name": "tenders",
+    "rag_index_name": "files-rag-23-04-2025",
+    "embedding_model": "text-embedding-3-large",
+    "elasticsearch_index_name": "tenders",
+    "score_threshold": 0.5,
+    "top_k": 30,
+    "ai_batch_size": 75,
+}
+
 class SimpleAnalysisWorker:
-    def __init__(self, worker_id: str):
+    def __init__(self, worker_id: str, concurrency: int = ANALYSIS_WORKER_CONCURRENCY):
         self.worker_id = worker_id
         self.queue = AnalysisQueue(os.getenv("REDIS_URL", "redis://localhost:6379/1"))
+        self.concurrency = max(1, concurrency)
+        self.pipeline_budget = asyncio.Semaphore(ANALYSIS_PIPELINE_BUDGET)
         self.processed_count = 0
+        self.tender_jobs_count = 0
+        self.active_tasks: Dict[str, str] = {}
+        self.tender_jobs = TenderJobRunner(self.queue, self.pipeline_budget) if ANALYSIS_TENDER_FANOUT else None
     
     async def process_analysis_task(self, task: Dict[str, Any]):
-        """Process a complete analysis using existing analyze_relevant_tenders_with_our_rag logic"""
+        """
+        Process an analysis task. With tender fan-out enabled the "analyze" stage
+        only searches, filters and enqueues tender jobs; the "finalize" stage runs
+        once all of them are done. Otherwise the whole analysis runs here.
+        """
         task_id = task["task_id"]
         analysis_doc = task["analysis_doc"]
         target_date = task["target_date"]
         
         try:
             analysis_id = str(analysis_doc["_id"])
+            
+            if task.get("stage") == "finalize":
+                logger.info(f"Worker {self.worker_id} finalizing analysis {analysis_id} for date {target_date}")
+                result, current_user = await finalize_analysis_run(self.queue, task)
+                await self._complete_analysis(task, current_user, result)
+                return
+            
             logger.info(f"Worker {self.worker_id} starting analysis {analysis_id} for date {target_date}")
             
             # Get user
@@ -50,84 +90,169 @@ class SimpleAnalysisWorker:
                     "value": analysis_doc["sources"]
                 })
             
-            # Call existing analysis function - NO CHANGES TO CORE LOGIC!
-            result = await analyze_relevant_tenders_with_our_rag(
-                analysis_id=analysis_id,
-                tender_names_index_name="tenders",
-                rag_index_name="files-rag-23-04-2025", 
-                embedding_model="text-embedding-3-large",
-                elasticsearch_index_name="tenders",
-                score_threshold=0.5,
-                top_k=30,
-                current_user=current_user,
-                filter_conditions=filter_conditions,
-                ai_batch_size=75,
-                criteria_definitions=tender_analysis.criteria,
-                batch_size=7,
-                language=tender_analysis.language or "polish"
-            )
-            
-            # Assign order numbers (same as existing)
-            await assign_order_numbers(ObjectId(analysis_id), current_user)
-
-            # Perform comparison
-            comparison_service = TenderExternalComparison()
-            result = await comparison_service.update_external_compare_status(
-                analysis_id=analysis_id,
-                start_date=target_date,
-                end_date=target_date,
-            )
-                
-            # Update analysis timestamp (same as existing)
-            await db.tender_analysis.update_one(
-                {"_id": ObjectId(analysis_id)},
-                {"$set": {
-                    "last_run": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                }}
-            )
-            
-            # Mark task as completed with detailed statistics
-            await self.queue.complete_analysis(task_id, {
-                "total_tenders_analyzed": result.total_tenders_analyzed,
-                "analysis_id": analysis_id,
-                "initial_ai_filter_id": getattr(result, "initial_ai_filter_id", None),
-                "description_filter_id": getattr(result, "description_filter_id", None)
-            }, analysis_stats=getattr(result, "analysis_stats", None))
+            if ANALYSIS_TENDER_FANOUT:
+                result = await fan_out_analysis(
+                    self.queue, task, current_user, ANALYSIS_RUN_SETTINGS, filter_conditions
+                )
+                if result is None:
+                    logger.info(f"Worker {self.worker_id} fanned out analysis {analysis_id} into tender jobs")
+                    return
+            else:
+                # Call existing analysis function - NO CHANGES TO CORE LOGIC!
+                result = await analyze_relevant_tenders_with_our_rag(
+                    analysis_id=analysis_id,
+                    current_user=current_user,
+                    filter_conditions=filter_conditions,
+                    criteria_definitions=tender_analysis.criteria,
+                    batch_size=7,
+                    language=tender_analysis.language or "polish",
+                    pipeline_budget=self.pipeline_budget,
+                    **ANALYSIS_RUN_SETTINGS
+                )
             
-            self.processed_count += 1
-            logger.info(f"Worker {self.worker_id} completed analysis {analysis_id} - {result.total_tenders_analyzed} tenders processed (total completed: {self.processed_count})")
+            await self._complete_analysis(task, current_user, result)
             
         except Exception as e:
             logger.error(f"Worker {self.worker_id} - Analysis task {task_id} failed: {e}", exc_info=True)
             await self.queue.fail_analysis(task_id, str(e))
     
-    async def run(self):
-        """Main worker loop"""
-        logger.info(f"Starting simple analysis worker {self.worker_id}")
+    async def _complete_analysis(self, task: Dict[str, Any], current_user: User, result):
+        """Post-processing shared by in-process and fanned-out analyses"""
+        task_id = task["task_id"]
+        target_date = task["target_date"]
+        analysis_id = str(task["analysis_doc"]["_id"])
         
+        # Assign order numbers (same as existing)
+        await assign_order_numbers(ObjectId(analysis_id), current_user)
+
+        # Perform comparison
+        comparison_service = TenderExternalComparison()
+        await comparison_service.update_external_compare_status(
+            analysis_id=analysis_id,
+            start_date=target_date,
+            end_date=target_date,
+        )
+            
+        # Update analysis timestamp (same as existing)
+        await db.tender_analysis.update_one(
+            {"_id": ObjectId(analysis_id)},
+            {"$set": {
+                "last_run": datetime.utcnow(),
+                "updated_at": datetime.utcnow()
+            }}
+        )
+        
+        # Mark task as completed with detailed statistics
+        await self.queue.complete_analysis(task_id, {
+            "total_tenders_analyzed": result.total_tenders_analyzed,
+            "analysis_id": analysis_id,
+            "initial_ai_filter_id": getattr(result, "initial_ai_filter_id", None),
+            "description_filter_id": getattr(result, "description_filter_id", None)
+        }, analysis_stats=getattr(result, "analysis_stats", None))
+        
+        self.processed_count += 1
+        logger.info(f"Worker {self.worker_id} completed analysis {analysis_id} - {result.total_tenders_analyzed} tenders processed (total completed: {self.processed_count})")
+    
+    async def _heartbeat(self, lease_id: str):
+        """Keep the lease on a claimed task alive while it is being processed"""
+        while True:
+            await asyncio.sleep(ANALYSIS_LEASE_SECONDS / 3)
+            try:
+                await self.queue.renew_lease(lease_id, self.worker_id)
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} failed to renew lease for {lease_id}: {e}")
+    
+    async def _process_claimed(self, task: Dict[str, Any], handler):
+        """Run `handler` under a renewed lease and ack the claim once it returns"""
+        lease_id = task_lease_id(task)
+        self.active_tasks[lease_id] = str(task.get("analysis_doc", {}).get("_id", task.get("run_id")))
+        heartbeat = asyncio.create_task(self._heartbeat(lease_id))
+        try:
+            await handler(task)
+        finally:
+            heartbeat.cancel()
+            self.active_tasks.pop(lease_id, None)
+        # Not reached on cancellation or error: the claim stays on our processing
+        # list and is requeued on restart or by a reaper
+        await self.queue.ack_analysis(self.worker_id, task)
+    
+    async def _run_slot(self, slot: int):
+        """Claim and process analyses one at a time"""
         while True:
             try:
                 # Get next analysis to process
                 task = await self.queue.get_next_analysis(self.worker_id)
                 
-                if task:
-                    # Process the entire analysis
-                    await self.process_analysis_task(task)
-                else:
+                if not task:
                     # No tasks available, short sleep
                     await asyncio.sleep(5)
+                    continue
+                
+                await self._process_claimed(task, self.process_analysis_task)
                     
             except Exception as e:
-                logger.error(f"Worker {self.worker_id} error: {e}", exc_info=True)
+                logger.error(f"Worker {self.worker_id} slot {slot} error: {e}", exc_info=True)
                 await asyncio.sleep(30)
     
+    async def _process_tender_job(self, job: Dict[str, Any]):
+        await self.tender_jobs.process_job(job)
+        self.tender_jobs_count += 1
+    
+    async def _run_tender_slot(self, slot: int):
+        """Claim and process tender jobs of any fanned-out analysis"""
+        while True:
+            try:
+                job = await self.queue.get_next_tender_job(self.worker_id)
+                if job:
+                    await self._process_claimed(job, self._process_tender_job)
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} tender slot {slot} error: {e}", exc_info=True)
+                await asyncio.sleep(5)
+    
+    async def _run_reaper(self):
+        """Requeue analyses whose worker stopped renewing its lease"""
+        while True:
+            await asyncio.sleep(ANALYSIS_REAPER_INTERVAL_SECONDS)
+            try:
+                requeued = await self.queue.reap_expired_leases()
+                if requeued:
+                    logger.warning(f"Worker {self.worker_id} requeued {requeued} abandoned analyses")
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} reaper error: {e}", exc_info=True)
+    
+    async def run(self):
+        """Main worker loop"""
+        logger.info(f"Starting simple analysis worker {self.worker_id} with {self.concurrency} slots (tender fan-out: {ANALYSIS_TENDER_FANOUT})")
+        loop_lag_monitor.start()
+        
+        # Anything left on our processing list belongs to a previous run of this worker
+        requeued = await self.queue.requeue_worker_tasks(self.worker_id, force=True)
+        if requeued:
+            logger.warning(f"Worker {self.worker_id} requeued {requeued} analyses from its previous run")
+        
+        tender_slots = ANALYSIS_PIPELINE_BUDGET if self.tender_jobs else 0
+        try:
+            await asyncio.gather(
+                self._run_reaper(),
+                *(self._run_slot(slot) for slot in range(self.concurrency)),
+                *(self._run_tender_slot(slot) for slot in range(tender_slots))
+            )
+        finally:
+            if self.tender_jobs:
+                await self.tender_jobs.close()
+    
     async def get_worker_stats(self) -> Dict[str, Any]:
         """Get worker statistics"""
         return {
             "worker_id": self.worker_id,
             "processed_count": self.processed_count,
-            "status": "running"
+            "active_analyses": list(self.active_tasks.values()),
+            "tender_jobs_processed": self.tender_jobs_count,
+            "concurrency": self.concurrency,
+            "status": "running",
+            "event_loop_lag": loop_lag_monitor.stats(),
+            "extractions_in_flight": extraction_executor.in_flight,
+            "extractions_timed_out": extraction_executor.timed_out
         }
 
 async def main():
@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId, json_util
+
+from minerva.core.database.database import db
+from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysis, TenderAnalysisResult
+from minerva.core.models.request.tender_analysis import TenderSearchResponse
+from minerva.core.models.user import User
+from minerva.core.services.browser_pool import browser_pool
+from minerva.core.services.cost_tracking_service import CostTrackingContext
+from minerva.core.services.vectorstore.pinecone.upsert import EmbeddingConfig
+from minerva.tasks.analyses.analysis_queue import AnalysisQueue
+from minerva.tasks.services.analysis_service import (
+    _process_tender_pipeline,
+    empty_analysis_response,
+    finalize_tender_results,
+    search_and_filter_tenders,
+)
+from minerva.tasks.services.tender_criteria_analysis_service import build_criteria_query_vectors
+from minerva.tasks.sources.tender_source_manager import TenderSourceManager
+
+logger = logging.getLogger(__name__)
+
+# Split analyses into per-tender jobs any worker can pick up; when disabled an
+# analysis runs its whole tender pipeline inside the worker that claimed it.
+ANALYSIS_TENDER_FANOUT = os.getenv("ANALYSIS_TENDER_FANOUT", "true").lower() == "true"
+# Runs whose user, criteria and query vectors a worker keeps in memory
+RUN_STATE_CACHE_SIZE = 16
+
+
+def serialize_tender_result(result: Optional[TenderAnalysisResult]) -> str:
+    # json_util keeps ObjectId and datetime fields round-trippable
+    return json_util.dumps(result.dict(by_alias=True)) if result is not None else ""
+
+
+def deserialize_tender_result(raw: str) -> Optional[TenderAnalysisResult]:
+    return TenderAnalysisResult(**json_util.loads(raw)) if raw else None
+
+
+async def _load_analysis(analysis_id: str, user_id: str):
+    tender_analysis_doc = await db.tender_analysis.find_one({"_id": ObjectId(analysis_id)})
+    if not tender_analysis_doc:
+        raise ValueError(f"Tender analysis configuration {analysis_id} not found")
+    user_doc = await db.users.find_one({"_id": ObjectId(user_id)})
+    if not user_doc:
+        raise ValueError(f"User not found for analysis {analysis_id}")
+    return TenderAnalysis(**tender_analysis_doc), User(**user_doc)
+
+
+async def fan_out_analysis(
+    queue: AnalysisQueue,
+    task: Dict[str, Any],
+    current_user: User,
+    settings: Dict[str, Any],
+    filter_conditions: List[Dict[str, Any]]
+) -> Optional[TenderSearchResponse]:
+    """
+    Analysis stage of a fanned-out run: search and AI filtering, then one tender
+    job per remaining tender. Returns the final response directly when nothing
+    is left to fan out, otherwise None - the run is finished by the finalizer.
+    """
+    analysis_id = str(task["analysis_doc"]["_id"])
+    run_id = task["task_id"]
+    if await queue.get_run(run_id) is not None:
+        # Redelivered after the stage already fanned out; its tender jobs finish the run
+        logger.warning(f"Analysis task {run_id} was already fanned out, skipping the analysis stage")
+        return None
+    tender_analysis, _ = await _load_analysis(analysis_id, str(current_user.id))
+
+    # Creates the run's cost record; tender jobs and the finalizer add to it
+    try:
+        async with CostTrackingContext.for_run(
+            user_id=str(current_user.id),
+            tender_analysis_id=analysis_id,
+            run_id=run_id
+        ):
+            selection = await search_and_filter_tenders(
+                tender_analysis=tender_analysis,
+                analysis_id=analysis_id,
+                current_user=current_user,
+                tender_names_index_name=settings["tender_names_index_name"],
+                elasticsearch_index_name=settings["elasticsearch_index_name"],
+                embedding_model=settings["embedding_model"],
+                score_threshold=settings["score_threshold"],
+                top_k=settings["top_k"],
+                filter_conditions=filter_conditions,
+                ai_batch_size=settings["ai_batch_size"]
+            )
+    except Exception:
+        await CostTrackingContext.complete_run(run_id, failed=True)
+        raise
+
+    combined_search_matches = selection["combined_search_matches"]
+    tender_jobs = []
+    for tender in selection["filtered_tenders"]:
+        original_meta = combined_search_matches.get(tender.id, {}).get("metadata", {})
+        if not original_meta:
+            logger.warning(f"Missing original metadata for tender {tender.id}; skipping")
+            continue
+        tender_jobs.append({"original_metadata": original_meta})
+
+    if not tender_jobs:
+        await CostTrackingContext.complete_run(run_id)
+        return empty_analysis_response(
+            tender_analysis,
+            initial_ai_filter_id=selection["initial_ai_filter_id"],
+            total_searched=selection["total_searched"],
+            after_initial_filtering=len(selection["filtered_tenders"])
+        )
+
+    context = {
+        "analysis_id": analysis_id,
+        "user_id": str(current_user.id),
+        "settings": settings,
+        "total_searched": selection["total_searched"],
+        "after_initial_filtering": len(selection["filtered_tenders"]),
+        "initial_ai_filter_id": selection["initial_ai_filter_id"],
+    }
+    await queue.start_run(task, context, tender_jobs)
+    return None
+
+
+async def finalize_analysis_run(queue: AnalysisQueue, task: Dict[str, Any]):
+    """
+    Fan-in stage: description filtering and saving over all tender job results.
+    Returns (response, user). The run's Redis state is kept until the finalize
+    task is acked, so a redelivered finalize can run again.
+    """
+    run_id = task["task_id"]
+    run = await queue.get_run(run_id)
+    if run is None:
+        raise ValueError(f"Run state for analysis task {run_id} has expired")
+
+    context = run["context"]
+    analysis_id = context["analysis_id"]
+    tender_analysis, current_user = await _load_analysis(analysis_id, context["user_id"])
+
+    successful_tender_results = []
+    for raw in run["results"]:
+        try:
+            result = deserialize_tender_result(raw)
+        except Exception as e:
+            logger.error(f"Dropping unreadable tender result in run {run_id}: {e}")
+            continue
+        if result is not None:
+            successful_tender_results.append(result)
+
+    logger.info(f"Finalizing run {run_id}: {len(successful_tender_results)} of {len(run['results'])} tender jobs produced results")
+
+    try:
+        async with CostTrackingContext.for_run(
+            user_id=context["user_id"],
+            tender_analysis_id=analysis_id,
+            run_id=run_id
+        ):
+            response = await finalize_tender_results(
+                tender_analysis=tender_analysis,
+                analysis_id=analysis_id,
+                current_user=current_user,
+                successful_tender_results=successful_tender_results,
+                ai_batch_size=context["settings"]["ai_batch_size"],
+                total_searched=context["total_searched"],
+                after_initial_filtering=context["after_initial_filtering"],
+                initial_ai_filter_id=context["initial_ai_filter_id"],
+                run_id=run_id
+            )
+    except Exception:
+        await CostTrackingContext.complete_run(run_id, failed=True)
+        raise
+    await CostTrackingContext.complete_run(run_id)
+
+    return response, current_user
+
+
+class TenderJobRunner:
+    """
+    Executes tender jobs inside a worker: browser contexts come from the
+    process-wide pool, and per-run state (user, criteria, query vectors) is
+    loaded once per run.
+    """
+
+    def __init__(self, queue: AnalysisQueue, pipeline_budget: asyncio.Semaphore):
+        self.queue = queue
+        self.pipeline_budget = pipeline_budget
+        self._run_state: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._run_state_locks: Dict[str, asyncio.Lock] = {}
+
+    async def _get_run_state(self, run_id: str) -> Dict[str, Any]:
+        lock = self._run_state_locks.setdefault(run_id, asyncio.Lock())
+        async with lock:
+            state = self._run_state.get(run_id)
+            if state is not None:
+                self._run_state.move_to_end(run_id)
+                return state
+
+            run = await self.queue.get_run(run_id)
+            if run is None:
+                raise ValueError(f"Run state for analysis task {run_id} has expired")
+            context = run["context"]
+            settings = context["settings"]
+            tender_analysis, current_user = await _load_analysis(context["analysis_id"], context["user_id"])
+
+            state = {
+                "context": context,
+                "tender_analysis": tender_analysis,
+                "current_user": current_user,
+                "language": tender_analysis.language or "polish",
+                "source_manager": TenderSourceManager(EmbeddingConfig(
+                    index_name=settings["tender_names_index_name"],
+                    namespace="",
+                    embedding_model=settings["embedding_model"]
+                )),
+                # Criteria are identical for every tender - embed their queries once per run
+                "query_vectors": await build_criteria_query_vectors(
+                    criteria=tender_analysis.criteria,
+                    rag_index_name=settings["rag_index_name"],
+                    embedding_model=settings["embedding_model"]
+                ),
+            }
+            self._run_state[run_id] = state
+            while len(self._run_state) > RUN_STATE_CACHE_SIZE:
+                evicted, _ = self._run_state.popitem(last=False)
+                self._run_state_locks.pop(evicted, None)
+            return state
+
+    async def process_job(self, job: Dict[str, Any]):
+        """Run the tender pipeline for one job and record its result on the run"""
+        run_id = job["run_id"]
+        state = await self._get_run_state(run_id)
+        context = state["context"]
+        settings = context["settings"]
+        tender_analysis = state["tender_analysis"]
+
+        browser = browser_pool.lease()
+        try:
+            async with CostTrackingContext.for_run(
+                user_id=context["user_id"],
+                tender_analysis_id=context["analysis_id"],
+                run_id=run_id
+            ):
+                result = await _process_tender_pipeline(
+                    tender_obj=None,
+                    original_metadata=job["original_metadata"],
+                    shared_browser=browser,
+                    tender_analysis=tender_analysis,
+                    analysis_id=context["analysis_id"],
+                    rag_index_name=settings["rag_index_name"],
+                    embedding_model=settings["embedding_model"],
+                    current_user=state["current_user"],
+                    criteria_definitions=tender_analysis.criteria,
+                    semaphore=self.pipeline_budget,
+                    source_manager=state["source_manager"],
+                    language=state["language"],
+                    query_vectors=state["query_vectors"]
+                )
+        finally:
+            await browser.close()
+
+        await self.queue.record_tender_result(job, serialize_tender_result(result))
+
+    async def close(self):
+        await browser_pool.close()
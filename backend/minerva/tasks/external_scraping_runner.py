@@ -13,6 +13,7 @@ from minerva.tasks.sources.oferent.extract_tenders import OferentReportExtractor
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
 from minerva.core.database.database import db
+from minerva.tasks.services.result_writer import ResultWriter
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -70,56 +71,56 @@ async def save_results_to_db(result, source_name, user_id, analysis_id):
         return
     tenders = result.get('tenders', [])
     results_cnt = 0
-    for tender in tenders:
-        tender = tender.model_dump(by_alias=True)
-        tender_metadata = TenderMetadata(
-            name=tender.get('name', ''),
-            organization=tender.get('organization', ''),
-            submission_deadline=tender.get('submission_deadline', ''),
-            procedure_type=tender.get('procedure_type', None),
-            initiation_date=tender.get('initiation_date', None)
-        )
-        location = TenderLocation(
-            country="Polska",
-            voivodeship=tender.get('regoin', ''),
-            city=tender.get('city', '')
-        )
-        file_extraction_status = FileExtractionStatus(
-            user_id=user_id,
-            files_processed=0,
-            files_uploaded=0,
-            status="not_extracted"
-        )
-        result = TenderAnalysisResult(
-            user_id=ObjectId(user_id),
-            tender_analysis_id=ObjectId(analysis_id),
-            tender_url=tender.get('details_url', ''),
-            source=source_name,
-            location=location,
-            tender_score=None,
-            tender_metadata=tender_metadata,
-            tender_description=tender.get('description', None),
-            file_extraction_status=file_extraction_status,
-            criteria_analysis=[],
-            criteria_analysis_archive=None,
-            criteria_analysis_edited=False,
-            company_match_explanation="",
-            assistant_id=None,
-            pinecone_config=None,
-            tender_pinecone_id=None,
-            uploaded_files=[],
-            updates=[],
-            status="external",
-            updated_at=None,
-            created_at=datetime.utcnow(),
-            opened_at=None,
-            order_number=None,
-            language=None,
-            external_best_url=get_best_tender_url(tender)
-        )
-        # Save to DB
-        await db.tender_analysis_results.insert_one(result.model_dump(by_alias=True))
-        results_cnt += 1
+    async with ResultWriter() as writer:
+        for tender in tenders:
+            tender = tender.model_dump(by_alias=True)
+            tender_metadata = TenderMetadata(
+                name=tender.get('name', ''),
+                organization=tender.get('organization', ''),
+                submission_deadline=tender.get('submission_deadline', ''),
+                procedure_type=tender.get('procedure_type', None),
+                initiation_date=tender.get('initiation_date', None)
+            )
+            location = TenderLocation(
+                country="Polska",
+                voivodeship=tender.get('regoin', ''),
+                city=tender.get('city', '')
+            )
+            file_extraction_status = FileExtractionStatus(
+                user_id=user_id,
+                files_processed=0,
+                files_uploaded=0,
+                status="not_extracted"
+            )
+            result = TenderAnalysisResult(
+                user_id=ObjectId(user_id),
+                tender_analysis_id=ObjectId(analysis_id),
+                tender_url=tender.get('details_url', ''),
+                source=source_name,
+                location=location,
+                tender_score=None,
+                tender_metadata=tender_metadata,
+                tender_description=tender.get('description', None),
+                file_extraction_status=file_extraction_status,
+                criteria_analysis=[],
+                criteria_analysis_archive=None,
+                criteria_analysis_edited=False,
+                company_match_explanation="",
+                assistant_id=None,
+                pinecone_config=None,
+                tender_pinecone_id=None,
+                uploaded_files=[],
+                updates=[],
+                status="external",
+                updated_at=None,
+                created_at=datetime.utcnow(),
+                opened_at=None,
+                order_number=None,
+                language=None,
+                external_best_url=get_best_tender_url(tender)
+            )
+            await writer.add(result.model_dump(by_alias=True))
+            results_cnt += 1
     logger.info(f"Saved {results_cnt} results to DB for {source_name} analysis {analysis_id} for user {user_id}.")
 
 async def main():
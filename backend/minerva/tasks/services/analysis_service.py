@@ -3,12 +3,13 @@
 import os
 import gc
 from uuid import uuid4
-from minerva.tasks.services.tender_criteria_analysis_service import perform_criteria_analysis
+from minerva.tasks.services.tender_criteria_analysis_service import build_criteria_query_vectors, perform_criteria_analysis
 from minerva.tasks.services.tender_description_filtering_service import perform_description_filtering
 from minerva.tasks.services.tender_description_generation_service import generate_tender_description
 from minerva.tasks.services.tender_file_extraction_service import perform_file_extraction
 from minerva.tasks.services.tender_initial_ai_filtering_service import AIFilteringMode, perform_ai_filtering
 from minerva.tasks.services.search_service import perform_tender_search
+from minerva.tasks.services.result_writer import ResultWriter
 from minerva.tasks.sources.helpers import assign_order_numbers
 from minerva.core.models.file import File
 from minerva.core.models.request.tender_analysis import BatchAnalysisResult, TenderAnalysisResponse, TenderSearchResponse
@@ -35,10 +36,12 @@ from bson import ObjectId
 from datetime import datetime, timedelta
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any, Tuple
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Any, Tuple, Union
 from fastapi import HTTPException
 import pytz
-from playwright.async_api import async_playwright, BrowserContext, Browser, Playwright
+from playwright.async_api import BrowserContext, Browser
+from minerva.core.services.browser_pool import PooledBrowser, browser_pool
 
 logger = logging.getLogger("minerva.tasks.analysis_tasks")
 
@@ -224,7 +227,7 @@ def create_tender_analysis_result_v2(
 async def _process_tender_pipeline(
     tender_obj,
     original_metadata: Dict[str, Any],
-    shared_browser: Browser,
+    shared_browser: Union[Browser, PooledBrowser],
     tender_analysis: TenderAnalysis,
     analysis_id: str,
     rag_index_name: str,
@@ -233,10 +236,12 @@ async def _process_tender_pipeline(
     criteria_definitions: List[AnalysisCriteria],
     semaphore: asyncio.Semaphore,
     source_manager: TenderSourceManager,
-    language: str = "polish"
+    language: str = "polish",
+    query_vectors: Optional[Dict[str, List[float]]] = None,
+    pipeline_budget: Optional[asyncio.Semaphore] = None
 ):
     """End-to-end processing for one tender with cost tracking"""
-    async with semaphore:
+    async with semaphore, (pipeline_budget or nullcontext()):
         tender_id_str = original_metadata.get("details_url", "UNKNOWN_ID")
         
         try:
@@ -292,7 +297,8 @@ async def _process_tender_pipeline(
                 save_results=False,
                 language=language,
                 original_tender_metadata=original_metadata,
-                use_elasticsearch=True
+                use_elasticsearch=True,
+                query_vectors=query_vectors
             )
             
             if criteria_res.get("status") != "success":
@@ -331,6 +337,181 @@ async def _process_tender_pipeline(
             logger.error(f"Pipeline error for tender {tender_id_str}: {exc}", exc_info=True)
             return None
 
+def empty_analysis_response(
+    tender_analysis: TenderAnalysis,
+    initial_ai_filter_id: Optional[str] = None,
+    description_filter_id: Optional[str] = None,
+    total_searched: int = 0,
+    after_initial_filtering: int = 0,
+    after_pipeline_processing: int = 0
+) -> TenderSearchResponse:
+    return TenderSearchResponse(
+        query=tender_analysis.search_phrase,
+        total_tenders_analyzed=0,
+        analysis_results=[],
+        initial_ai_filter_id=initial_ai_filter_id,
+        description_filter_id=description_filter_id,
+        analysis_stats={
+            "total_searched": total_searched,
+            "after_initial_filtering": after_initial_filtering,
+            "after_pipeline_processing": after_pipeline_processing,
+            "final_results": 0
+        }
+    )
+
+async def search_and_filter_tenders(
+    tender_analysis: TenderAnalysis,
+    analysis_id: str,
+    current_user: Optional[User],
+    tender_names_index_name: str,
+    elasticsearch_index_name: str,
+    embedding_model: str,
+    score_threshold: float,
+    top_k: int,
+    filter_conditions: Optional[List[Dict[str, Any]]],
+    ai_batch_size: int
+) -> Dict[str, Any]:
+    """Search stage of an analysis: combined search followed by initial AI filtering"""
+    search_results = await perform_tender_search(
+        search_phrase=tender_analysis.search_phrase,
+        company_description=tender_analysis.company_description,
+        tender_names_index_name=tender_names_index_name,
+        elasticsearch_index_name=elasticsearch_index_name,
+        embedding_model=embedding_model,
+        score_threshold=score_threshold,
+        top_k=top_k,
+        sources=tender_analysis.sources,
+        filter_conditions=filter_conditions,
+        analysis_id=analysis_id,
+        current_user_id=str(current_user.id) if current_user else None,
+        save_results=False
+    )
+
+    all_tender_matches = search_results["all_tender_matches"]
+    combined_search_matches = search_results["combined_search_matches"]
+    search_id = search_results.get("search_id")
+
+    # --- AI Filtering Logic ---
+    total_searched = len(all_tender_matches)
+    logger.info(f"Combined search found {total_searched} unique tenders before AI filtering.")
+    if not all_tender_matches:
+        logger.info("No tenders found in either Pinecone or Elasticsearch.")
+        return {
+            "filtered_tenders": [],
+            "combined_search_matches": combined_search_matches,
+            "total_searched": 0,
+            "initial_ai_filter_id": None
+        }
+
+    filter_results = await perform_ai_filtering(
+        tender_analysis=tender_analysis,
+        all_tender_matches=all_tender_matches,
+        combined_search_matches=combined_search_matches,
+        analysis_id=analysis_id,
+        current_user=current_user,
+        ai_batch_size=ai_batch_size,
+        search_id=search_id
+        # filtering_mode=AIFilteringMode.TRIPLE_RUN
+    )
+
+    if not filter_results["filtered_tenders"]:
+        logger.info("No tenders left after initial AI filtering.")
+
+    return {
+        "filtered_tenders": filter_results["filtered_tenders"],
+        "combined_search_matches": combined_search_matches,
+        "total_searched": total_searched,
+        "initial_ai_filter_id": filter_results.get("initial_ai_filter_id")
+    }
+
+async def finalize_tender_results(
+    tender_analysis: TenderAnalysis,
+    analysis_id: str,
+    current_user: Optional[User],
+    successful_tender_results: List[TenderAnalysisResult],
+    ai_batch_size: int,
+    total_searched: int,
+    after_initial_filtering: int,
+    initial_ai_filter_id: Optional[str] = None,
+    run_id: Optional[str] = None
+) -> TenderSearchResponse:
+    """
+    Fan-in stage of an analysis: description filtering and saving the final
+    results, tagged with `run_id`. Results already saved by an earlier
+    attempt of the same run are skipped.
+    """
+    after_pipeline_processing = len(successful_tender_results)
+
+    if not successful_tender_results:
+        logger.info("No tenders passed full pipeline processing.")
+        return empty_analysis_response(
+            tender_analysis,
+            initial_ai_filter_id=initial_ai_filter_id,
+            total_searched=total_searched,
+            after_initial_filtering=after_initial_filtering
+        )
+
+    # --- Description-based filtering (existing logic) ---
+    description_filter_results = await perform_description_filtering(
+        tender_analysis=tender_analysis,
+        tender_results=successful_tender_results,
+        analysis_id=analysis_id,
+        current_user=current_user,
+        ai_batch_size=ai_batch_size,
+        save_results=False,
+    )
+
+    filtered_tenders = description_filter_results.get("filtered_tenders", [])
+    filtered_out_tenders = description_filter_results.get("filtered_out_tenders", [])
+    description_filter_id = description_filter_results.get("description_filter_id")
+    final_results = len(filtered_tenders)
+    logger.info(f"Description filtering finished. Got {final_results} tenders.")
+
+    if not filtered_tenders:
+        logger.info("No tenders passed description filtering.")
+        return empty_analysis_response(
+            tender_analysis,
+            initial_ai_filter_id=initial_ai_filter_id,
+            description_filter_id=description_filter_id,
+            total_searched=total_searched,
+            after_initial_filtering=after_initial_filtering,
+            after_pipeline_processing=after_pipeline_processing
+        )
+
+    # --- Final Save and Update Logic ---
+    async with ResultWriter(run_id=run_id) as writer:
+        for final_result in filtered_tenders:
+            await writer.add(final_result.dict(by_alias=True))
+
+        for final_result in filtered_out_tenders:
+            res = final_result.dict(by_alias=True)
+            res["status"] = "filtered"
+            await writer.add(res)
+    logger.info(f"Saved {len(filtered_tenders)} tenders and {len(filtered_out_tenders)} filtered on description tenders")
+
+    await db.tender_analysis.update_one(
+        {"_id": ObjectId(analysis_id)},
+        {"$set": {
+            "last_run": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }}
+    )
+
+    logger.info(f"Completed analysis run. Saved {final_results} final results.")
+    return TenderSearchResponse(
+        query=tender_analysis.search_phrase,
+        total_tenders_analyzed=final_results,
+        analysis_results=filtered_tenders,
+        initial_ai_filter_id=initial_ai_filter_id,
+        description_filter_id=description_filter_id,
+        analysis_stats={
+            "total_searched": total_searched,
+            "after_initial_filtering": after_initial_filtering,
+            "after_pipeline_processing": after_pipeline_processing,
+            "final_results": final_results
+        }
+    )
+
 async def analyze_relevant_tenders_with_our_rag(
     analysis_id: str,
     tender_names_index_name: str,
@@ -344,21 +525,25 @@ async def analyze_relevant_tenders_with_our_rag(
     ai_batch_size: int = 60,
     criteria_definitions: list = None,
     batch_size: int = 8,
-    language: str = "polish"
+    language: str = "polish",
+    pipeline_budget: Optional[asyncio.Semaphore] = None
 ):
+    """
+    `batch_size` caps concurrent tender pipelines within this analysis;
+    `pipeline_budget`, when given, is an additional limit shared with other
+    analyses running in the same process.
+    """
     analysis_session_id = str(uuid4())
     async with CostTrackingContext.for_analysis(
         user_id=str(current_user.id),
         tender_analysis_id=analysis_id,
         analysis_session_id=analysis_session_id
     ):
-        playwright: Optional[Playwright] = None
-        browser: Optional[Browser] = None
+        browser: Optional[PooledBrowser] = None
         try:
-            # Start Playwright and create shared browser
-            playwright = await async_playwright().start()
-            browser = await playwright.chromium.launch(headless=True)
-            logger.info(f"Playwright browser started. Concurrency set to: {batch_size}")
+            # Tender contexts come from the process-wide browser pool
+            browser = browser_pool.lease()
+            logger.info(f"Using pooled browsers. Concurrency set to: {batch_size}")
 
             async def initialize_services():
                 tender_analysis_doc = await db.tender_analysis.find_one({"_id": ObjectId(analysis_id)})
@@ -386,81 +571,42 @@ async def analyze_relevant_tenders_with_our_rag(
             # Initialize source manager (existing code)
             source_manager = TenderSourceManager(embedding_config)
 
-            # Search logic (existing code)
-            search_results = await perform_tender_search(
-                search_phrase=tender_analysis.search_phrase,
-                company_description=tender_analysis.company_description,
+            selection = await search_and_filter_tenders(
+                tender_analysis=tender_analysis,
+                analysis_id=analysis_id,
+                current_user=current_user,
                 tender_names_index_name=tender_names_index_name,
                 elasticsearch_index_name=elasticsearch_index_name,
                 embedding_model=embedding_model,
                 score_threshold=score_threshold,
                 top_k=top_k,
-                sources=tender_analysis.sources,
                 filter_conditions=filter_conditions,
-                analysis_id=analysis_id,
-                current_user_id=str(current_user.id) if current_user else None,
-                save_results=False
-            )
-                    
-            all_tender_matches = search_results["all_tender_matches"]
-            combined_search_matches = search_results["combined_search_matches"]
-            search_id = search_results.get("search_id")
-
-            # --- AI Filtering Logic ---
-            total_searched = len(all_tender_matches)
-            logger.info(f"Combined search found {total_searched} unique tenders before AI filtering.")
-            if not all_tender_matches:
-                logger.info("No tenders found in either Pinecone or Elasticsearch.")
-                if browser: await browser.close()
-                if playwright: await playwright.stop()
-                return TenderSearchResponse(
-                    query=tender_analysis.search_phrase,
-                    total_tenders_analyzed=0,
-                    analysis_results=[],
-                    analysis_stats={
-                        "total_searched": 0,
-                        "after_initial_filtering": 0,
-                        "after_pipeline_processing": 0,
-                        "final_results": 0
-                    }
-                )
-
-            filter_results = await perform_ai_filtering(
-                tender_analysis=tender_analysis,
-                all_tender_matches=all_tender_matches,
-                combined_search_matches=combined_search_matches,
-                analysis_id=analysis_id,
-                current_user=current_user,
-                ai_batch_size=ai_batch_size,
-                search_id=search_id
-                # filtering_mode=AIFilteringMode.TRIPLE_RUN
+                ai_batch_size=ai_batch_size
             )
-            
-            all_filtered_tenders = filter_results["filtered_tenders"]
-            initial_ai_filter_id = filter_results.get("initial_ai_filter_id") # Get the ID
+            all_filtered_tenders = selection["filtered_tenders"]
+            combined_search_matches = selection["combined_search_matches"]
+            total_searched = selection["total_searched"]
+            initial_ai_filter_id = selection["initial_ai_filter_id"]
             after_initial_filtering = len(all_filtered_tenders)
 
             if not all_filtered_tenders:
-                logger.info("No tenders left after initial AI filtering.")
                 if browser: await browser.close()
-                if playwright: await playwright.stop()
-                return TenderSearchResponse(
-                    query=tender_analysis.search_phrase,
-                    total_tenders_analyzed=0,
-                    analysis_results=[],
+                return empty_analysis_response(
+                    tender_analysis,
                     initial_ai_filter_id=initial_ai_filter_id,
-                    description_filter_id=None,
-                    analysis_stats={
-                        "total_searched": total_searched,
-                        "after_initial_filtering": 0,
-                        "after_pipeline_processing": 0,
-                        "final_results": 0
-                    }
+                    total_searched=total_searched
                 )
 
             # --- File extraction + criteria + description in a single pipeline task ---
             logger.info(f"Starting unified pipeline for {len(all_filtered_tenders)} tenders with concurrency {batch_size}")
 
+            # Criteria are identical for every tender - embed their queries once per run
+            query_vectors = await build_criteria_query_vectors(
+                criteria=tender_analysis.criteria,
+                rag_index_name=rag_index_name,
+                embedding_model=embedding_model
+            )
+
             async def build_pipeline_tasks():
                 tasks = []
                 for tender in all_filtered_tenders:
@@ -481,7 +627,9 @@ async def analyze_relevant_tenders_with_our_rag(
                             criteria_definitions=criteria_definitions,
                             semaphore=semaphore,
                             source_manager=source_manager,
-                            language=language
+                            language=language,
+                            query_vectors=query_vectors,
+                            pipeline_budget=pipeline_budget
                         )
                     )
                 return tasks
@@ -492,90 +640,16 @@ async def analyze_relevant_tenders_with_our_rag(
 
             logger.info(f"Unified pipeline finished. Successful tender results: {after_pipeline_processing}")
 
-            if not successful_tender_results:
-                logger.info("No tenders passed full pipeline processing.")
-                if browser: await browser.close()
-                if playwright: await playwright.stop()
-                return TenderSearchResponse(
-                    query=tender_analysis.search_phrase,
-                    total_tenders_analyzed=0,
-                    analysis_results=[],
-                    initial_ai_filter_id=initial_ai_filter_id,
-                    description_filter_id=None,
-                    analysis_stats={
-                        "total_searched": total_searched,
-                        "after_initial_filtering": after_initial_filtering,
-                        "after_pipeline_processing": 0,
-                        "final_results": 0
-                    }
-                )
-
-            # --- Description-based filtering (existing logic) ---
-            description_filter_results = await perform_description_filtering(
+            return await finalize_tender_results(
                 tender_analysis=tender_analysis,
-                tender_results=successful_tender_results,
                 analysis_id=analysis_id,
                 current_user=current_user,
+                successful_tender_results=successful_tender_results,
                 ai_batch_size=ai_batch_size,
-                save_results=False,
-            )
-
-            filtered_tenders = description_filter_results.get("filtered_tenders", [])
-            filtered_out_tenders = description_filter_results.get("filtered_out_tenders", [])
-            description_filter_id = description_filter_results.get("description_filter_id")
-            final_results = len(filtered_tenders)
-            logger.info(f"Description filtering finished. Got {final_results} tenders.")
-
-            if not filtered_tenders:
-                logger.info("No tenders passed description filtering.")
-                if browser: await browser.close()
-                if playwright: await playwright.stop()
-                return TenderSearchResponse(
-                    query=tender_analysis.search_phrase,
-                    total_tenders_analyzed=0,
-                    analysis_results=[],
-                    initial_ai_filter_id=initial_ai_filter_id,
-                    description_filter_id=description_filter_id,
-                    analysis_stats={
-                        "total_searched": total_searched,
-                        "after_initial_filtering": after_initial_filtering,
-                        "after_pipeline_processing": after_pipeline_processing,
-                        "final_results": 0
-                    }
-                )
-
-            # --- Final Save and Update Logic (existing code) ---
-            for final_result in filtered_tenders:
-                await db.tender_analysis_results.insert_one(final_result.dict(by_alias=True))
-                logger.info(f"Successfully analyzed and saved tender: {final_result.id}")
-
-            for final_result in filtered_out_tenders:
-                res = final_result.dict(by_alias=True)
-                res["status"] = "filtered"
-                await db.tender_analysis_results.insert_one(res)
-                logger.info(f"Successfully analyzed and saved filtered on description tender: {final_result.id}")
-
-            await db.tender_analysis.update_one(
-                {"_id": ObjectId(analysis_id)},
-                {"$set": {
-                    "last_run": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                }}
-            )
-
-            logger.info(f"Completed analysis run. Saved {final_results} final results.")
-            return TenderSearchResponse(
-                query=tender_analysis.search_phrase,
-                total_tenders_analyzed=final_results,
-                analysis_results=filtered_tenders,
+                total_searched=total_searched,
+                after_initial_filtering=after_initial_filtering,
                 initial_ai_filter_id=initial_ai_filter_id,
-                description_filter_id=description_filter_id,
-                analysis_stats={
-                    "total_searched": total_searched,
-                    "after_initial_filtering": after_initial_filtering,
-                    "after_pipeline_processing": after_pipeline_processing,
-                    "final_results": final_results
-                }
+                run_id=analysis_session_id
             )
 
         except Exception as e:
@@ -585,23 +659,14 @@ async def analyze_relevant_tenders_with_our_rag(
                 detail=f"Error in combined analysis: {str(e)}"
             )
         finally:
-            # Shared Browser Cleanup (existing code)
+            # Close any contexts this analysis left open; pooled browsers stay warm
             if browser:
-                logger.info("Closing shared Playwright browser...")
                 try:
                     await browser.close()
-                    logger.info("Shared browser closed.")
                 except Exception as browser_close_err:
-                    logger.error(f"Error closing browser: {browser_close_err}")
-            if playwright:
-                logger.info("Stopping Playwright...")
-                try:
-                    await playwright.stop()
-                    logger.info("Playwright stopped.")
-                except Exception as playwright_stop_err:
-                    logger.error(f"Error stopping playwright: {playwright_stop_err}")
-                
-                # Final garbage collection
+                    logger.error(f"Error closing browser contexts: {browser_close_err}")
+
+            # Final garbage collection
             gc.collect()
             logger.info("Final garbage collection performed after analysis completed")
 
@@ -2,7 +2,7 @@ import pprint
 import re
 from uuid import uuid4
 from bson import ObjectId
-from minerva.core.services.vectorstore.helpers import MAX_TOKENS, count_tokens, safe_chunk_text
+from minerva.core.services.vectorstore.helpers import MAX_TOKENS, safe_token_chunks
 from minerva.api.routes.retrieval_routes import sanitize_id
 from minerva.core.models.file import FilePineconeConfig
 from minerva.core.models.request.ai import LLMSearchRequest, LLMRAGRequest
@@ -11,6 +11,8 @@ from minerva.core.models.user import User
 from minerva.core.middleware.token_tracking import update_user_token_usage
 from minerva.core.models.extensions.tenders.tender_analysis import AnalysisCriteria, TenderAnalysis, TenderAnalysisResult, TenderDecriptionProfileMatches, TenderProfileMatches, TenderToAnalyseDescription, Citation
 from minerva.core.services.vectorstore.file_content_extract.base import ExtractorRegistry
+from minerva.core.services.vectorstore.file_content_extract.executor import extraction_executor
+from minerva.core.services.vectorstore.file_content_extract.cache import extract_file_content_cached
 from minerva.core.services.vectorstore.pinecone.query import QueryConfig, QueryTool
 from minerva.core.services.vectorstore.pinecone.upsert import EmbeddingConfig, EmbeddingTool
 from minerva.core.services.vectorstore.text_chunks import ChunkingConfig, TextChunker
@@ -42,6 +44,8 @@ from elasticsearch import helpers
 
 logger = logging.getLogger("minerva.tasks.analysis_tasks")
 
+LOCATION_RAG_QUERY = "Podaj kraj, województwo i miasto dla przetargu."
+
 # Whitelist of user IDs that get access to gpt-4.1-mini model
 PREMIUM_MODEL_USERS = {
     "67c6cb742fee91862e135247", #hydratec
@@ -377,14 +381,23 @@ class RAGManager:
                 # Get the appropriate extractor and set tender context if it supports it
                 extractor = self.registry.get(tmp_path.suffix.lower())
                 if extractor and hasattr(extractor, 'set_tender_context'):
+                    # The registry's instance is shared by concurrent uploads running on the
+                    # extraction pool; give this upload its own extractor to carry the context
+                    extractor = type(extractor)()
                     extractor.set_tender_context(tender_url=self.tender_url, tender_id=self.tender_pinecone_id)
                 
-                # Extract text content
-                file_content_list = list(extractor.extract_file_content(tmp_path)) if extractor else []
+                # Extract text content on the bounded extraction pool - parsing and OCR
+                # are CPU-bound and would otherwise block the event loop
+                file_content_list = await extraction_executor.run(
+                    lambda: list(extract_file_content_cached(extractor, tmp_path))
+                ) if extractor else []
                 if file_content_list:
                     text = file_content_list[0].content
                 else:
                     text = file_content.decode() if isinstance(file_content, (bytes, bytearray)) else file_content
+            except asyncio.TimeoutError:
+                logger.error(f"{tender_context} Extraction timed out for {filename}, skipping its content")
+                text = ""
             except Exception as e:
                 logger.warning(f"{tender_context} Error extracting content from {filename}: {e}")
                 text = file_content.decode() if isinstance(file_content, (bytes, bytearray)) else file_content
@@ -427,13 +440,14 @@ class RAGManager:
             batch_for_pinecone = []
             total_tokens_for_embedding = 0
         
-            for chunk in safe_chunk_text(text, self.chunker, self.embedding_model):
+            for text_chunk in safe_token_chunks(text, self.chunker, self.embedding_model):
+                chunk = text_chunk.text
                 if not chunk or not chunk.strip():
                     continue
 
-                tokens = count_tokens(chunk, self.embedding_model)
+                tokens = text_chunk.token_count
                 total_tokens_for_embedding += tokens
-                if count_tokens(chunk, self.embedding_model) > MAX_TOKENS:
+                if tokens > MAX_TOKENS:
                     logger.error("Chunk %s from %s over token limit", chunk_index_global, filename)
                     chunk_index_global += 1
                     continue
@@ -452,7 +466,7 @@ class RAGManager:
                     "timestamp": datetime.now().isoformat(),
                 }
 
-                batch_for_pinecone.append({"id": chunk_id, "input": chunk, "metadata": metadata})
+                batch_for_pinecone.append({"id": chunk_id, "input": chunk, "token_count": tokens, "metadata": metadata})
 
                 if self.use_elasticsearch:
                     action = {
@@ -468,18 +482,11 @@ class RAGManager:
                 chunk_index_global += 1
 
                 if len(batch_for_pinecone) >= self.EMBED_BATCH_SIZE:
-                    # Track embedding cost before calling embed_and_store_batch
-                    batch_tokens = sum(count_tokens(item["input"], self.embedding_model) for item in batch_for_pinecone)
-                    await self._track_embedding_batch(batch_tokens)
-                    
+                    # Embedding costs are tracked for cache misses inside the embedding tool
                     await self.embedding_tool.embed_and_store_batch(batch_for_pinecone)
                     batch_for_pinecone.clear()
                     
             if batch_for_pinecone:
-                # Track embedding cost for final batch
-                batch_tokens = sum(count_tokens(item["input"], self.embedding_model) for item in batch_for_pinecone)
-                await self._track_embedding_batch(batch_tokens)
-                
                 await self.embedding_tool.embed_and_store_batch(batch_for_pinecone)
 
         # Always process Elasticsearch if enabled
@@ -513,18 +520,6 @@ class RAGManager:
             elasticsearch_indexed=self.use_elasticsearch,
         )
 
-    async def _track_embedding_batch(self, token_count: int):
-        """Track embedding costs for a batch of embeddings"""
-        try:
-            from minerva.core.services.llm_logic import track_embedding_call
-            await track_embedding_call(
-                model_name=self.embedding_model,
-                input_tokens=token_count
-            )
-        except Exception as e:
-            logger.debug(f"Error tracking embedding costs: {str(e)}")
-            pass
-        
     @staticmethod
     async def ai_filter_tenders(
         tender_analysis: TenderAnalysis,
@@ -906,9 +901,10 @@ class RAGManager:
                 "corrected_filtered_out": filtered_out_tenders
             }
 
-    async def analyze_subcriteria(self, subcriteria: str, tender_pinecone_id: str) -> Dict[str, Any]:
+    async def analyze_subcriteria(self, subcriteria: str, tender_pinecone_id: str, query_vector: Optional[List[float]] = None) -> Dict[str, Any]:
         """
         Analyze a single subcriteria query using both RAG search and Elasticsearch if enabled.
+        A pre-computed query_vector skips embedding the subcriteria text again.
         Returns the search results with metadata.
         """
         try:
@@ -925,7 +921,8 @@ class RAGManager:
                 query_text=subcriteria,
                 top_k=3,
                 score_threshold=0.1,
-                filter_conditions=filter_conditions
+                filter_conditions=filter_conditions,
+                query_vector=query_vector
             )
 
             if search_results.get("status") == "error":
@@ -997,13 +994,16 @@ class RAGManager:
                 "error": str(e)
             }
 
-    async def analyze_tender_criteria_and_location(self, current_user: User, criteria: List[AnalysisCriteria], include_vector_results: bool = False, original_tender_metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def analyze_tender_criteria_and_location(self, current_user: User, criteria: List[AnalysisCriteria], include_vector_results: bool = False, original_tender_metadata: Optional[Dict[str, Any]] = None, query_vectors: Optional[Dict[str, List[float]]] = None) -> Dict[str, Any]:
         # Memory log at start
         log_mem(f"{self.tender_pinecone_id} analyze_tender_criteria_and_location:start")
         """
         Analyze multiple criteria + location concurrently, using a semaphore to limit concurrency.
         Now includes Elasticsearch results if enabled and handles subcriteria queries.
+        query_vectors maps query texts to embeddings computed once per analysis run
+        (see build_criteria_query_vectors); texts missing from it are embedded on demand.
         """
+        query_vectors = query_vectors or {}
         # Limit concurrency to 3 tasks at a time
         semaphore = asyncio.Semaphore(4)
 
@@ -1076,7 +1076,7 @@ class RAGManager:
                 if hasattr(criterion, 'subcriteria') and criterion.subcriteria and len(criterion.subcriteria) > 0:
                     # Create tasks for all subcriteria queries
                     subcriteria_tasks = [
-                        self.analyze_subcriteria(subcrit, self.tender_pinecone_id)
+                        self.analyze_subcriteria(subcrit, self.tender_pinecone_id, query_vectors.get(subcrit))
                         for subcrit in criterion.subcriteria
                     ]
                     
@@ -1200,7 +1200,7 @@ class RAGManager:
                     }
                 )
 
-                response = await llm_rag_search_logic(request_data, self.tender_pinecone_id, 5)
+                response = await llm_rag_search_logic(request_data, self.tender_pinecone_id, 5, query_vectors.get(criterion.description))
                 
                 # Add robust JSON parsing with error handling
                 try:
@@ -1322,7 +1322,7 @@ class RAGManager:
                 
                 request_data = LLMRAGRequest(
                     query=prompt,
-                    rag_query="Podaj kraj, województwo i miasto dla przetargu.",
+                    rag_query=LOCATION_RAG_QUERY,
                     vector_store={
                         "index_name": self.index_name,
                         "namespace": self.namespace,
@@ -1338,7 +1338,7 @@ class RAGManager:
                         "response_format": response_format
                     }
                 )
-                response = await llm_rag_search_logic(request_data, self.tender_pinecone_id, 2)
+                response = await llm_rag_search_logic(request_data, self.tender_pinecone_id, 2, query_vectors.get(LOCATION_RAG_QUERY))
                 
                 # Add robust JSON parsing with error handling
                 try:
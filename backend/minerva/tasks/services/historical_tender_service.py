@@ -1,15 +1,37 @@
+import asyncio
 import logging
+import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from pymongo import UpdateOne
 from minerva.tasks.services.tender_insert_service import TenderInsertConfig
 from minerva.core.services.vectorstore.pinecone.upsert import EmbeddingConfig, UpsertTool
 from minerva.core.services.vectorstore.pinecone.query import QueryConfig, QueryTool
 from minerva.tasks.sources.ezamowienia.extract_historical_tenders import HistoricalTenderExtractor, HistoricalTender
 from minerva.core.database.database import db
-from minerva.core.helpers.biznespolska_oferent_shared import is_same_tender
+from minerva.core.helpers.tender_matching import is_same_tender
 
 logger = logging.getLogger("minerva.tasks.historical_tenders")
 
+# Concurrent Pinecone queries when reconciling historical tenders without a URL match
+HISTORICAL_FALLBACK_CONCURRENCY = int(os.getenv("HISTORICAL_FALLBACK_CONCURRENCY", "8"))
+
+# Source mapping for fallback search
+HISTORICAL_SOURCE_MAP = {
+    "ezamowienia.gov.pl": "ezamowienia",
+    "ted.europa.eu": "ted",
+    "egospodarka.pl": "egospodarka",
+    "eb2b.com.pl": "eb2b",
+    "ezamawiajacy.pl": "ezamawiajacy",
+    "logintrade.pl": "logintrade",
+    "smartpzp.pl": "smartpzp",
+    "epropublico.pl": "epropublico_main",
+    "platformazakupowa.pl": "platformazakupowa",
+    "bazakonkurencyjnosci.funduszeeuropejskie.gov.pl": "bazakonkurencyjnosci",
+    "connect.orlen.pl": "orlenconnect",
+    "pge.pl": "pge",
+}
+
 class HistoricalTenderService:    
     def __init__(self, config: TenderInsertConfig):
         self.config = config
@@ -196,121 +218,166 @@ class HistoricalTenderService:
             logger.error(f"Error fetching tender from Pinecone: {e}")
             raise e
 
+    async def _first_results_by_url(self, urls: List[str]) -> Dict[str, Any]:
+        """One $in query; maps each url to the _id of the first result stored for it"""
+        unique_urls = list(dict.fromkeys(u for u in urls if u))
+        if not unique_urls:
+            return {}
+        by_url: Dict[str, Any] = {}
+        cursor = db.tender_analysis_results.find(
+            {"tender_url": {"$in": unique_urls}}, {"_id": 1, "tender_url": 1}
+        )
+        async for doc in cursor:
+            by_url.setdefault(doc["tender_url"], doc["_id"])
+        return by_url
+
+    async def _fallback_candidates(self, items: List[Dict], embedding_model: Optional[str]) -> None:
+        """
+        Semantic fallback for items without a URL match: queries embedded in
+        batched requests, Pinecone queried concurrently. Sets each item's "confirmed" to
+        the (url, a, b) candidates that is_same_tender holds for, best match first.
+        """
+        if not items:
+            return
+        tenders_tool = QueryTool(QueryConfig(
+            index_name="tenders",
+            embedding_model=embedding_model or "text-embedding-3-large",
+        ))
+        query_texts = list(dict.fromkeys(item["query_text"] for item in items))
+        try:
+            vectors = dict(zip(query_texts, await tenders_tool.create_query_embeddings(query_texts)))
+        except Exception as e:
+            logger.error(f"Error embedding {len(query_texts)} historical fallback queries: {e}")
+            return
+
+        semaphore = asyncio.Semaphore(HISTORICAL_FALLBACK_CONCURRENCY)
+
+        async def confirm_candidates(item: Dict):
+            filter_conditions = None
+            if item["source_type"]:
+                filter_conditions = {"source_type": {"$eq": item["source_type"]}}
+            async with semaphore:
+                cand_results = await tenders_tool.query_by_vector(
+                    query_vector=vectors[item["query_text"]],
+                    top_k=3,
+                    score_threshold=0.45,
+                    filter_conditions=filter_conditions,
+                )
+            if "matches" not in cand_results:
+                logger.error(f"Fallback query for historical tender {item['hist_id']} failed: {cand_results.get('error')}")
+                return
+
+            hist_meta = item["meta"]
+            b = {
+                "id": hist_meta.get("original_tender_url"),
+                "name": hist_meta.get("name"),
+                "organization": hist_meta.get("organization"),
+            }
+            confirmed = []
+            for cand in cand_results["matches"]:
+                cand_meta = cand.get("metadata", {}) or {}
+                a = {
+                    "id": cand_meta.get("details_url"),
+                    "name": cand_meta.get("name"),
+                    "organization": cand_meta.get("organization"),
+                }
+                cand_url = cand_meta.get("details_url") or cand_meta.get("original_tender_url")
+                if cand_url and is_same_tender(a, b):
+                    confirmed.append((cand_url, a, b))
+            item["confirmed"] = confirmed
+
+        await asyncio.gather(*[confirm_candidates(item) for item in items])
+
     async def _update_finished_ids(self, matches: List[Dict], embedding_model: Optional[str] = None) -> Dict[str, Any]:
-        """Update finished_id in MongoDB tender_analysis_results for matched historical tenders"""
+        """
+        Update finished_id in MongoDB tender_analysis_results for matched historical tenders.
+
+        Set-based: one $in query for URL matches, batched embeddings and
+        bounded concurrent Pinecone queries for the semantic fallback, one
+        $in query for the fallback candidates and one bulk_write.
+        """
         not_matched_primary: List[str] = []
         not_matched_fallback: List[Dict] = []
         updated_with_url: List[str] = []
         updated_without_url: List[Dict] = []
         updated_tender_analysis_ids: List[str] = []  # Track actual tender analysis result IDs
 
-        # Source mapping for fallback search
-        SOURCE_MAP = {
-            "ezamowienia.gov.pl": "ezamowienia",
-            "ted.europa.eu": "ted",
-            "egospodarka.pl": "egospodarka",
-            "eb2b.com.pl": "eb2b",
-            "ezamawiajacy.pl": "ezamawiajacy",
-            "logintrade.pl": "logintrade",
-            "smartpzp.pl": "smartpzp",
-            "epropublico.pl": "epropublico_main",
-            "platformazakupowa.pl": "platformazakupowa",
-            "bazakonkurencyjnosci.funduszeeuropejskie.gov.pl": "bazakonkurencyjnosci",
-            "connect.orlen.pl": "orlenconnect",
-            "pge.pl": "pge",
-        }
-
+        items = []
         for hist in matches:
-            hist_id = hist["id"]
             hist_meta = hist.get("metadata", {}) or {}
             url = hist_meta.get("original_tender_url")
             name = (hist_meta.get("name") or "").strip()
             organization = (hist_meta.get("organization") or "").strip()
 
-            # Try primary URL match
-            mongo_doc = None
-            with_url = False
+            # Determine source_type from url if possible
+            source_type = None
             if url:
-                mongo_doc = await db.tender_analysis_results.find_one(
-                    {"tender_url": url}
-                )
-                if mongo_doc:
-                    with_url = True
-
-            # Fallback: semantic search by name + org
-            if not mongo_doc and (name or organization):
-                query_text = f"{name} {organization}".strip()
-
-                # Determine source_type from url if possible
-                source_type = None
-                if url:
-                    for k, v in SOURCE_MAP.items():
-                        if k in url:
-                            source_type = v
-                            break
-                if source_type == "ezamowienia":
-                    continue
-                
-                tenders_tool = QueryTool(QueryConfig(
-                    index_name="tenders",
-                    embedding_model=embedding_model or "text-embedding-3-large",
-                ))
-                filter_conditions = None
-                if source_type:
-                    filter_conditions = {"source_type": {"$eq": source_type}}
-
-                cand_results = await tenders_tool.query_by_text(
-                    query_text=query_text,
-                    top_k=3,
-                    score_threshold=0.45,
-                    filter_conditions=filter_conditions,
-                )
+                for k, v in HISTORICAL_SOURCE_MAP.items():
+                    if k in url:
+                        source_type = v
+                        break
 
-                for cand in cand_results["matches"]:
-                    cand_meta = cand.get("metadata", {}) or {}
-                    a = {
-                        "id": cand_meta.get("details_url"),
-                        "name": cand_meta.get("name"),
-                        "organization": cand_meta.get("organization"),
-                    }
-                    b = {
-                        "id": hist_meta.get("original_tender_url"),
-                        "name": hist_meta.get("name"),
-                        "organization": hist_meta.get("organization"),
-                    }
-                    if is_same_tender(a, b):
-                        cand_url = (
-                            cand_meta.get("details_url")
-                            or cand_meta.get("original_tender_url")
-                        )
-                        if cand_url:
-                            mongo_doc = await db.tender_analysis_results.find_one(
-                                {"tender_url": cand_url}
-                            )
-                            if mongo_doc:
-                                updated_without_url.append({"a": a, "b": b})
-                                break
+            items.append({
+                "hist_id": hist["id"],
+                "meta": hist_meta,
+                "url": url,
+                "query_text": f"{name} {organization}".strip(),
+                "source_type": source_type,
+                "confirmed": [],
+            })
+
+        # Primary: URL match
+        by_url = await self._first_results_by_url([item["url"] for item in items])
+
+        # Fallback: semantic search by name + org; ezamowienia URLs are trusted as-is
+        fallback_items = [
+            item for item in items
+            if not by_url.get(item["url"]) and item["query_text"] and item["source_type"] != "ezamowienia"
+        ]
+        await self._fallback_candidates(fallback_items, embedding_model)
+        by_fallback_url = await self._first_results_by_url(
+            [cand_url for item in fallback_items for cand_url, _, _ in item["confirmed"]]
+        )
+
+        updates = []
+        for item in items:
+            hist_id, url = item["hist_id"], item["url"]
+            doc_id = by_url.get(url) if url else None
+            with_url = doc_id is not None
+
+            if doc_id is None and item["query_text"]:
+                if item["source_type"] == "ezamowienia":
+                    continue
+                for cand_url, a, b in item["confirmed"]:
+                    doc_id = by_fallback_url.get(cand_url)
+                    if doc_id is not None:
+                        updated_without_url.append({"a": a, "b": b})
+                        break
 
                 # Record diagnostics when fallback couldn't find anything
-                if not mongo_doc:
+                if doc_id is None:
                     not_matched_fallback.append(
-                        {"hist_id": hist_id, "query": query_text}
+                        {"hist_id": hist_id, "query": item["query_text"]}
                     )
 
-            # Persist when we finally have a Mongo document
-            if mongo_doc:
-                await db.tender_analysis_results.update_one(
-                    {"_id": mongo_doc["_id"]},
-                    {"$set": {"finished_id": hist_id}},
-                )
+            if doc_id is not None:
+                updates.append(UpdateOne({"_id": doc_id}, {"$set": {"finished_id": hist_id}}))
                 # Track the tender analysis result ID for notifications
-                updated_tender_analysis_ids.append(str(mongo_doc["_id"]))
-                
+                updated_tender_analysis_ids.append(str(doc_id))
+
                 if with_url:
                     updated_with_url.append(url)
             else:
                 not_matched_primary.append(url or f"(no-url) {hist_id}")
 
+        if updates:
+            # Ordered, so a result matched by several historical tenders keeps the last one as before
+            await db.tender_analysis_results.bulk_write(updates, ordered=True)
+        logger.info(
+            f"Reconciled {len(items)} historical tenders: {len(updated_with_url)} by URL, "
+            f"{len(updated_without_url)} by fallback, {len(fallback_items)} fallback queries"
+        )
+
         return {
             "updated_with_url": updated_with_url,
             "updated_without_url": updated_without_url,
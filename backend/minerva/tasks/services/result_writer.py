@@ -0,0 +1,86 @@
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import BulkWriteError
+
+from minerva.core.database.database import db
+
+logger = logging.getLogger(__name__)
+
+# Documents per insert_many round trip
+RESULT_WRITER_PAGE_SIZE = int(os.getenv("RESULT_WRITER_PAGE_SIZE", "200"))
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class ResultWriter:
+    """
+    Buffers result documents and writes them with unordered insert_many
+    pages instead of one insert_one each.
+
+    Every document is tagged with `run_id`, so the results of a run can be
+    found (and a crashed run resumed) later. Documents whose _id is already
+    stored count as written: re-saving a run whose results keep their ids,
+    e.g. a retried fan-out finalizer, is a no-op for the parts that made it.
+    Any other write error makes the context manager raise on exit, so the
+    caller's run fails visibly and can be retried.
+
+        async with ResultWriter(run_id=run_id) as writer:
+            for result in results:
+                await writer.add(result.dict(by_alias=True))
+    """
+
+    def __init__(
+        self,
+        collection=None,
+        run_id: Optional[str] = None,
+        page_size: int = RESULT_WRITER_PAGE_SIZE,
+    ):
+        self.collection = collection if collection is not None else db.tender_analysis_results
+        self.run_id = run_id
+        self.page_size = max(1, page_size)
+        self._buffer: List[Dict[str, Any]] = []
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+
+    async def add(self, doc: Dict[str, Any]):
+        if self.run_id is not None:
+            doc.setdefault("run_id", self.run_id)
+        self._buffer.append(doc)
+        if len(self._buffer) >= self.page_size:
+            await self.flush()
+
+    async def flush(self):
+        while self._buffer:
+            page, self._buffer = self._buffer[:self.page_size], self._buffer[self.page_size:]
+            try:
+                result = await self.collection.insert_many(page, ordered=False)
+                self.inserted += len(result.inserted_ids)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                duplicates = sum(1 for err in errors if err.get("code") == DUPLICATE_KEY_ERROR)
+                self.inserted += e.details.get("nInserted", 0)
+                self.duplicates += duplicates
+                self.failed += len(errors) - duplicates
+                if len(errors) > duplicates:
+                    first = next(err for err in errors if err.get("code") != DUPLICATE_KEY_ERROR)
+                    logger.error(
+                        f"Run {self.run_id}: {len(errors) - duplicates} of {len(page)} results failed to save, "
+                        f"first error: {first.get('errmsg')}"
+                    )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        # Keep what was produced even if the caller failed part-way
+        await self.flush()
+        if self.inserted or self.duplicates or self.failed:
+            logger.info(
+                f"Run {self.run_id}: saved {self.inserted} results"
+                f" ({self.duplicates} already stored, {self.failed} failed)"
+            )
+        if self.failed and exc_type is None:
+            raise RuntimeError(f"Run {self.run_id}: {self.failed} results failed to save")
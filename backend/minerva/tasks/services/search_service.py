@@ -180,6 +180,140 @@ async def generate_pinecone_queries(
         logger.warning(f"Query-expander JSON parse failed: {e}")
         return []
 
+def plan_pinecone_queries(
+    semantic_phrases: List[str],
+    sources: Optional[List[str]],
+    pinecone_filters: Dict[str, Any],
+    score_threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    Build the list of Pinecone queries for a search: one tender-names and one
+    tender-subjects query per (source, phrase), or per phrase when no sources
+    are given. The order defines which query claims a tender first.
+    """
+    planned = []
+    phrases = list(dict.fromkeys(p for p in semantic_phrases if p and p.strip()))
+
+    if sources and isinstance(sources, list) and len(sources) > 0:
+        for source in sources:
+            source_pinecone_filters = pinecone_filters.copy()
+            source_pinecone_filters["source_type"] = {"$eq": source}
+            for phrase in phrases:
+                planned.append({"phrase": phrase, "source": source, "index_type": "tender_names",
+                                "filters": source_pinecone_filters, "score_threshold": score_threshold})
+                planned.append({"phrase": phrase, "source": source, "index_type": "tender_subjects",
+                                "filters": source_pinecone_filters, "score_threshold": 0.3})
+    else:
+        for phrase in phrases:
+            planned.append({"phrase": phrase, "source": None, "index_type": "tender_names",
+                            "filters": pinecone_filters, "score_threshold": score_threshold})
+            planned.append({"phrase": phrase, "source": None, "index_type": "tender_subjects",
+                            "filters": pinecone_filters, "score_threshold": score_threshold})
+
+    return planned
+
+def plan_elasticsearch_queries(
+    search_phrases: List[str],
+    sources: Optional[List[str]],
+    es_filters: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Build one Elasticsearch match query per (source, phrase), or per phrase when
+    no sources are given, in the order their hits are merged.
+    """
+    planned = []
+    if sources and isinstance(sources, list) and len(sources) > 0:
+        for source in sources:
+            for phrase in search_phrases:
+                planned.append({
+                    "phrase": phrase,
+                    "source": source,
+                    "query": {
+                        "bool": {
+                            "must": [
+                                {"match": {"text": phrase}}
+                            ],
+                            "filter": [
+                                {"term": {"metadata.source_type.keyword": source}}
+                            ] + es_filters
+                        }
+                    }
+                })
+    else:
+        for phrase in search_phrases:
+            planned.append({
+                "phrase": phrase,
+                "source": None,
+                "query": {
+                    "bool": {
+                        "must": [
+                            {"match": {"text": phrase}}
+                        ],
+                        "filter": es_filters
+                    }
+                }
+            })
+    return planned
+
+async def run_elasticsearch_msearch(
+    planned: List[Dict[str, Any]],
+    elasticsearch_index_name: str,
+    size: int = 500
+) -> List[Dict[str, Any]]:
+    """
+    Send all planned queries in a single _msearch request. Returns one response
+    per planned query, in order; failed queries carry an "error" key.
+    """
+    if not planned:
+        return []
+
+    searches = []
+    for item in planned:
+        searches.append({"index": elasticsearch_index_name})
+        searches.append({"query": item["query"], "size": size})
+
+    logger.info(f"Querying Elasticsearch with {len(planned)} queries in one msearch request")
+    try:
+        response = await es_client.msearch(searches=searches)
+        return list(response["responses"])
+    except Exception as e:
+        logger.error(f"Elasticsearch msearch failed: {e}", exc_info=True)
+        return [{"error": str(e)} for _ in planned]
+
+async def embed_search_phrases(query_tool: QueryTool, semantic_phrases: List[str]) -> Dict[str, List[float]]:
+    """
+    Embed all distinct semantic phrases in a single batched request. Both the
+    tender-names and tender-subjects indexes share the embedding model, so each
+    vector is reused across every source and index.
+    """
+    phrases = list(dict.fromkeys(p for p in semantic_phrases if p and p.strip()))
+    if not phrases:
+        return {}
+    try:
+        vectors = await query_tool.create_query_embeddings(phrases)
+        return dict(zip(phrases, vectors))
+    except Exception as e:
+        # Queries fall back to embedding their phrase individually
+        logger.error(f"Batched embedding of search phrases failed: {e}", exc_info=True)
+        return {}
+
+async def hydrate_parent_metadata(query_tool: QueryTool, tender_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Resolve tender-names index metadata for parent tenders of tender-subject
+    matches with one bulk fetch per search. Nothing is cached across searches,
+    so updated or re-ingested tenders are always read fresh.
+    """
+    if not tender_ids:
+        return {}
+    try:
+        metadata_by_id = await query_tool.fetch_metadata_by_ids(tender_ids)
+    except Exception as e:
+        logger.warning(f"Failed to fetch complete metadata for tender-subject parents: {e}")
+        return {}
+
+    logger.info(f"Hydrated metadata for {len(metadata_by_id)}/{len(tender_ids)} tender-subject parents")
+    return metadata_by_id
+
 async def perform_tender_search(
     search_phrase: str,
     company_description: str,      
@@ -247,212 +381,104 @@ async def perform_tender_search(
     pinecone_filters = translate_filters_to_pinecone(filter_conditions or [])
     es_filters = translate_filters_to_elasticsearch(filter_conditions or [])
 
-    # Prepare all Pinecone query tasks
-    pinecone_tasks = []
-    task_metadata = []
-
-    if sources and isinstance(sources, list) and len(sources) > 0:
-        # Create tasks for each source + phrase combination
-        for source in sources:
-            source_pinecone_filters = pinecone_filters.copy()
-            source_pinecone_filters["source_type"] = {"$eq": source}
-
-            # Add Elasticsearch tasks for each search phrase
-            for phrase in search_phrases:
-                es_query = {
-                    "bool": {
-                        "must": [
-                            {"match": {"text": phrase}}
-                        ],
-                        "filter": [
-                            {"term": {"metadata.source_type.keyword": source}}
-                        ] + es_filters
-                    }
-                }
+    if not (sources and isinstance(sources, list) and len(sources) > 0):
+        logger.info("No specific sources provided, running single query across both search engines.")
 
-                logger.info(f"Querying Elasticsearch for source: {source} with query: {es_query}")
-                es_result = await es_client.search(
-                    index=elasticsearch_index_name,
-                    body={
-                        "query": es_query,
-                        "size": 500
-                    }
-                )
+    # Plan both legs up front: Elasticsearch queries per (source, phrase) and
+    # Pinecone queries per (source, semantic phrase, index)
+    es_plan = plan_elasticsearch_queries(search_phrases, sources, es_filters)
+    task_metadata = plan_pinecone_queries(semantic_phrases, sources, pinecone_filters, score_threshold)
 
-                for hit in es_result["hits"]["hits"]:
-                    match_id = hit["_id"]
-                    if match_id in processed_ids:
-                        continue
-                    processed_ids.add(match_id)
-                    metadata = hit["_source"].get("metadata", {})
-                    tender_name = hit["_source"].get("title", "")
-                    es_match = {
-                        "id": match_id,
-                        "score": hit["_score"],
-                        "metadata": metadata
-                    }
-                    all_tender_matches.append({
-                        "id": match_id,
-                        "name": tender_name,
-                        "organization": hit["_source"].get("organization", ""),
-                        "location": metadata.get("location", ""),
-                        "source": "elasticsearch",
-                        "search_phrase": phrase,
-                        "source_type": metadata.get("source_type")
-                    })
-                    combined_search_matches[match_id] = es_match
-                    detailed_results.setdefault(phrase, {}).setdefault("elasticsearch", []).append({
-                        "id": match_id,
-                        "name": tender_name,
-                        "score": hit["_score"],
-                        "source": "elasticsearch",
-                        "source_type": metadata.get("source_type")
-                    })
+    query_tools = {
+        "tender_names": query_tool,
+        "tender_subjects": query_tool_subjects
+    }
 
-                es_hits = es_result.get("hits", {}).get("hits", [])
-                es_count = len(es_hits)
-                logger.info(f"Elasticsearch found: {es_count} unique tenders for source: {source}.")
+    # Create semaphore to limit concurrent queries (adjust based on your Pinecone plan)
+    max_concurrent_queries = 10  # Adjust this based on your rate limits
+    semaphore = asyncio.Semaphore(max_concurrent_queries)
 
-            # Add Pinecone tasks for each semantic phrase
-            for phrase in semantic_phrases:
-                # Tender names query task
-                task = query_tool.query_by_text(
-                    query_text=phrase,
-                    top_k=top_k,
-                    score_threshold=score_threshold,
-                    filter_conditions=source_pinecone_filters
-                )
-                pinecone_tasks.append(task)
-                task_metadata.append({
-                    "phrase": phrase,
-                    "source": source,
-                    "index_type": "tender_names",
-                    "filters": source_pinecone_filters
-                })
+    async def run_pinecone_leg():
+        # Embed every distinct semantic phrase in one request
+        phrase_vectors = await embed_search_phrases(query_tool, semantic_phrases)
+        logger.info(f"Executing {len(task_metadata)} Pinecone queries with {len(phrase_vectors)} shared embeddings...")
 
-                # Tender subjects query task
-                task = query_tool_subjects.query_by_text(
-                    query_text=phrase,
+        async def execute_with_semaphore(planned: Dict[str, Any]):
+            async with semaphore:
+                return await query_tools[planned["index_type"]].query_by_text(
+                    query_text=planned["phrase"],
                     top_k=top_k,
-                    score_threshold=0.3,
-                    filter_conditions=source_pinecone_filters
+                    score_threshold=planned["score_threshold"],
+                    filter_conditions=planned["filters"],
+                    query_vector=phrase_vectors.get(planned["phrase"])
                 )
-                pinecone_tasks.append(task)
-                task_metadata.append({
-                    "phrase": phrase,
-                    "source": source,
-                    "index_type": "tender_subjects",
-                    "filters": source_pinecone_filters
-                })
-    else:
-        logger.info("No specific sources provided, running single query across both search engines.")
 
-        # Add Elasticsearch tasks for each search phrase
-        for phrase in search_phrases:
-            es_query = {
-                "bool": {
-                    "must": [
-                        {"match": {"text": phrase}}
-                    ],
-                    "filter": es_filters
-                }
-            }
+        # Execute tasks with concurrency control
+        return await asyncio.gather(
+            *[execute_with_semaphore(planned) for planned in task_metadata], 
+            return_exceptions=True
+        )
+
+    # Lexical and semantic legs run concurrently; results are merged below in
+    # the original order (Elasticsearch first) so de-duplication is unchanged
+    es_responses, pinecone_results = await asyncio.gather(
+        run_elasticsearch_msearch(es_plan, elasticsearch_index_name),
+        run_pinecone_leg()
+    )
 
-            logger.info(f"Querying Elasticsearch with query: {es_query}")
-            es_result = await es_client.search(
-                index=elasticsearch_index_name,
-                body={
-                    "query": es_query,
-                    "size": 500
-                }
-            )
-
-            for hit in es_result["hits"]["hits"]:
-                match_id = hit["_id"]
-                if match_id in processed_ids:
-                    continue
-                processed_ids.add(match_id)
-                metadata = hit["_source"].get("metadata", {})
-                tender_name = hit["_source"].get("title", "")
-                es_match = {
-                    "id": match_id,
-                    "score": hit["_score"],
-                    "metadata": metadata
-                }
-                all_tender_matches.append({
-                    "id": match_id,
-                    "name": tender_name,
-                    "organization": hit["_source"].get("organization", ""),
-                    "location": metadata.get("location", ""),
-                    "source": "elasticsearch",
-                    "search_phrase": phrase,
-                    "source_type": metadata.get("source_type")
-                })
-                combined_search_matches[match_id] = es_match
-                detailed_results.setdefault(phrase, {}).setdefault("elasticsearch", []).append({
-                    "id": match_id,
-                    "name": tender_name,
-                    "score": hit["_score"],
-                    "source": "elasticsearch",
-                    "source_type": metadata.get("source_type")
-                })
+    for planned, es_result in zip(es_plan, es_responses):
+        phrase = planned["phrase"]
+        source = planned["source"]
+        if es_result.get("error"):
+            logger.error(f"Elasticsearch query failed for phrase '{phrase}', source '{source}': {es_result['error']}")
+            continue
 
-            es_hits = es_result.get("hits", {}).get("hits", [])
-            es_count = len(es_hits)
-            logger.info(f"Elasticsearch found: {es_count} unique tenders.")
-
-        # Add Pinecone tasks for each semantic phrase
-        for phrase in semantic_phrases:
-            # Tender names query task
-            task = query_tool.query_by_text(
-                query_text=phrase,
-                top_k=top_k,
-                score_threshold=score_threshold,
-                filter_conditions=pinecone_filters
-            )
-            pinecone_tasks.append(task)
-            task_metadata.append({
-                "phrase": phrase,
-                "source": None,
-                "index_type": "tender_names",
-                "filters": pinecone_filters
+        for hit in es_result["hits"]["hits"]:
+            match_id = hit["_id"]
+            if match_id in processed_ids:
+                continue
+            processed_ids.add(match_id)
+            metadata = hit["_source"].get("metadata", {})
+            tender_name = hit["_source"].get("title", "")
+            es_match = {
+                "id": match_id,
+                "score": hit["_score"],
+                "metadata": metadata
+            }
+            all_tender_matches.append({
+                "id": match_id,
+                "name": tender_name,
+                "organization": hit["_source"].get("organization", ""),
+                "location": metadata.get("location", ""),
+                "source": "elasticsearch",
+                "search_phrase": phrase,
+                "source_type": metadata.get("source_type")
             })
-
-            # Tender subjects query task
-            task = query_tool_subjects.query_by_text(
-                query_text=phrase,
-                top_k=top_k,
-                score_threshold=score_threshold,
-                filter_conditions=pinecone_filters
-            )
-            pinecone_tasks.append(task)
-            task_metadata.append({
-                "phrase": phrase,
-                "source": None,
-                "index_type": "tender_subjects",
-                "filters": pinecone_filters
+            combined_search_matches[match_id] = es_match
+            detailed_results.setdefault(phrase, {}).setdefault("elasticsearch", []).append({
+                "id": match_id,
+                "name": tender_name,
+                "score": hit["_score"],
+                "source": "elasticsearch",
+                "source_type": metadata.get("source_type")
             })
 
-    # Execute Pinecone queries in controlled batches to avoid rate limits
-    logger.info(f"Executing {len(pinecone_tasks)} Pinecone queries in controlled batches...")
-    
-    # Create semaphore to limit concurrent queries (adjust based on your Pinecone plan)
-    max_concurrent_queries = 10  # Adjust this based on your rate limits
-    semaphore = asyncio.Semaphore(max_concurrent_queries)
-    
-    async def execute_with_semaphore(task):
-        async with semaphore:
-            # Add small delay to further reduce rate limit risk
-            await asyncio.sleep(0.1)
-            return await task
-    
-    # Execute tasks with concurrency control
-    pinecone_results = await asyncio.gather(
-        *[execute_with_semaphore(task) for task in pinecone_tasks], 
-        return_exceptions=True
-    )
+        es_hits = es_result.get("hits", {}).get("hits", [])
+        es_count = len(es_hits)
+        source_info = f" for source: {source}" if source else ""
+        logger.info(f"Elasticsearch found: {es_count} unique tenders{source_info}.")
+
+    # Hydrate parent tender metadata for all tender-subject matches in bulk
+    parent_ids = {
+        match["metadata"].get("tender_id")
+        for result, planned in zip(pinecone_results, task_metadata)
+        if planned["index_type"] == "tender_subjects" and isinstance(result, dict)
+        for match in result.get("matches", [])
+    }
+    parent_ids = [tender_id for tender_id in parent_ids if tender_id and tender_id not in processed_ids]
+    parent_metadata = await hydrate_parent_metadata(query_tool, parent_ids)
 
-    # Process results
+    # Process Pinecone results
     for i, (result, metadata) in enumerate(zip(pinecone_results, task_metadata)):
         if isinstance(result, Exception):
             logger.error(f"Pinecone query failed for phrase '{metadata['phrase']}', source '{metadata['source']}', index '{metadata['index_type']}': {result}")
@@ -511,24 +537,15 @@ async def perform_tender_search(
                         logger.warning(f"Skipping tender subject match {match_id} - missing tender_id")
                         continue
 
-                    # Fetch complete tender metadata from default index
-                    try:
-                        default_index_results = await query_tool.query_by_id(
-                            id=tender_id,
-                            top_k=1,
-                            filter_conditions=metadata["filters"]
-                        )
-                        if default_index_results.get("matches"):
-                            default_metadata = default_index_results["matches"][0]["metadata"]
-                            # Merge metadata, preferring subject match metadata for specific fields
-                            match_metadata.update({
-                                "name": default_metadata.get("name", match_metadata.get("name", "")),
-                                "organization": default_metadata.get("organization", match_metadata.get("organization", "")),
-                                "location": default_metadata.get("location", match_metadata.get("location", "")),
-                                "source_type": default_metadata.get("source_type", match_metadata.get("source_type", ""))
-                            })
-                    except Exception as e:
-                        logger.warning(f"Failed to fetch complete metadata for tender {tender_id}: {e}")
+                    # Merge complete tender metadata from the default index
+                    default_metadata = parent_metadata.get(tender_id)
+                    if default_metadata:
+                        match_metadata.update({
+                            "name": default_metadata.get("name", match_metadata.get("name", "")),
+                            "organization": default_metadata.get("organization", match_metadata.get("organization", "")),
+                            "location": default_metadata.get("location", match_metadata.get("location", "")),
+                            "source_type": default_metadata.get("source_type", match_metadata.get("source_type", ""))
+                        })
 
                     # Add the tender subject match
                     all_tender_matches.append({
@@ -3,7 +3,8 @@ import logging
 from typing import Any, Dict, List, Optional
 from minerva.core.models.extensions.tenders.tender_analysis import AnalysisCriteria
 from minerva.core.models.user import User
-from minerva.tasks.services.analyze_tender_files import ElasticsearchConfig, RAGManager
+from minerva.tasks.services.analyze_tender_files import LOCATION_RAG_QUERY, ElasticsearchConfig, RAGManager
+from minerva.core.services.vectorstore.pinecone.query import QueryConfig, QueryTool
 from minerva.core.database.database import db
 import psutil, os
 
@@ -17,6 +18,36 @@ def log_mem(tag: str = ""):
     except Exception as mem_exc:
         logger.debug(f"Unable to log memory usage for tag '{tag}': {mem_exc}")
 
+async def build_criteria_query_vectors(
+    criteria: List[AnalysisCriteria],
+    rag_index_name: str,
+    embedding_model: str
+) -> Dict[str, List[float]]:
+    """
+    Embed every criterion, subcriterion and the location query once for an analysis run.
+    The criteria are the same for every tender, so the vectors are reused by each
+    per-tender criteria analysis instead of being re-embedded.
+    """
+    query_texts = [LOCATION_RAG_QUERY]
+    for criterion in criteria or []:
+        query_texts.append(criterion.description)
+        query_texts.extend(criterion.subcriteria or [])
+    query_texts = list(dict.fromkeys(text for text in query_texts if text))
+
+    try:
+        query_tool = QueryTool(config=QueryConfig(
+            index_name=rag_index_name,
+            namespace="",
+            embedding_model=embedding_model
+        ))
+        vectors = await query_tool.create_query_embeddings(query_texts)
+        logger.info(f"Pre-computed {len(vectors)} criteria query embeddings")
+        return dict(zip(query_texts, vectors))
+    except Exception as e:
+        # Per-tender analysis falls back to embedding queries on demand
+        logger.error(f"Error pre-computing criteria query embeddings: {str(e)}", exc_info=True)
+        return {}
+
 async def perform_criteria_analysis(
     tender_pinecone_id: str,
     rag_index_name: str,
@@ -30,7 +61,8 @@ async def perform_criteria_analysis(
     include_vector_results: bool = False,
     use_elasticsearch: bool = False,
     language: str = "polish",
-    original_tender_metadata: Optional[Dict[str, Any]] = None
+    original_tender_metadata: Optional[Dict[str, Any]] = None,
+    query_vectors: Optional[Dict[str, List[float]]] = None
 ) -> Dict[str, Any]:
     rag_manager = None
     try:
@@ -61,7 +93,8 @@ async def perform_criteria_analysis(
             current_user=current_user,
             criteria=criteria,
             include_vector_results=include_vector_results,
-            original_tender_metadata=original_tender_metadata
+            original_tender_metadata=original_tender_metadata,
+            query_vectors=query_vectors
         )
         
         logger.info(f"[{tender_pinecone_id}] Completed criteria and location analysis")
@@ -2,6 +2,7 @@ from datetime import datetime
 import logging
 from typing import Any, Dict, Optional
 from minerva.core.models.user import User
+from minerva.core.utils.single_flight import tender_single_flight
 from minerva.tasks.services.analyze_tender_files import RAGManager
 from minerva.core.database.database import db
 import psutil, os
@@ -24,6 +25,39 @@ async def generate_tender_description(
     current_user: Optional[User] = None,
     save_results: bool = False,
     language: str = "polish"
+) -> Dict[str, Any]:
+    """
+    Generate a tender description from its indexed files. Analyses sharing an
+    extraction (same tender_pinecone_id) also share one generation per language.
+    """
+    async def generate():
+        return await _generate_tender_description(
+            tender_pinecone_id=tender_pinecone_id,
+            rag_index_name=rag_index_name,
+            embedding_model=embedding_model,
+            analysis_id=analysis_id,
+            current_user=current_user,
+            save_results=save_results,
+            language=language
+        )
+
+    if save_results:
+        return await generate()
+
+    return await tender_single_flight.run(
+        f"description:{rag_index_name}:{tender_pinecone_id}:{language}",
+        generate,
+        shareable=lambda res: res.get("status") == "success"
+    )
+
+async def _generate_tender_description(
+    tender_pinecone_id: str,
+    rag_index_name: str,
+    embedding_model: str,
+    analysis_id: Optional[str] = None,
+    current_user: Optional[User] = None,
+    save_results: bool = False,
+    language: str = "polish"
 ) -> Dict[str, Any]:
     rag_manager = None
     try:
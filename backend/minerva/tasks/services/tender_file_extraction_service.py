@@ -2,13 +2,15 @@ import asyncio
 from datetime import datetime
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from uuid import uuid4
 from bson import ObjectId
 from minerva.api.routes.retrieval_routes import sanitize_id
-from minerva.core.helpers.s3_upload import upload_file_to_s3
+from minerva.core.helpers.s3_upload import upload_file_to_s3_async
 from minerva.core.models.extensions.tenders.tender_analysis import FilterStage, FilteredTenderAnalysisResult, TenderAnalysis
 from minerva.core.models.user import User
+from minerva.core.services.browser_pool import PooledBrowser, browser_pool
+from minerva.core.utils.single_flight import tender_single_flight
 from minerva.tasks.services.analyze_tender_files import RAGManager
 from minerva.core.database.database import db
 from minerva.tasks.sources.source_types import TenderSourceType
@@ -31,6 +33,7 @@ def log_mem(tag: str = ""):
 
 # Configurable max parallel file tasks (per tender)
 MAX_PARALLEL_FILE_TASKS = int(os.getenv("MAX_PARALLEL_FILE_TASKS", "28"))
+EZAMAWIAJACY_STORAGE_STATE_KEY = "ezamawiajacy"
 
 # Helper function to sanitize filenames
 
@@ -54,7 +57,56 @@ def get_file_semaphore(size_bytes: Optional[int]) -> asyncio.Semaphore:
     return asyncio.Semaphore(MAX_PARALLEL_FILE_TASKS)
 
 async def perform_file_extraction(
-    playwright_browser: Browser,
+    playwright_browser: Union[Browser, PooledBrowser],
+    source_manager: TenderSourceManager,
+    tender: Dict[str, Any],
+    rag_index_name: str,
+    embedding_model: str,
+    analysis_id: str,
+    current_user: Optional[User] = None,
+    save_results: bool = False,
+    check_existing_analysis: bool = False,
+    use_elasticsearch: bool = False,
+) -> Dict[str, Any]:
+    """
+    Download, extract and embed a tender's files. Concurrent calls for the same
+    tender and RAG index (e.g. from different analyses in one nightly run) are
+    collapsed into one: the first caller does the work, the others reuse its
+    result with file ownership rewritten to their user.
+    """
+    async def extract():
+        return await _extract_tender_files(
+            playwright_browser=playwright_browser,
+            source_manager=source_manager,
+            tender=tender,
+            rag_index_name=rag_index_name,
+            embedding_model=embedding_model,
+            analysis_id=analysis_id,
+            current_user=current_user,
+            save_results=save_results,
+            check_existing_analysis=check_existing_analysis,
+            use_elasticsearch=use_elasticsearch
+        )
+
+    tender_url = tender.get('id')
+    # Saved extractions are per-analysis records, never shared
+    if save_results or not tender_url:
+        return await extract()
+
+    result = await tender_single_flight.run(
+        f"extraction:{rag_index_name}:{embedding_model}:{int(use_elasticsearch)}:{tender_url}",
+        extract,
+        shareable=lambda res: res.get("status") == "success"
+    )
+
+    owner_id = str(current_user.id) if current_user else "system"
+    for file in result.get("processed_files", {}).get("successful_files", []):
+        file["owner_id"] = owner_id
+    result["original_match"] = tender
+    return result
+
+async def _extract_tender_files(
+    playwright_browser: Union[Browser, PooledBrowser],
     source_manager: TenderSourceManager,
     tender: Dict[str, Any],
     rag_index_name: str,
@@ -147,7 +199,20 @@ async def perform_file_extraction(
                     # Memory log after successful extraction and upload
                     log_mem(f"{tender_id_str} perform_file_extraction:end")
                     return result
-        context = await playwright_browser.new_context()
+        # Pooled browsers keep the ezamawiajacy login between tenders
+        reuse_login = (
+            isinstance(playwright_browser, PooledBrowser)
+            and tender.get("source_type") == TenderSourceType.EZAMAWIAJACY.value
+        )
+        logged_in = reuse_login and browser_pool.get_storage_state(EZAMAWIAJACY_STORAGE_STATE_KEY) is not None
+        if reuse_login:
+            context = await playwright_browser.new_context(
+                storage_state_key=EZAMAWIAJACY_STORAGE_STATE_KEY, source=tender.get("source_type")
+            )
+        elif isinstance(playwright_browser, PooledBrowser):
+            context = await playwright_browser.new_context(source=tender.get("source_type"))
+        else:
+            context = await playwright_browser.new_context()
         
         logger.info(f"[{tender_id_str}] Started file extraction process.")
         
@@ -180,13 +245,17 @@ async def perform_file_extraction(
                 # Handle login
                 username = os.getenv("ONEPLACE_EMAIL")
                 password = os.getenv("ONEPLACE_PASSWORD")
-                if username and password:
+                if logged_in:
+                    logger.info(f"[{tender_id_str}] Reusing saved login for source {source_type_str}")
+                elif username and password:
                     login_page = await context.new_page()
                     try:
                         logger.info(f"[{tender_id_str}] Attempting login for source {source_type_str}")
                         await ez_extractor.login(login_page, username, password)
                         logger.info(f"[{tender_id_str}] Login successful.")
                         await login_page.close()
+                        if reuse_login:
+                            await browser_pool.save_storage_state(EZAMAWIAJACY_STORAGE_STATE_KEY, context)
                     except Exception as login_err:
                         logger.warning(f"[{tender_id_str}] Login failed: {login_err}. Proceeding without login.")
                         await login_page.close()
@@ -223,6 +292,26 @@ async def perform_file_extraction(
             context=context,
             details_url=details_url
         )
+        if logged_in and getattr(tender_extractor, "login_prompted", False):
+            # The site expired or revoked the saved session; stop handing it to other tenders
+            logger.warning(f"[{tender_id_str}] Saved login for source {source_type_str} is no longer valid, logging in again")
+            browser_pool.forget_storage_state(EZAMAWIAJACY_STORAGE_STATE_KEY)
+            if not processed_files and username and password:
+                # The detail page's own login did not get us the attachments; retry on a fresh login
+                login_page = await context.new_page()
+                try:
+                    await ez_extractor.login(login_page, username, password)
+                except Exception as login_err:
+                    logger.warning(f"[{tender_id_str}] Login failed: {login_err}. Proceeding without login.")
+                else:
+                    logger.info(f"[{tender_id_str}] Login successful.")
+                    await browser_pool.save_storage_state(EZAMAWIAJACY_STORAGE_STATE_KEY, context)
+                    processed_files = await tender_extractor.extract_files_from_detail_page(
+                        context=context,
+                        details_url=details_url
+                    )
+                finally:
+                    await login_page.close()
         # Memory log after files extracted (raw)
         log_mem(f"{tender_id_str} perform_file_extraction:after_file_download")
         
@@ -299,7 +388,7 @@ async def perform_file_extraction(
 
                     # Use original filename for blob storage to maintain consistency
                     logger.info(f"[{tender_id_str}] Uploading file '{filename}' ({bytes_len} bytes) to S3")
-                    blob_url = upload_file_to_s3(filename, original_bytes)
+                    blob_url = await upload_file_to_s3_async(filename, original_bytes)
 
                     # Build record
                     record = {
@@ -1,15 +1,22 @@
+import asyncio
 import logging
-import pprint
-from typing import Dict, List, Protocol, Any
+import os
+from functools import partial
+from typing import Dict, Iterable, List, Protocol, Any, Set
 from datetime import datetime
 from elasticsearch import helpers
 from minerva.core.models.request.tender_extract import ExtractionRequest, Tender
-from minerva.core.services.vectorstore.helpers import safe_chunk_text
+from minerva.core.services.vectorstore.helpers import safe_token_chunks
 from minerva.core.services.vectorstore.text_chunks import ChunkingConfig, TextChunker
 from minerva.core.services.vectorstore.pinecone.upsert import EmbeddingConfig, EmbeddingTool
 from minerva.core.services.keyword_search.elasticsearch import es_client
 from dataclasses import dataclass
 
+# Ids per mget request when checking which tenders Elasticsearch already has
+ES_EXISTS_BATCH_SIZE = int(os.getenv("ES_EXISTS_BATCH_SIZE", "1000"))
+# Ids per Pinecone fetch; ids travel in the query string, so keep batches small
+PINECONE_EXISTS_BATCH_SIZE = int(os.getenv("PINECONE_EXISTS_BATCH_SIZE", "100"))
+
 
 @dataclass
 class TenderInsertConfig:
@@ -165,7 +172,7 @@ class TenderInsertService:
         logging.info("Starting tender extraction and insertion process...")
         extraction_result = await self.tender_source.execute(extraction_request.dict())
 
-        all_tenders = extraction_result["tenders"]
+        all_tenders = self._dedupe_tenders(extraction_result["tenders"])
         logging.info(f"Extracted {len(all_tenders)} tenders")
 
         # Track tenders with empty and non-empty tender_subject
@@ -226,16 +233,33 @@ class TenderInsertService:
             }
         }
     
+    @staticmethod
+    def _dedupe_tenders(tenders: List[Tender]) -> List[Tender]:
+        """Drop repeated details_url entries (e.g. a tender listed on two result pages), keeping the first"""
+        seen = set()
+        unique = []
+        for tender in tenders:
+            if tender.details_url in seen:
+                continue
+            seen.add(tender.details_url)
+            unique.append(tender)
+        if len(unique) < len(tenders):
+            logging.info(f"Dropped {len(tenders) - len(unique)} duplicate tenders from extraction result")
+        return unique
+
     async def _process_for_pinecone(self, all_tenders: List[Tender]) -> Dict:
         """Process tenders for Pinecone vector embeddings"""
         logging.info("Preparing items for embedding...")
         embedding_items = []
         subject_embedding_items = []
-        
+
+        existing_ids = await self.existing_in_pinecone(tender.details_url for tender in all_tenders)
+        if existing_ids:
+            logging.info(f"Skipping {len(existing_ids)} tenders that already exist in Pinecone.")
+
         for tender in all_tenders:
             tender_id = tender.details_url
-            if self.check_if_exists(tender_id):
-                logging.info(f"Skipping tender with ID {tender_id} since it already exists in Pinecone.")
+            if tender_id in existing_ids:
                 continue
 
             # Process main tender data
@@ -249,14 +273,15 @@ class TenderInsertService:
             embedding_items.append(item)
 
             # Process tender subject if available and subject embedding is configured
-            pprint.pprint(tender)
             if hasattr(tender, 'tender_subject') and tender.tender_subject and self.subject_embedding_tool:
                 logging.info(f"Processing tender subject for tender {tender_id}")
                 # Split subject text into chunks (similar to upload_file_content)
                 
-                for i, chunk in enumerate(safe_chunk_text(tender.tender_subject, self.chunker, self.subject_embedding_tool.config.embedding_model)):
+                for i, text_chunk in enumerate(safe_token_chunks(tender.tender_subject, self.chunker, self.subject_embedding_tool.config.embedding_model)):
+                    chunk = text_chunk.text
                     subject_item = {
                         "input": chunk,
+                        "token_count": text_chunk.token_count,
                         "metadata": {
                             "tender_id": tender_id,
                             "chunk_index": i,
@@ -323,11 +348,13 @@ class TenderInsertService:
         try:
             # Prepare documents for bulk ingestion
             actions = []
+            existing_ids = await self.existing_in_elasticsearch(tender.details_url for tender in all_tenders)
+            if existing_ids:
+                logging.info(f"Skipping {len(existing_ids)} tenders that already exist in Elasticsearch.")
+
             for tender in all_tenders:
-                # Skip existing tenders - use the same check as in Pinecone
                 tender_id = tender.details_url
-                if await self.check_if_elasticsearch_exists(tender_id):
-                    logging.info(f"Skipping tender with ID {tender_id} since it already exists in Elasticsearch.")
+                if tender_id in existing_ids:
                     continue
                 
                 # Safely get name and organization with defaults
@@ -343,9 +370,7 @@ class TenderInsertService:
                 tender_dict = tender.dict() if hasattr(tender, 'dict') else {}
                 
                 # Remove tender_subject from metadata
-                if 'tender_subject' in tender_dict:
-                    logging.info(f"Removing tender_subject from Elasticsearch metadata for tender {tender_id}")
-                    del tender_dict['tender_subject']
+                tender_dict.pop('tender_subject', None)
                 
                 # Make sure we have the initiation_date
                 initiation_date = tender_dict.get('initiation_date', '')
@@ -359,10 +384,11 @@ class TenderInsertService:
                     "metadata": tender_dict  # Use the EXACT SAME metadata structure as Pinecone
                 }
                 
-                # Log the document to help with debugging
-                logging.info(f"Preparing ES document for tender {tender_id}: {doc}")
-                
+                logging.debug(f"Preparing ES document for tender {tender_id}: {doc}")
+
                 actions.append({
+                    # "create" makes ES reject ids indexed since the existence check instead of overwriting them
+                    "_op_type": "create",
                     "_index": self.es_index_name,
                     "_id": tender_id,  # Use same ID as in Pinecone for consistency
                     "_source": doc
@@ -373,8 +399,12 @@ class TenderInsertService:
                 return {"stored_count": 0, "failed_count": 0}
             
             # Perform bulk ingestion
-            success, failed = await helpers.async_bulk(es_client, actions, stats_only=True)
-            logging.info(f"Elasticsearch ingestion: {success} succeeded, {failed} failed")
+            success, errors = await helpers.async_bulk(es_client, actions, raise_on_error=False)
+            duplicates = sum(1 for error in errors if error.get("create", {}).get("status") == 409)
+            failed = len(errors) - duplicates
+            logging.info(f"Elasticsearch ingestion: {success} succeeded, {duplicates} already existed, {failed} failed")
+            if failed:
+                logging.warning(f"First Elasticsearch bulk error: {next(e for e in errors if e.get('create', {}).get('status') != 409)}")
             return {"stored_count": success, "failed_count": failed}
                     
         except Exception as e:
@@ -382,41 +412,51 @@ class TenderInsertService:
             logging.exception("Detailed exception")  # Add full traceback for better debugging
             return {"error": str(e), "stored_count": 0, "failed_count": 0}
     
+    async def existing_in_pinecone(self, tender_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of tender_ids already stored in Pinecone, fetched in batches"""
+        if self.config.skip_pinecone:
+            return set()
+        ids = list(dict.fromkeys(tender_ids))
+        existing = set()
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(ids), PINECONE_EXISTS_BATCH_SIZE):
+            batch = ids[start:start + PINECONE_EXISTS_BATCH_SIZE]
+            try:
+                fetch_result = await loop.run_in_executor(None, partial(self.embedding_tool.index.fetch, ids=batch))
+                existing.update(fetch_result.vectors.keys())
+            except Exception as e:
+                # Same as before: an unverifiable tender is treated as new
+                logging.error(f"Error checking {len(batch)} tenders in Pinecone: {str(e)}")
+        logging.info(f"Checked {len(ids)} tenders in Pinecone, {len(existing)} already exist")
+        return existing
+
+    async def existing_in_elasticsearch(self, tender_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of tender_ids already indexed in Elasticsearch, using mget without _source"""
+        if self.config.skip_elasticsearch:
+            return set()
+        ids = list(dict.fromkeys(tender_ids))
+        existing = set()
+        for start in range(0, len(ids), ES_EXISTS_BATCH_SIZE):
+            batch = ids[start:start + ES_EXISTS_BATCH_SIZE]
+            try:
+                response = await es_client.mget(index=self.es_index_name, ids=batch, source=False)
+                existing.update(doc["_id"] for doc in response.get("docs", []) if doc.get("found"))
+            except Exception as e:
+                # Not fatal: "create" bulk actions still reject tenders that do exist
+                logging.error(f"Error checking {len(batch)} tenders in Elasticsearch: {str(e)}")
+        logging.info(f"Checked {len(ids)} tenders in Elasticsearch, {len(existing)} already exist")
+        return existing
+
     def check_if_exists(self, tender_id: str) -> bool:
         """Check if tender with given ID already exists in Pinecone"""
         if self.config.skip_pinecone:
             return False
-            
-        logging.info(f"Checking if tender with ID {tender_id} already exists in Pinecone...")
-
-        # Use Pinecone's 'fetch' API to see if that ID is present
         fetch_result = self.embedding_tool.index.fetch(ids=[tender_id])
-        exists = tender_id in fetch_result.vectors
-
-        if exists:
-            logging.info(f"Tender with ID {tender_id} already exists in Pinecone.")
-        else:
-            logging.info(f"Tender with ID {tender_id} does not exist in Pinecone.")
+        return tender_id in fetch_result.vectors
 
-        return exists
-    
     async def check_if_elasticsearch_exists(self, tender_id: str) -> bool:
         """Check if tender with given ID already exists in Elasticsearch"""
-        if self.config.skip_elasticsearch:
-            return False
-            
-        logging.info(f"Checking if tender with ID {tender_id} already exists in Elasticsearch...")
-        
-        try:
-            result = await es_client.exists(index=self.es_index_name, id=tender_id)
-            if result:
-                logging.info(f"Tender with ID {tender_id} already exists in Elasticsearch.")
-            else:
-                logging.info(f"Tender with ID {tender_id} does not exist in Elasticsearch.")
-            return result
-        except Exception as e:
-            logging.error(f"Error checking if tender exists in Elasticsearch: {str(e)}")
-            return False
+        return tender_id in await self.existing_in_elasticsearch([tender_id])
     
     async def scrape_tenders(self, extraction_request: ExtractionRequest) -> List[Dict]:
         """Get raw tender data without processing"""
@@ -7,8 +7,8 @@ from typing import Dict, List, Optional, Tuple
 
 from bson import ObjectId
 import json_repair
-from minerva.core.helpers.s3_upload import upload_file_to_s3
-from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult
+from minerva.core.helpers.s3_upload import upload_file_to_s3_async
+from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult, parse_submission_deadline
 from minerva.core.database.database import db
 from minerva.core.models.file import File
 from minerva.core.models.request.ai import LLMSearchRequest
@@ -90,7 +90,7 @@ class TenderMonitoringService:
 
 
                         bytes_to_upload: bytes | bytearray = original_bytes if isinstance(original_bytes, (bytes, bytearray)) and original_bytes is not None else file_content
-                        blob_url = upload_file_to_s3(filename, bytes_to_upload)
+                        blob_url = await upload_file_to_s3_async(filename, bytes(bytes_to_upload))
                         _, file_extension = os.path.splitext(filename)
                         new_tender_files.append(
                             File(filename=filename, 
@@ -179,6 +179,7 @@ class TenderMonitoringService:
                 }
                 if new_submission_deadline:
                     update_fields["$set"]["tender_metadata.submission_deadline"] = new_submission_deadline
+                    update_fields["$set"]["submission_deadline_at"] = parse_submission_deadline(new_submission_deadline)
 
                 db["tender_analysis_results"].update_one(
                     {"_id": ObjectId(tender_id_str)},
@@ -7,7 +7,7 @@ from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 import re
 from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
 from minerva.core.utils.date_standardizer import DateStandardizer
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
@@ -214,8 +214,7 @@ class BazaKonkurencyjnosciTenderExtractor:
                 start_dt = None
 
         tenders = []
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             try:
                 context = await browser.new_context()
                 page = await context.new_page()
@@ -584,8 +583,7 @@ class BazaKonkurencyjnosciTenderExtractor:
 
         updates_found: Dict[str, List[Tuple[str, bytes, str, str]]] = {}
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             try:
                 context = await browser.new_context()
 
@@ -9,7 +9,8 @@ from typing import Any, Dict, List, Optional
 from urllib.parse import urljoin
 
 from pydantic import BaseModel, Field
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from minerva.core.services.browser_pool import browser_pool
 
 # ---------------------------------------------------------------------------
 # Generic tender model (identical to Oferent extractor)
@@ -310,8 +311,7 @@ class BiznesPolskaReportExtractor:  # pylint: disable=too-many-public-methods
 
         tenders: list[Tender] = []
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"])
+        async with browser_pool.browser(source="biznespolska") as browser:
             try:
                 context = await browser.new_context()
                 context.set_default_timeout(15_000)
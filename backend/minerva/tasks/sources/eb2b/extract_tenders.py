@@ -7,7 +7,8 @@ from typing import Dict, List, Optional, Set, Tuple
 from uuid import uuid4
 
 from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import Page
+from minerva.core.services.browser_pool import browser_pool
 from minerva.core.utils.date_standardizer import DateStandardizer
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
@@ -68,8 +69,7 @@ class Eb2bTenderExtractor:
         browser = None
 
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            async with browser_pool.browser(source=self.source_type) as browser:
                 context = await browser.new_context()
                 page = await context.new_page()
 
@@ -672,8 +672,7 @@ class Eb2bTenderExtractor:
         base_temp_dir.mkdir(parents=True, exist_ok=True)
 
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            async with browser_pool.browser(source=self.source_type) as browser:
                 context = await browser.new_context()
 
                 for tender in tenders_to_monitor:
@@ -7,7 +7,7 @@ from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
 from minerva.core.utils.date_standardizer import DateStandardizer
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
@@ -176,8 +176,7 @@ class EproPublicoMainTenderExtractor:
             logging.info(f"{self.source_type}: Starting extraction with no start_date.")
         browser = None
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            async with browser_pool.browser(source=self.source_type) as browser:
                 context = await browser.new_context()
                 tenders = []
                 current_page = 1
@@ -299,8 +298,7 @@ class EproPublicoMainTenderExtractor:
         # We will create a single browser instance for all checks
         browser = None
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            async with browser_pool.browser(source=self.source_type) as browser:
                 context = await browser.new_context()
 
                 for tender in tenders_to_monitor:
@@ -7,7 +7,7 @@ from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 import re
 
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
 
 from minerva.core.utils.date_standardizer import DateStandardizer
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
@@ -204,8 +204,7 @@ class EproPublicoMainTenderExtractor:
         else:
             logging.info("Starting extraction with no start_date.")
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             context = await browser.new_context()
 
             tenders = []
@@ -9,6 +9,7 @@ from typing import Any, Dict, Optional, List, Tuple
 from urllib.parse import urljoin, urlparse
 from uuid import uuid4
 from playwright.async_api import Page, Response
+from minerva.core.services.browser_pool import browser_pool
 from playwright_stealth import stealth_async
 from minerva.core.services.vectorstore.file_content_extract.base import ExtractorRegistry
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
@@ -29,6 +30,8 @@ class EzamawiajacyTenderExtractor:
         # test
         # self.base_list_url = "https://oneplace.marketplanet.pl/web/panel/przetargi/-/notice/list/active?_opUserNoticesPortlet_navigation=active&_opUserNoticesPortlet_orderByCol=start-date&_opUserNoticesPortlet_orderByType=desc&_opUserNoticesPortlet_resetCur=false&_opUserNoticesPortlet_delta=12&_opUserNoticesPortlet_cur=5"
         self.source_type = source_type
+        # Set when the last detail page asked for a login, i.e. the context's session was not valid
+        self.login_prompted = False
 
     async def _goto_with_retry(self, page, url: str, wait_until: str, timeout: int, retries: int = 2, purpose: str = "navigation"):
         for attempt in range(retries + 1):
@@ -192,8 +195,7 @@ class EzamawiajacyTenderExtractor:
         tenders = []
         browser = None
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            async with browser_pool.browser(source=self.source_type) as browser:
                 context = await browser.new_context()
                 # Log in once before scraping listings.
                 login_page = await context.new_page()
@@ -484,6 +486,7 @@ class EzamawiajacyTenderExtractor:
         Also extracts the Ogłoszenie page as a virtual file if present.
         """
         processed_files: list = []
+        self.login_prompted = False
         extraction_service = FileExtractionService()
 
         tmp_dir = Path.cwd() / "temp_downloads" / str(uuid4())
@@ -503,6 +506,7 @@ class EzamawiajacyTenderExtractor:
                     "[href^='https://oneplace.marketplanet.pl/web/panel/redirect']"
                 )
                 if await login_link.count():
+                    self.login_prompted = True
                     async with page.expect_navigation():
                         await login_link.first.click()
                     await self.handle_login_for_detail_extraction(page, details_url)
@@ -4,7 +4,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import asyncio
 import random
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from minerva.core.services.browser_pool import browser_pool
 from bs4 import BeautifulSoup
 from dataclasses import dataclass
 from minerva.core.models.request.tender_extract import ExtractorMetadata
@@ -596,8 +597,7 @@ class HistoricalTenderExtractor:
         
         logging.info(f"Starting historical tender extraction from {start_date} to {end_date}")
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             context = await browser.new_context()
             page = await context.new_page()
             
@@ -13,7 +13,9 @@ import httpx
 from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult
 from minerva.core.services.ai_pick_main_doc import ai_pick_main_doc
 from minerva.core.services.vectorstore.pinecone.query import QueryConfig, QueryTool
-from playwright.async_api import async_playwright, BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+from minerva.core.services.browser_pool import browser_pool
+from minerva.core.services.http_fetcher import http_fetcher
 from minerva.core.utils.date_standardizer import DateStandardizer
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
@@ -264,6 +266,25 @@ class TenderExtractor:
                             else:
                                 url = href
                             name = (await link.inner_text()).strip()
+
+                            # Document links are plain endpoints - skip the click when HTTP works
+                            http_path = await http_fetcher.download(
+                                url, temp_dir_path, self.source_type, context, fallback_filename=name
+                            )
+                            if http_path is not None:
+                                if http_path.stat().st_size > 100:
+                                    file_results = await extraction_service.process_file_async(http_path)
+                                    for file_content, filename, preview_chars, original_bytes, original_filename in file_results:
+                                        if len(file_content) > 100:
+                                            processed_files.append((
+                                                file_content, filename, url, preview_chars, original_bytes
+                                            ))
+                                            document_count += 1
+                                else:
+                                    logging.warning(f"{self.source_type}: Downloaded file '{http_path.name}' is too small.")
+                                    http_path.unlink(missing_ok=True)
+                                continue
+
                             download_successful = False
                             try:
                                 async with page.expect_download(timeout=30000) as download_info: # Increased timeout
@@ -671,8 +692,7 @@ class TenderExtractor:
         start_dt = None
         if start_date:
             start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             context = await browser.new_context()
             page = await context.new_page()
             try:
@@ -923,8 +943,7 @@ class TenderExtractor:
 
         extraction_service = FileExtractionService()
         # 3) For each matched notice, open the detail page of that tender
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             context = await browser.new_context()
 
             for notice_item in matched_notices:
@@ -1146,6 +1165,17 @@ class TenderExtractor:
         link_text_for_log = await link.inner_text()
 
         try:
+            href = await link.get_attribute("href")
+            if href:
+                url = urllib.parse.urljoin("https://ezamowienia.gov.pl", href)
+                http_path = await http_fetcher.download(
+                    url, temp_dir, self.source_type, page.context, fallback_filename="document"
+                )
+                if http_path is not None:
+                    if http_path.stat().st_size > 100:
+                        results.extend(await extraction_service.process_file_async(http_path))
+                    return results
+
             download_successful = False
             download = None # Initialize download variable
             async with page.expect_download(timeout=30000) as download_info: # Increased timeout for download event
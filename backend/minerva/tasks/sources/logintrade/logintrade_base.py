@@ -7,7 +7,7 @@ from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
 
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 
@@ -252,9 +252,8 @@ class LogintradeBase:
         # Reuse the same approach as in extract_files_from_detail_page for file processing
         # extraction_service = AssistantsFileExtractionService()
         extraction_service = FileExtractionService()
-        async with async_playwright() as p:
+        async with browser_pool.browser(source=self.source_type) as browser:
             logging.debug("[LoginTradeExtractor.find_updates] Initializing Playwright browser")
-            browser = await p.chromium.launch(headless=True)
             context = await browser.new_context()
 
             try:
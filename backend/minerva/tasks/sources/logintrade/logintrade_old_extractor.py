@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Dict
 
 from minerva.core.services.vectorstore.pinecone.query import QueryConfig, QueryTool
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
 
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
 
@@ -120,9 +120,7 @@ class LogintradeOldExtractor:
             except ValueError:
                 logging.error(f"[LoginTradeTenderExtractor] Invalid date format for 'start_date': {start_date_str}")
 
-        async with async_playwright() as p:
-            # Launch the browser
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             try:
                 context = await browser.new_context()
                 page = await context.new_page()
@@ -6,7 +6,8 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from urllib.parse import urljoin
 from minerva.core.models.request.tender_extract import ExtractorMetadata
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from minerva.core.services.browser_pool import browser_pool
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 
@@ -492,11 +493,7 @@ class OferentReportExtractor:
         report_url = f"{self.base_url}/konto_raporty/{target_date}/"
         
         tenders = []
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage']  # Better stability
-            )
+        async with browser_pool.browser(source=self.source_type) as browser:
             try:
                 context = await browser.new_context()
                 
@@ -7,7 +7,7 @@ from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 from minerva.core.services.vectorstore.pinecone.query import QueryConfig, QueryTool
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
 
 class PGETenderExtractor:
@@ -136,8 +136,7 @@ class PGETenderExtractor:
         current_page = 1
 
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
+            async with browser_pool.browser(source=self.source_type) as browser:
                 context = await browser.new_context()
                 page = await context.new_page()
                 logging.info(f"{self.source_type}: Navigating to {self.base_list_url}")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime
 import os
@@ -17,7 +18,9 @@ from minerva.core.services.vectorstore.file_content_extract.base import Extracto
 from minerva.tasks.sources.helpers import extract_bzp_plan_fields, scrape_bzp_budget_row
 
 from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
+from minerva.core.services.http_fetcher import http_fetcher
+from minerva.core.services.rate_limiter import host_limiter
 from minerva.core.utils.date_standardizer import DateStandardizer
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
@@ -46,7 +49,10 @@ class PlatformaZakupowaTenderExtractor:
     async def _goto_with_retry(self, page, url: str, wait_until: str, timeout: int, retries: int = 2, purpose: str = "navigation"):
         for attempt in range(retries + 1):
             try:
-                await page.goto(url, wait_until=wait_until, timeout=timeout)
+                async with host_limiter.slot(url, self.source_type) as slot:
+                    response = await page.goto(url, wait_until=wait_until, timeout=timeout)
+                    if response is not None:
+                        slot.record(response.status, response.headers.get("retry-after"))
                 return
             except Exception as e:
                 if attempt < retries:
@@ -56,9 +62,49 @@ class PlatformaZakupowaTenderExtractor:
                     logging.error(f"{self.source_type}: Timeout/error loading URL: {url} for {purpose}")
                     raise e
 
+    async def _load_detail_html(self, context, url: str, timeout: int, purpose: str) -> str:
+        """Detail pages are server-rendered: plain HTTP first, a browser page only as fallback"""
+        html = await http_fetcher.get_html(url, self.source_type, context, must_contain="proceeding-info")
+        if html is not None:
+            return html
+        page = await context.new_page()
+        try:
+            await self._goto_with_retry(page, url, wait_until='domcontentloaded', timeout=timeout, retries=3, purpose=purpose)
+            return await page.content()
+        finally:
+            await page.close()
+
+    def _parse_attachments(self, html: str, base_url: str) -> List[Dict[str, str]]:
+        """Same rows as the '#allAttachmentsTable' scrape done in the browser"""
+        files = []
+        soup = BeautifulSoup(html, 'html.parser')
+        for row in soup.select('#allAttachmentsTable tbody tr'):
+            name_cell = row.select_one('td:first-child')
+            download_link = row.select_one('a.proceeding-file-download')
+            if name_cell and download_link and download_link.get('href'):
+                filename = re.sub(r'^[^a-zA-Z0-9]*', '', name_cell.get_text().strip()).strip()
+                files.append({
+                    "filename": filename,
+                    "downloadUrl": urllib.parse.urljoin(base_url, download_link['href'])
+                })
+        return files
+
     async def fetch_detail_info(self, context, detail_url: str) -> dict:
         """Fetch additional information from tender detail page"""
-        page = await context.new_page()
+        detail_info, _ = await self._fetch_detail_page(context, detail_url)
+        return detail_info
+
+    async def _fetch_detail_page(self, context, detail_url: str) -> Tuple[dict, Optional[str]]:
+        """Detail info parsed from the detail page, plus its HTML for further parsing (None on failure)"""
+        html = None
+        try:
+            html = await self._load_detail_html(context, detail_url, timeout=15000, purpose="detail info")
+            return self._parse_detail_info(html), html
+        except Exception as e:
+            logging.error(f"Error fetching detail info from {detail_url}: {str(e)}")
+            return self._parse_detail_info(None), html
+
+    def _parse_detail_info(self, html: Optional[str]) -> dict:
         detail_info = {
             "description": "",
             "location": "",
@@ -69,12 +115,9 @@ class PlatformaZakupowaTenderExtractor:
             "submission_deadline_detail": None
         }
         
-        try:
-            # await page.goto(detail_url, wait_until='domcontentloaded', timeout=15000)
-            await self._goto_with_retry(page, detail_url, wait_until='domcontentloaded', timeout=15000, retries=3)
-            
+        if html is not None:
             # Get basic info
-            soup = BeautifulSoup(await page.content(), 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
 
             # Get organization info from header
             org_div = soup.select_one("div.proceeding-info-list-item")
@@ -118,20 +161,108 @@ class PlatformaZakupowaTenderExtractor:
             if location_div:
                 detail_info["location"] = location_div.get_text(strip=True)
 
-        except Exception as e:
-            logging.error(f"Error fetching detail info from {detail_url}: {str(e)}")
-        finally:
-            await page.close()
-        
         return detail_info
 
+    def _build_details_file(self, html: str, details_url: str) -> Optional[Tuple]:
+        """Requirements, subject and criteria of a detail page as one text file"""
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Create content for tender details text file
+        details_content = []
+
+        # Extract requirements
+        requirements_div = soup.select_one("div#requirements")
+        if requirements_div:
+            details_content.append("=== Wymagania i specyfikacja ===")
+            details_content.append(requirements_div.get_text(strip=True))
+            details_content.append("\n")
+
+        # Extract Subject of the request content
+        subject_text = self._extract_subject_from_html(html)
+        details_content.append("=== Przedmiot zamówienia ===")
+        details_content.append(subject_text if subject_text else "")
+
+
+        # Extract Criteria and formal conditions content
+        criteria_table = soup.select_one("table.table-criterium")
+        if criteria_table:
+            details_content.append("=== Kryteria i warunki formalne ===")
+            # Extract table headers
+            headers = criteria_table.select("thead th")
+            if headers:
+                header_texts = [header.get_text(strip=True) for header in headers]
+                details_content.append("Headers: " + " | ".join(header_texts))
+                details_content.append("\n")
+
+            # Extract criteria rows
+            rows = criteria_table.select("tbody tr")
+            for row in rows:
+                cells = row.select("td")
+                if cells and len(cells) >= 4:  # Ensure we have the main columns
+                    # Extract: No., Name, Weight, Description
+                    criteria_data = []
+                    for i, cell in enumerate(cells[:4]):  # First 4 columns contain the main info
+                        cell_text = cell.get_text(strip=True)
+                        if cell_text and not cell_text.isspace():
+                            criteria_data.append(cell_text)
+
+                    if criteria_data:
+                        details_content.append(" | ".join(criteria_data))
+            details_content.append("\n")
+
+        # Save tender details as text file
+        if not details_content:
+            return None
+        tender_id = details_url.split('/')[-1]
+        details_filename = f"tender_{tender_id}_details.txt"
+        details_text = "\n\n".join(details_content)
+        details_bytes = details_text.encode('utf-8')
+        return (details_bytes, details_filename, details_url, details_text[:250], details_bytes)
+
+    async def _extract_files_via_http(
+        self,
+        context,
+        details_url: str,
+        temp_dir: Path,
+        extraction_service: FileExtractionService
+    ) -> Optional[List[Tuple]]:
+        """
+        Detail page and attachments over plain HTTP. Returns None when any
+        step fails so the caller redoes the tender in the browser.
+        """
+        html = await http_fetcher.get_html(details_url, self.source_type, context, must_contain="proceeding-info")
+        if html is None:
+            return None
+
+        processed_files = []
+        details_file = self._build_details_file(html, details_url)
+        if details_file:
+            processed_files.append(details_file)
+
+        for file_info in self._parse_attachments(html, details_url):
+            filename = file_info['filename']
+            download_url = file_info['downloadUrl']
+            temp_path = await http_fetcher.download(
+                download_url, temp_dir, self.source_type, context, filename=filename
+            )
+            if temp_path is None:
+                return None
+            file_results = await extraction_service.process_file_async(temp_path)
+            for (file_content, out_name, preview_chars, original_bytes, original_filename) in file_results:
+                processed_files.append(
+                    (file_content, out_name, download_url, preview_chars, original_bytes)
+                )
+            logging.info(f"Successfully downloaded and processed over HTTP: {filename}")
+
+        return processed_files
+
     async def extract_files_from_detail_page(
         self,
         context,
         details_url: str
     ) -> List[Tuple[bytes, str, Optional[str]]]:
         """Extract files from tender detail page"""
-        page = await context.new_page()
+        page = None
         processed_files = []
         # extraction_service = AssistantsFileExtractionService()
         extraction_service = FileExtractionService()
@@ -146,194 +277,141 @@ class PlatformaZakupowaTenderExtractor:
             
             retry_count = 0
             success = False
-            
-            # Use a specific context for BZP scraping later if needed
-            async with async_playwright() as p_bzp:
 
-                while retry_count < MAX_RETRIES and not success:
+            http_files = await self._extract_files_via_http(context, details_url, temp_dir, extraction_service)
+            if http_files is not None:
+                processed_files = http_files
+                success = True
+            else:
+                page = await context.new_page()
+            
+            while retry_count < MAX_RETRIES and not success:
+                try:
+                    # Navigate to page with increased timeout
+                    await self._goto_with_retry(page, details_url, wait_until='domcontentloaded', timeout=30000, retries=3, purpose="tender detail page")
+                    
+                    # Close the chatbot widget if present
                     try:
-                        # Add random delay to avoid rate limiting
-                        await page.wait_for_timeout(random.uniform(1000, 3000))
-                        
-                        # Navigate to page with increased timeout
-                        await self._goto_with_retry(page, details_url, wait_until='domcontentloaded', timeout=30000, retries=3, purpose="tender detail page")
-                        
-                        # Close the chatbot widget if present
-                        try:
-                            close_button = await page.query_selector('button.on-widget-close-button')
-                            if close_button:
-                                await close_button.click()
-                                await page.wait_for_timeout(1000)  # Wait for close animation
-                        except Exception as e:
-                            logging.debug(f"No chatbot close button found or error clicking it: {e}")
-                        
-                        # Extract tender ID for filenames
-                        tender_id = details_url.split('/')[-1]
-                        
-                        # First extract requirements and evaluation criteria
-                        html = await page.content()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Create content for tender details text file
-                        details_content = []
-                        
-                        # Extract requirements
-                        requirements_div = soup.select_one("div#requirements")
-                        if requirements_div:
-                            details_content.append("=== Wymagania i specyfikacja ===")
-                            details_content.append(requirements_div.get_text(strip=True))
-                            details_content.append("\n")
-
-                        # Extract Subject of the request content
-                        subject_text = self._extract_subject_from_html(html)
-                        details_content.append("=== Przedmiot zamówienia ===")
-                        details_content.append(subject_text if subject_text else "")
-
-                        
-                        # Extract Criteria and formal conditions content
-                        criteria_table = soup.select_one("table.table-criterium")
-                        if criteria_table:
-                            details_content.append("=== Kryteria i warunki formalne ===")
-                            # Extract table headers
-                            headers = criteria_table.select("thead th")
-                            if headers:
-                                header_texts = [header.get_text(strip=True) for header in headers]
-                                details_content.append("Headers: " + " | ".join(header_texts))
-                                details_content.append("\n")
-                            
-                            # Extract criteria rows
-                            rows = criteria_table.select("tbody tr")
-                            for row in rows:
-                                cells = row.select("td")
-                                if cells and len(cells) >= 4:  # Ensure we have the main columns
-                                    # Extract: No., Name, Weight, Description
-                                    criteria_data = []
-                                    for i, cell in enumerate(cells[:4]):  # First 4 columns contain the main info
-                                        cell_text = cell.get_text(strip=True)
-                                        if cell_text and not cell_text.isspace():
-                                            criteria_data.append(cell_text)
-                                    
-                                    if criteria_data:
-                                        details_content.append(" | ".join(criteria_data))
-                            details_content.append("\n")
-
-                        # Save tender details as text file
-                        if details_content:
-                            details_filename = f"tender_{tender_id}_details.txt"
-                            details_text = "\n\n".join(details_content)
-                            details_bytes = details_text.encode('utf-8')
-                            processed_files.append(
-                                (details_bytes, details_filename, details_url, details_text[:250], details_bytes)
-                            )
-
-                        # Get file information using JavaScript evaluation
-                        file_data = await page.evaluate('''() => {
-                            const files = [];
-                            document.querySelectorAll('#allAttachmentsTable tbody tr').forEach(row => {
-                                const nameCell = row.querySelector('td:first-child');
-                                const downloadLink = row.querySelector('a.proceeding-file-download');
-                                if (nameCell && downloadLink) {
-                                    let filename = nameCell.textContent.trim();
-                                    // Remove icon text if present
-                                    filename = filename.replace(/^[^a-zA-Z0-9]*/, '').trim();
-                                    files.push({
-                                        filename: filename,
-                                        downloadUrl: downloadLink.href
-                                    });
-                                }
-                            });
-                            return files;
-                        }''')
+                        close_button = await page.query_selector('button.on-widget-close-button')
+                        if close_button:
+                            await close_button.click()
+                            await page.wait_for_timeout(1000)  # Wait for close animation
+                    except Exception as e:
+                        logging.debug(f"No chatbot close button found or error clicking it: {e}")
+                    
+                    html = await page.content()
+                    details_file = self._build_details_file(html, details_url)
+                    if details_file:
+                        processed_files.append(details_file)
+
+                    # Get file information using JavaScript evaluation
+                    file_data = await page.evaluate('''() => {
+                        const files = [];
+                        document.querySelectorAll('#allAttachmentsTable tbody tr').forEach(row => {
+                            const nameCell = row.querySelector('td:first-child');
+                            const downloadLink = row.querySelector('a.proceeding-file-download');
+                            if (nameCell && downloadLink) {
+                                let filename = nameCell.textContent.trim();
+                                // Remove icon text if present
+                                filename = filename.replace(/^[^a-zA-Z0-9]*/, '').trim();
+                                files.push({
+                                    filename: filename,
+                                    downloadUrl: downloadLink.href
+                                });
+                            }
+                        });
+                        return files;
+                    }''')
+
+                    if not file_data:
+                        logging.warning(f"No file data found on attempt {retry_count + 1}")
+                        retry_count += 1
+                        continue
 
-                        if not file_data:
-                            logging.warning(f"No file data found on attempt {retry_count + 1}")
-                            retry_count += 1
-                            continue
+                    for file_info in file_data:
+                        download_retry = 0
+                        while download_retry < 3:  # Retry individual downloads up to 3 times
+                            try:
+                                filename = file_info['filename']
+                                download_url = file_info['downloadUrl']
+                                
+                                if download_url.startswith('//'):
+                                    download_url = f'https:{download_url}'
+                                
+                                # Try to find the download link element
+                                download_links = await page.query_selector_all('a.proceeding-file-download')
+                                download_link = None
+                                
+                                for link in download_links:
+                                    href = await link.get_attribute('href')
+                                    if href and (href == download_url or f'https:{href}' == download_url):
+                                        download_link = link
+                                        break
+                                
+                                if not download_link:
+                                    logging.error(f"Download link not found for {filename}")
+                                    break
 
-                        for file_info in file_data:
-                            download_retry = 0
-                            while download_retry < 3:  # Retry individual downloads up to 3 times
+                                # Ensure the download link is visible and not covered
+                                await download_link.scroll_into_view_if_needed()
+                                # Close the chatbot widget again, in case it reappeared
                                 try:
-                                    filename = file_info['filename']
-                                    download_url = file_info['downloadUrl']
-                                    
-                                    if download_url.startswith('//'):
-                                        download_url = f'https:{download_url}'
-                                    
-                                    # Try to find the download link element
-                                    download_links = await page.query_selector_all('a.proceeding-file-download')
-                                    download_link = None
+                                    close_button = await page.query_selector('button.on-widget-close-button')
+                                    if close_button:
+                                        await close_button.click()
+                                        await page.wait_for_timeout(500)  # Brief wait for close
+                                except Exception as e:
+                                    logging.debug(f"No chatbot close button found: {e}")
+                                
+                                # Setup download handling with timeout
+                                async with page.expect_download(timeout=30000) as download_info:
+                                    await download_link.click()
+                                    download = await download_info.value
                                     
-                                    for link in download_links:
-                                        href = await link.get_attribute('href')
-                                        if href and (href == download_url or f'https:{href}' == download_url):
-                                            download_link = link
-                                            break
+                                    # Generate unique temp path
+                                    temp_path = temp_dir / f"{filename}"
                                     
-                                    if not download_link:
-                                        logging.error(f"Download link not found for {filename}")
-                                        break
-
-                                    # Ensure the download link is visible and not covered
-                                    await download_link.scroll_into_view_if_needed()
-                                    # Close the chatbot widget again, in case it reappeared
-                                    try:
-                                        close_button = await page.query_selector('button.on-widget-close-button')
-                                        if close_button:
-                                            await close_button.click()
-                                            await page.wait_for_timeout(500)  # Brief wait for close
-                                    except Exception as e:
-                                        logging.debug(f"No chatbot close button found: {e}")
+                                    # Save download directly to temp path
+                                    await download.save_as(temp_path)
                                     
-                                    # Setup download handling with timeout
-                                    async with page.expect_download(timeout=30000) as download_info:
-                                        await download_link.click()
-                                        download = await download_info.value
-                                        
-                                        # Generate unique temp path
-                                        temp_path = temp_dir / f"{filename}"
-                                        
-                                        # Save download directly to temp path
-                                        await download.save_as(temp_path)
+                                    if temp_path.exists() and temp_path.stat().st_size > 0:
+                                        # Process the file using async wrapper
+                                        file_results = await extraction_service.process_file_async(temp_path)
+                                        for (file_content, filename, preview_chars, original_bytes, original_filename) in file_results:
+                                            processed_files.append(
+                                                (file_content, filename, download_url, preview_chars, original_bytes)
+                                            )
                                         
-                                        if temp_path.exists() and temp_path.stat().st_size > 0:
-                                            # Process the file using async wrapper
-                                            file_results = await extraction_service.process_file_async(temp_path)
-                                            for (file_content, filename, preview_chars, original_bytes, original_filename) in file_results:
-                                                processed_files.append(
-                                                    (file_content, filename, download_url, preview_chars, original_bytes)
-                                                )
-                                            
-                                            logging.info(f"Successfully downloaded and processed: {filename}")
-                                            break  # Success, exit retry loop
-                                        else:
-                                            raise Exception("Downloaded file is empty or missing")
-
-                                    # Add delay between downloads
-                                    await page.wait_for_timeout(random.uniform(1000, 2000))
+                                        logging.info(f"Successfully downloaded and processed: {filename}")
+                                        break  # Success, exit retry loop
+                                    else:
+                                        raise Exception("Downloaded file is empty or missing")
 
-                                except Exception as e:
-                                    logging.error(f"Download attempt {download_retry + 1} failed for {filename}: {str(e)}")
-                                    download_retry += 1
-                                    if download_retry < 3:
-                                        await page.wait_for_timeout(random.uniform(2000, 4000))
-
-                        if processed_files:
-                            success = True
-                            logging.info(f"Successfully processed {len(processed_files)} files")
-                        else:
-                            retry_count += 1
-                            if retry_count < MAX_RETRIES:
-                                logging.warning(f"No files processed, attempt {retry_count + 1} of {MAX_RETRIES}")
-                                await page.wait_for_timeout(random.uniform(2000, 5000))
-                            else:
-                                logging.error("Failed to process any files after all retries")
+                                # Add delay between downloads
+                                await page.wait_for_timeout(random.uniform(1000, 2000))
 
-                    except Exception as e:
-                        logging.error(f"Error during page processing attempt {retry_count + 1}: {str(e)}")
+                            except Exception as e:
+                                logging.error(f"Download attempt {download_retry + 1} failed for {filename}: {str(e)}")
+                                download_retry += 1
+                                if download_retry < 3:
+                                    await page.wait_for_timeout(random.uniform(2000, 4000))
+
+                    if processed_files:
+                        success = True
+                        logging.info(f"Successfully processed {len(processed_files)} files")
+                    else:
                         retry_count += 1
                         if retry_count < MAX_RETRIES:
+                            logging.warning(f"No files processed, attempt {retry_count + 1} of {MAX_RETRIES}")
                             await page.wait_for_timeout(random.uniform(2000, 5000))
+                        else:
+                            logging.error("Failed to process any files after all retries")
+
+                except Exception as e:
+                    logging.error(f"Error during page processing attempt {retry_count + 1}: {str(e)}")
+                    retry_count += 1
+                    if retry_count < MAX_RETRIES:
+                        await page.wait_for_timeout(random.uniform(2000, 5000))
 
             # === Start BZP Budget Extraction Logic ===
             plan_num, plan_id = None, None
@@ -393,7 +471,8 @@ class PlatformaZakupowaTenderExtractor:
             logging.error(f"Error accessing detail page {details_url}: {str(e)}")
         finally:
             try:
-                await page.close()
+                if page:
+                    await page.close()
                 if temp_dir and temp_dir.exists():
                     shutil.rmtree(temp_dir, ignore_errors=True)
             except Exception as e:
@@ -476,8 +555,17 @@ class PlatformaZakupowaTenderExtractor:
         
         return "; ".join(rows) if rows else None
 
-    async def _fetch_tender_subject(self, context, detail_url: str) -> Optional[str]:
+    async def _fetch_tender_subject(self, context, detail_url: str, html: Optional[str] = None) -> Optional[str]:
+        """Subject of a tender; pass the detail page's `html` when it was already fetched"""
         logging.info(f"Fetching tender subject from detail URL: {detail_url}")
+        if html is None:
+            html = await http_fetcher.get_html(detail_url, self.source_type, context, must_contain="proceeding-info")
+        if html is not None:
+            txt = self._extract_subject_from_html(html)
+            if txt:
+                logging.info("Successfully extracted tender subject from HTML.")
+                return txt
+
         page = await context.new_page()
         try:
             await self._goto_with_retry(page, detail_url,
@@ -604,6 +692,38 @@ class PlatformaZakupowaTenderExtractor:
         return None
 
 
+    async def _listing_detail_urls(self, tender_rows) -> List[str]:
+        urls = []
+        for row in tender_rows:
+            title_link = await row.query_selector("a.auction-title")
+            href = await title_link.get_attribute("href") if title_link else None
+            if href:
+                urls.append(href if href.startswith("http") else f"{self.base_url}{href}")
+        return urls
+
+    async def _prefetch_details(self, context, detail_urls: List[str]) -> Dict[str, Tuple[dict, Optional[str]]]:
+        """
+        Detail info and subject for every tender of a listing page, fetched
+        concurrently; the host limiter decides how fast the site is hit.
+        """
+        semaphore = asyncio.Semaphore(host_limiter.max_concurrency(self.source_type))
+
+        async def fetch(detail_url: str):
+            async with semaphore:
+                # One fetch of the detail page serves both the detail info and the subject
+                detail_info, html = await self._fetch_detail_page(context, detail_url)
+                subject = await self._fetch_tender_subject(context, detail_url, html)
+                return detail_url, (detail_info, subject)
+
+        results = await asyncio.gather(*(fetch(url) for url in detail_urls), return_exceptions=True)
+        prefetched = {}
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error(f"{self.source_type}: Error prefetching detail page: {result}")
+                continue
+            prefetched[result[0]] = result[1]
+        return prefetched
+
     async def execute(self, inputs: Dict) -> Dict:
         """Main execution method to scrape tenders"""
         max_pages = inputs.get('max_pages', 70)
@@ -622,8 +742,7 @@ class PlatformaZakupowaTenderExtractor:
             logging.info("Starting extraction with no start_date.")
 
         # Use a try/finally around the entire browser usage
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             try:
                 context = await browser.new_context()
                 page = await context.new_page()
@@ -647,6 +766,8 @@ class PlatformaZakupowaTenderExtractor:
                             logging.info("No more tenders found")
                             break
 
+                        prefetched = await self._prefetch_details(context, await self._listing_detail_urls(tender_rows))
+
                         for row in tender_rows:
                             try:
                                 # Get tender link and title
@@ -675,7 +796,11 @@ class PlatformaZakupowaTenderExtractor:
                                         organization = org_lines[1].strip()
 
                                 # Get details from tender page FIRST to check for deadline
-                                detail_info = await self.fetch_detail_info(context, detail_url)
+                                if detail_url in prefetched:
+                                    detail_info, subject = prefetched[detail_url]
+                                else:
+                                    detail_info, html = await self._fetch_detail_page(context, detail_url)
+                                    subject = await self._fetch_tender_subject(context, detail_url, html)
 
                                 # Use deadline from detail page if available (YYYY-MM-DD format)
                                 submission_deadline = detail_info.get("submission_deadline_detail", None)
@@ -729,9 +854,6 @@ class PlatformaZakupowaTenderExtractor:
                                     submission_deadline = ""
                                 logging.info(f'[Tender: {name[:30]}...] Final submission deadline: "{submission_deadline}"')
 
-                                # Create tender object
-                                subject = await self._fetch_tender_subject(context, detail_url)      # NEW
-
                                 pub_dt = None
                                 
                                 if start_dt and detail_info.get("initiation_date"):
@@ -955,8 +1077,7 @@ class PlatformaZakupowaTenderExtractor:
         updates_found: Dict[str, List[Tuple[str, bytes, str, str]]] = {}
 
         # A single playwright context for all checks
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             context = await browser.new_context()
 
             for tender in tenders_to_monitor:
@@ -13,7 +13,8 @@ import urllib.parse
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 from minerva.core.services.vectorstore.pinecone.query import QueryConfig, QueryTool
 from minerva.core.utils.date_standardizer import DateStandardizer
-from playwright.async_api import async_playwright, BrowserContext, Page
+from playwright.async_api import BrowserContext, Page
+from minerva.core.services.browser_pool import browser_pool
 from bs4 import BeautifulSoup
 
 # Adjust these imports to your actual project structure
@@ -242,8 +243,7 @@ class SmartPZPTenderExtractor:
         else:
             logging.info("Starting extraction with no start_date.")
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             context = await browser.new_context()
             page = await context.new_page()
 
@@ -965,8 +965,7 @@ class SmartPZPTenderExtractor:
         """
         updates_found: Dict[str, List[Tuple[str, bytes, str]]] = {}
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type) as browser:
             context = await browser.new_context()
 
             for tender in tenders_to_monitor:
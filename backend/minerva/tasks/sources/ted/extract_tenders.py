@@ -11,44 +11,35 @@ from uuid import uuid4
 from minerva.core.models.extensions.tenders.tender_analysis import TenderAnalysisResult
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
 from minerva.core.services.vectorstore.pinecone.query import QueryConfig, QueryTool
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
+from minerva.core.services.http_fetcher import http_fetcher
+from minerva.core.services.rate_limiter import THROTTLE_STATUSES, host_limiter
 
 from minerva.core.database.database import db
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
 
 
-async def safe_goto(page, url, max_retries=3, initial_backoff=120, **kwargs):
+async def safe_goto(page, url, max_retries=3, source=None, **kwargs):
     """
-    Navigate to a URL with enhanced retry logic. If any error is encountered,
-    wait with random jitter and then retry.
+    Navigate to a URL through the shared host limiter, which paces requests
+    and backs off on 429/5xx and timeouts; failed attempts are retried.
     """
-    backoff = initial_backoff
     for attempt in range(max_retries + 1):
         try:
-            # Add random delay before each attempt to spread out requests
             if attempt > 0:
-                jitter = random.uniform(0.5, 1.5)  # Random multiplier
-                delay = backoff * jitter
-                logging.warning(
-                    f"Retrying navigation to {url} after {delay:.1f} seconds "
-                    f"(attempt {attempt + 1}/{max_retries + 1})."
-                )
-                await asyncio.sleep(delay)
-            
-            await page.goto(url, **kwargs)
-            # Add small random delay after successful navigation
-            await asyncio.sleep(random.uniform(1, 3))
+                logging.warning(f"Retrying navigation to {url} (attempt {attempt + 1}/{max_retries + 1}).")
+
+            async with host_limiter.slot(url, source) as slot:
+                response = await page.goto(url, **kwargs)
+                if response is not None:
+                    slot.record(response.status, response.headers.get("retry-after"))
+            if response is not None and response.status in THROTTLE_STATUSES:
+                raise Exception(f"HTTP {response.status} from {url}")
             return  # success
         except Exception as e:
             error_msg = str(e).lower()
-            if "429" in error_msg or "timeout" in error_msg or "net::err" in error_msg:
-                if attempt < max_retries:
-                    # Exponential backoff with jitter for various error types
-                    if "429" in error_msg:
-                        backoff = min(backoff * 2, 600)  # Cap at 10 minutes
-                    else:
-                        backoff = min(backoff * 1.5, 300)  # Cap at 5 minutes for other errors
-                else:
+            if "429" in error_msg or "503" in error_msg or "timeout" in error_msg or "net::err" in error_msg:
+                if attempt >= max_retries:
                     logging.error(
                         f"Failed to navigate to {url} after {max_retries + 1} attempts: {str(e)}"
                     )
@@ -140,8 +131,7 @@ class BaseTedCountryExtractor:
 
             while retry_count < MAX_RETRIES and not success:
                 try:
-                    await page.wait_for_timeout(random.uniform(1000, 3000))
-                    await safe_goto(page, details_url, wait_until='networkidle', timeout=30000)
+                    await safe_goto(page, details_url, source=self.source_type_name, wait_until='networkidle', timeout=30000)
 
                     try:
                         tender_id = await page.locator("div.notice-id").first.inner_text()
@@ -187,6 +177,24 @@ class BaseTedCountryExtractor:
                                                 download_url = f"https://ted.europa.eu{download_url}"
                                             self.logger.debug(f"Attempting download from: {download_url}")
 
+                                            # Notice PDFs are static files; the click is only a fallback
+                                            http_path = await http_fetcher.download(
+                                                download_url, temp_dir, self.source_type_name, context
+                                            )
+                                            if http_path is not None:
+                                                temp_path = http_path.rename(
+                                                    temp_dir / f"{lang_text.lower()}_file{http_path.suffix or '.pdf'}"
+                                                )
+                                                file_results = await extraction_service.process_file_async(temp_path)
+                                                for (file_content, filename, preview_chars, original_bytes, original_filename) in file_results:
+                                                    output_filename = filename
+                                                    if output_filename.endswith('.txt'):
+                                                        output_filename = f"{lang_text.lower()}_file.txt"
+                                                    processed_files.append((file_content, output_filename, details_url, preview_chars, original_bytes))
+                                                processed_languages.add(lang_text)
+                                                self.logger.info(f"Successfully processed over HTTP: {temp_path.name}")
+                                                break
+
                                             async with page.expect_download(timeout=30000) as download_info:
                                                 await link_elem.click()
                                                 download = await download_info.value
@@ -265,7 +273,7 @@ class BaseTedCountryExtractor:
                     logging.warning(f"Retrying detail page extraction after {delay:.1f} seconds (attempt {attempt + 1})")
                     await asyncio.sleep(delay)
                 
-                await safe_goto(page, detail_url, max_retries=2, initial_backoff=15, wait_until='networkidle', timeout=30000)
+                await safe_goto(page, detail_url, max_retries=2, source=self.source_type_name, wait_until='networkidle', timeout=30000)
                 
                 try:
                     # First check for notice type in the summary section
@@ -317,6 +325,40 @@ class BaseTedCountryExtractor:
             
         return organization, notice_type
 
+    async def _add_detail_tenders(self, context, pending_details: List[Dict], tenders: List[Tender]):
+        """
+        Fetch organization and notice type for a listing page's rows
+        concurrently; the host limiter decides how fast TED is hit.
+        """
+        semaphore = asyncio.Semaphore(host_limiter.max_concurrency(self.source_type_name))
+
+        async def fetch(detail_url: str) -> Tuple[str, str]:
+            async with semaphore:
+                return await self.get_organization_from_detail_page(context, detail_url)
+
+        details = await asyncio.gather(
+            *(fetch(d["details_url"]) for d in pending_details), return_exceptions=True
+        )
+        for tender_data, detail in zip(pending_details, details):
+            if isinstance(detail, Exception):
+                logging.error(f"Error fetching detail page {tender_data['details_url']}: {detail}")
+                organization, notice_type = "", ""
+            else:
+                organization, notice_type = detail
+
+            # Skip if this is a result notice
+            if notice_type and "Result" in notice_type:
+                logging.info(f"Skipping result notice at {tender_data['details_url']}")
+                continue
+
+            tender_data["organization"] = organization or "Unknown from detail page"
+            try:
+                tender = Tender(**tender_data)
+                tenders.append(tender)
+                logging.debug(f"Added tender: {tender.name} ({tender.details_url})")
+            except Exception as e:
+                logging.error(f"Error creating tender object: {e}")
+
     async def execute(self, inputs: Dict) -> Dict:
         max_pages = inputs.get("max_pages", 1)
         start_date_str = inputs.get("start_date")  # e.g., "2025-01-01"
@@ -336,16 +378,15 @@ class BaseTedCountryExtractor:
             "&page=1&simpleSearchRef=true"
         )
 
-        async with async_playwright() as p:
+        async with browser_pool.browser(source=self.source_type_name) as browser:
             logging.info(f"Launching headless browser for {self.country_code} TED scraping...")
-            browser = await p.chromium.launch(headless=True)
             try:
                 context = await browser.new_context()
                 page = await context.new_page()
 
                 logging.info(f"Navigating to {listing_url}")
                 try:
-                    await safe_goto(page, listing_url, max_retries=3, initial_backoff=30, wait_until='networkidle', timeout=45000)
+                    await safe_goto(page, listing_url, max_retries=3, source=self.source_type_name, wait_until='networkidle', timeout=45000)
                 except Exception as e:
                     logging.error(f"Could not navigate to {listing_url}. Error: {e}")
                     return {
@@ -364,6 +405,7 @@ class BaseTedCountryExtractor:
                     page_processed = False
                     
                     while page_retry_count < 3 and not page_processed:
+                        pending_details = []
                         try:
                             # Wait for page content with retry logic
                             await safe_wait_for_selector(page, "table tbody tr", timeout=20000, max_retries=2)
@@ -392,9 +434,10 @@ class BaseTedCountryExtractor:
                                     f"Row count ({row_count}) on page {current_page} is unexpectedly low. "
                                     "Waiting and reloading page."
                                 )
-                                # Random delay before reload
-                                await asyncio.sleep(random.uniform(60, 120))
-                                await page.reload(wait_until='networkidle', timeout=45000)
+                                # A half-rendered listing is TED throttling us; let the limiter pause the host
+                                host_limiter.report_throttled(listing_url, self.source_type_name)
+                                async with host_limiter.slot(listing_url, self.source_type_name):
+                                    await page.reload(wait_until='networkidle', timeout=45000)
                                 await safe_wait_for_selector(page, "table tbody tr", timeout=20000, max_retries=2)
                                 rows = page.locator("table tbody tr")
                                 row_count = await rows.count()
@@ -536,36 +579,21 @@ class BaseTedCountryExtractor:
                                                 submission_deadline = submission_deadline_raw
 
                                     country = (await cells.nth(3).inner_text()).strip()
-                                    
-                                    # Add small delay between detail page requests to avoid overwhelming
-                                    await asyncio.sleep(random.uniform(0.5, 1.5))
-                                    organization, notice_type = await self.get_organization_from_detail_page(context, detail_url)
-
-                                    # Skip if this is a result notice
-                                    if notice_type and "Result" in notice_type:
-                                        logging.info(f"Skipping result notice at {detail_url}")
-                                        continue
 
-                                    tender_data = {
+                                    # Organization comes from the detail page, fetched below for the whole listing page
+                                    pending_details.append({
                                         "name": name,
-                                        "organization": organization or "Unknown from detail page",
                                         "location": country,
                                         "submission_deadline": submission_deadline,
                                         "initiation_date": iso_initiation_date,
                                         "details_url": detail_url,
                                         "content_type": "tender",
                                         "source_type": self.source_type_name
-                                    }
-
-                                    try:
-                                        tender = Tender(**tender_data)
-                                        tenders.append(tender)
-                                        logging.debug(f"Added tender: {tender.name} ({tender.details_url})")
-                                    except Exception as e:
-                                        logging.error(f"Error creating tender object: {e}")
+                                    })
                                 except Exception as e:
                                     logging.error(f"Error processing row {row_index} on page {current_page}: {e}")
 
+                            await self._add_detail_tenders(context, pending_details, tenders)
                             page_processed = True
                             
                         except Exception as e:
@@ -653,8 +681,7 @@ class BaseTedCountryExtractor:
         self.logger.info(f"Starting update check after {update_delay:.1f} second delay")
         await asyncio.sleep(update_delay)
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self.source_type_name) as browser:
             context = await browser.new_context()
 
             try:
@@ -671,9 +698,7 @@ class BaseTedCountryExtractor:
 
                     # Go to the tender_url with enhanced retry logic
                     try:
-                        await safe_goto(page, url, max_retries=2, initial_backoff=15, wait_until='networkidle', timeout=30000)
-                        # Add small random delay after navigation
-                        await asyncio.sleep(random.uniform(1, 2))
+                        await safe_goto(page, url, max_retries=2, source=self.source_type_name, wait_until='networkidle', timeout=30000)
                     except Exception as e:
                         self.logger.error(f"Could not navigate to {url}: {e}")
                         await page.close()
@@ -7,7 +7,7 @@ from pathlib import Path
 from uuid import uuid4
 from typing import Dict, List, Tuple, Optional
 from minerva.core.services.vectorstore.file_content_extract.service import FileExtractionService
-from playwright.async_api import async_playwright
+from minerva.core.services.browser_pool import browser_pool
 from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -144,8 +144,7 @@ class DTVPLikeTenderExtractor():
         tenders: List[Tender] = []
         pages_visited = 0
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self._fallback_source_type) as browser:
             try:
                 context = await browser.new_context()
 
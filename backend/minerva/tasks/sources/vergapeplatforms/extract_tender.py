@@ -13,7 +13,8 @@ from minerva.core.models.request.tender_extract import ExtractorMetadata, Tender
 from minerva.core.services.vectorstore.file_content_extract.service import (
     FileExtractionService,
 )
-from playwright.async_api import async_playwright, BrowserContext, Page, TimeoutError
+from playwright.async_api import BrowserContext, Page, TimeoutError
+from minerva.core.services.browser_pool import browser_pool
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -163,8 +164,7 @@ class VergabePlatformsTenderExtractor:
         tenders: List[Tender] = []
         pages_visited = 0
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
+        async with browser_pool.browser(source=self._fallback_source_type) as browser:
             try:
                 context = await browser.new_context()
 
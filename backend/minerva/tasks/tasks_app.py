@@ -105,6 +105,16 @@ def configure_scheduler(loop):
             name=f"cleanup_worker_{worker_index}",
             replace_existing=True
         )
+        if worker_index == 0:
+            # Per-analysis cleanup leaves shared content-addressed files in place; reclaim orphaned ones
+            from minerva.core.helpers.s3_upload import sweep_unreferenced_content
+            sweep_min_age_days = int(os.getenv("S3_CONTENT_SWEEP_MIN_AGE_DAYS", "7"))
+            scheduler.add_job(
+                lambda: run_coroutine(sweep_unreferenced_content(sweep_min_age_days)),
+                trigger=CronTrigger(hour=3, minute=0, day_of_week='sun', timezone="Europe/Warsaw"),
+                name="s3_content_sweep",
+                replace_existing=True
+            )
     elif worker_type == "external" and worker_index == 0:
         async def external_scraping_job(target_date):
             import sys as _sys
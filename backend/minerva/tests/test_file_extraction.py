@@ -0,0 +1,36 @@
+import zipfile
+
+import pytest
+
+pytest.importorskip("pandas")
+service_module = pytest.importorskip("minerva.core.services.vectorstore.file_content_extract.service")
+
+from minerva.core.services.vectorstore.file_content_extract import cache as cache_module
+from minerva.core.services.vectorstore.file_content_extract.cache import ExtractionCache
+
+
+@pytest.fixture(params=[True, False], ids=["cache", "no-cache"])
+def extraction_cache(request, monkeypatch, tmp_path):
+    monkeypatch.setattr(cache_module, "EXTRACTION_CACHE_ENABLED", request.param)
+    monkeypatch.setattr(cache_module, "extraction_cache", ExtractionCache(cache_dir=str(tmp_path / "cache")))
+
+
+def test_process_file_keeps_each_archive_member_bytes(extraction_cache, tmp_path):
+    members = {
+        "first.csv": b"name,amount\nalpha,1\n",
+        "second.csv": b"city,population\nGdansk,470000\nKrakow,800000\n",
+    }
+    archive_path = tmp_path / "tender_files.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+    service = service_module.FileExtractionService()
+    # The second pass replays the inner files from the extraction cache when it is enabled
+    for _ in range(2):
+        processed = service.process_file(archive_path)
+
+        assert sorted(name for *_, name in processed) == sorted(members)
+        for text, _, _, original_bytes, original_name in processed:
+            assert original_bytes == members[original_name]
+            assert text
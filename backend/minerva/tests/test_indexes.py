@@ -0,0 +1,74 @@
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+
+motor_asyncio = pytest.importorskip("motor.motor_asyncio")
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from minerva.core.database.indexes import ensure_indexes
+from minerva.core.models.indexes import INDEXES
+
+# Runs against a throwaway database on a local mongod; skipped when none is reachable
+MONGODB_TEST_URI = os.getenv("MONGODB_TEST_URI", "mongodb://localhost:27017")
+
+
+@pytest_asyncio.fixture
+async def test_db():
+    client = motor_asyncio.AsyncIOMotorClient(MONGODB_TEST_URI, serverSelectionTimeoutMS=1000)
+    try:
+        await client.admin.command("ping")
+    except Exception:
+        client.close()
+        pytest.skip(f"No mongod reachable at {MONGODB_TEST_URI}")
+    name = f"minerva_index_test_{uuid.uuid4().hex[:8]}"
+    yield client[name]
+    await client.drop_database(name)
+    client.close()
+
+
+def _names(report, kind):
+    return {(collection, name) for collection, entry in report.items() for name in entry[kind]}
+
+
+@pytest.mark.asyncio
+async def test_registry_is_created_and_idempotent(test_db):
+    declared = {(collection, m.document["name"]) for collection, models in INDEXES.items() for m in models}
+
+    first = await ensure_indexes(test_db)
+    assert _names(first, "created") == declared
+    assert not _names(first, "drift")
+
+    second = await ensure_indexes(test_db)
+    assert not _names(second, "created")
+    assert not _names(second, "drift")
+    assert not _names(second, "missing")
+
+    info = await test_db.tender_analysis_results.index_information()
+    assert info["analysis_created_at_id"]["key"] == [("tender_analysis_id", 1), ("created_at", -1), ("_id", -1)]
+
+
+@pytest.mark.asyncio
+async def test_check_mode_reports_missing_without_creating(test_db):
+    report = await ensure_indexes(test_db, create=False)
+
+    assert ("users", "email") in _names(report, "missing")
+    assert "email" not in await test_db.users.index_information()
+
+
+@pytest.mark.asyncio
+async def test_drift_and_unused_are_reported(test_db):
+    registry = {"things": [IndexModel([("a", ASCENDING)], name="a_idx")]}
+    await test_db.things.create_index([("a", DESCENDING)], name="a_idx")
+    await test_db.things.create_index([("b", ASCENDING)], name="b_idx")
+
+    report = await ensure_indexes(test_db, registry=registry)
+    assert report["things"]["drift"] == ["a_idx"]
+    assert list(report["things"]["unused"]) == ["b_idx"]
+    # Drifted indexes are never rebuilt automatically
+    assert (await test_db.things.index_information())["a_idx"]["key"] == [("a", -1)]
+
+    await ensure_indexes(test_db, registry=registry, drop_unused=True)
+    assert "b_idx" not in await test_db.things.index_information()
@@ -0,0 +1,138 @@
+import concurrent.futures
+import importlib.util
+import sys
+import time
+import types
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("pytesseract")
+pytest.importorskip("pdf2image")
+
+from minerva.core.services import ocr_engine as ocr_module
+from minerva.core.services.ocr_engine import OCREngine
+
+# How the analysis worker is started in production (python -m ...)
+WORKER_ENTRYPOINT = "minerva.tasks.analyses.analysis_worker"
+
+
+def _child_has_transformers() -> bool:
+    return "transformers" in sys.modules
+
+
+def test_ocr_workers_do_not_load_clip(monkeypatch):
+    if "transformers" in sys.modules:
+        pytest.skip("transformers already imported in this session")
+    pytest.importorskip(WORKER_ENTRYPOINT)
+    # Importing the entrypoint must not load CLIP either
+    assert "transformers" not in sys.modules
+
+    # A spawn child re-imports the parent's __main__; make that the worker entrypoint
+    fake_main = types.ModuleType("__main__")
+    fake_main.__spec__ = importlib.util.find_spec(WORKER_ENTRYPOINT)
+    fake_main.__file__ = fake_main.__spec__.origin
+    monkeypatch.setitem(sys.modules, "__main__", fake_main)
+
+    engine = OCREngine(processes=1)
+    try:
+        assert engine._get_pool().submit(_child_has_transformers).result(timeout=120) is False
+    finally:
+        engine.shutdown()
+
+
+def _fake_page_range(calls):
+    def ocr_page_range(pdf_path, first, last, dpi, confidence_threshold):
+        calls.append((first, last))
+        # Later ranges finish first, so output order cannot come from completion order
+        time.sleep(0.01 * (10 - first) / 10)
+        return [f"page {n}" for n in range(first, last + 1)]
+    return ocr_page_range
+
+
+class _BrokenPool:
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("pool is broken")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def ten_page_pdf(monkeypatch):
+    monkeypatch.setattr(ocr_module, "pdfinfo_from_path", lambda path: {"Pages": 10})
+    calls = []
+    monkeypatch.setattr(ocr_module, "ocr_page_range", _fake_page_range(calls))
+    return calls
+
+
+def test_iter_page_texts_keeps_document_order(monkeypatch, ten_page_pdf):
+    engine = OCREngine(processes=4, pages_per_task=3)
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(engine, "_get_pool", lambda: pool)
+    try:
+        texts = list(engine.iter_page_texts(b"%PDF"))
+    finally:
+        pool.shutdown()
+
+    assert texts == [f"page {n}" for n in range(1, 11)]
+    assert sorted(ten_page_pdf) == [(1, 3), (4, 6), (7, 9), (10, 10)]
+
+
+def test_iter_page_texts_runs_in_process_when_pool_is_broken(monkeypatch, ten_page_pdf):
+    engine = OCREngine(processes=2, pages_per_task=4)
+    engine._pool = _BrokenPool()
+
+    texts = list(engine.iter_page_texts(b"%PDF"))
+
+    assert texts == [f"page {n}" for n in range(1, 11)]
+    assert ten_page_pdf == [(1, 4), (5, 8), (9, 10)]
+    assert engine._pool is None
+
+
+def test_iter_page_texts_redoes_crashed_range_in_process(monkeypatch, ten_page_pdf):
+    engine = OCREngine(processes=2, pages_per_task=5)
+
+    class CrashingPool(_BrokenPool):
+        def submit(self, fn, pdf_path, first, last, *args):
+            future = concurrent.futures.Future()
+            if first == 1:
+                future.set_exception(BrokenProcessPool("worker died"))
+            else:
+                future.set_result(fn(pdf_path, first, last, *args))
+            return future
+
+    engine._pool = CrashingPool()
+    texts = list(engine.iter_page_texts(b"%PDF"))
+
+    assert texts == [f"page {n}" for n in range(1, 11)]
+    assert ten_page_pdf == [(6, 10), (1, 5)]
+    assert engine._pool is None
+
+
+def _stub_tesseract(monkeypatch, results):
+    calls = []
+
+    def tess_data(img, psm, lang="pol+eng"):
+        calls.append(psm)
+        return results[len(calls) - 1]
+
+    monkeypatch.setattr(ocr_module, "preprocess_pil", lambda img: (img, img))
+    monkeypatch.setattr(ocr_module, "pick_psm", lambda img: "3")
+    monkeypatch.setattr(ocr_module, "tess_data", tess_data)
+    return calls
+
+
+def test_ocr_image_skips_second_pass_when_confident(monkeypatch):
+    calls = _stub_tesseract(monkeypatch, [("first", 80.0), ("second", 95.0)])
+
+    assert ocr_module.ocr_image(object(), confidence_threshold=60) == "first"
+    assert calls == ["3"]
+
+
+def test_ocr_image_keeps_the_more_confident_pass(monkeypatch):
+    calls = _stub_tesseract(monkeypatch, [("first", 40.0), ("second", 55.0)])
+
+    assert ocr_module.ocr_image(object(), confidence_threshold=60) == "second"
+    assert calls == ["3", "4"]
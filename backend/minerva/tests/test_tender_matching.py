@@ -0,0 +1,161 @@
+import random
+import re
+from urllib.parse import urlparse
+
+import pytest
+
+pytest.importorskip("rapidfuzz")
+
+from minerva.core.helpers.tender_matching import GENERIC_ORG_TOKENS, TenderMatchIndex, is_same_tender, pair_tenders
+
+
+def legacy_is_same_tender(a: dict, b: dict) -> bool:
+    """is_same_tender as it was before the blocking matcher, kept verbatim as the reference"""
+    LEGAL_SUFFIXES = (
+        r"\b(sp[.\s]*z[.\s]*o[.\s]*o[.]?)\b",
+        r"\b(spółka z\s+ograniczoną\s+odpowiedzialnością)\b",
+        r"\b(gmina)\b",
+        r"\b(cukit|cul|cuk)\b",
+    )
+    LEGAL_SUFFIX_RX = re.compile("|".join(LEGAL_SUFFIXES), re.I)
+    NOTICE_ID_RX = re.compile(r"/(\d{4,})(?:/|$)")
+    STOPWORDS = (GENERIC_ORG_TOKENS or set()) | {"w", "im", "przy", "dla"}
+    def normalise(txt: str | None) -> str:
+        if not txt:
+            return ""
+        txt = re.sub(rf"[„”\"',()\-–{re.escape('.:/')}]", " ", txt.lower())
+        txt = LEGAL_SUFFIX_RX.sub(" ", txt)
+        txt = re.sub(r"\s+", " ", txt).strip()
+        return txt
+    def extract_numeric_id(url: str | None, title: str | None) -> str | None:
+        if url:
+            m = NOTICE_ID_RX.search(url)
+            if m:
+                host = urlparse(url).hostname or ""
+                return f"{host}:{m.group(1)}"
+        if title:
+            m = NOTICE_ID_RX.search(title)
+            if m:
+                return m.group(1)
+        return None
+    def portal_family(url: str | None) -> str:
+        if not url:
+            return ""
+        host = urlparse(url).hostname or ""
+        parts = host.lower().split(".")
+        return ".".join(parts[-2:]) if len(parts) >= 2 else host.lower()
+    def distinctive_tokens(org: str) -> set[str]:
+        return {tok for tok in org.split() if tok and tok not in STOPWORDS}
+    ida = extract_numeric_id(a.get("id"), a.get("name"))
+    idb = extract_numeric_id(b.get("id"), b.get("name"))
+    if ida and idb and ida == idb:
+        return True
+    if portal_family(a.get("id")) != portal_family(b.get("id")):
+        return False
+    org_a = normalise(a.get("organization"))
+    org_b = normalise(b.get("organization"))
+    if distinctive_tokens(org_a).isdisjoint(distinctive_tokens(org_b)):
+        return False
+    name_a = normalise(a.get("name"))
+    name_b = normalise(b.get("name"))
+    from rapidfuzz import fuzz
+    title_score = fuzz.token_set_ratio(name_a, name_b) / 100
+    if title_score >= 0.93:
+        return True
+    tokens_a, tokens_b = set(name_a.split()), set(name_b.split())
+    shorter, longer = (tokens_a, tokens_b) if len(tokens_a) < len(tokens_b) else (tokens_b, tokens_a)
+    if shorter.issubset(longer):
+        return title_score >= 0.80
+    return False
+
+
+def legacy_pairs(left, right):
+    """The O(N*M) loop used by the comparison helpers before pair_tenders"""
+    matched, pairs = set(), []
+    for i, a in enumerate(left):
+        for j, b in enumerate(right):
+            if j in matched:
+                continue
+            if a.get("id") == b.get("id"):
+                pairs.append((i, j, True))
+                matched.add(j)
+                break
+            if legacy_is_same_tender(a, b):
+                pairs.append((i, j, False))
+                matched.add(j)
+                break
+    return pairs
+
+
+HOSTS = [
+    "https://ezamowienia.gov.pl/mp-client/search/list/ocds-148610-{n}",
+    "https://platformazakupowa.pl/transakcja/{n}",
+    "https://gmina-x.ezamawiajacy.pl/pn/x/demand/{n}/notice/public/details",
+    "https://platformazakupowa.pl/pn/{slug}",
+    "",
+    None,
+]
+ORGS = [
+    "Gmina Miasto Kraków", "Gmina Wieliczka", "Zakład Gospodarki Komunalnej Sp. z o.o.",
+    "Szpital Powiatowy w Bochni", "Powiat Tarnowski", "MPWiK S.A.", "Urząd Gminy Zabierzów",
+    "Centrum Usług Wspólnych", "", None,
+]
+WORDS = [
+    "budowa", "przebudowa", "drogi", "gminnej", "dostawa", "sprzętu", "komputerowego",
+    "remont", "szkoły", "podstawowej", "nr", "ul.", "Polnej", "oczyszczalni", "ścieków",
+    "zakup", "energii", "elektrycznej", "2025", "ZP/12345/2025", "/98765/",
+]
+
+
+def _random_tender(rng: random.Random) -> dict:
+    n = rng.choice([12345, 23456, 98765, 4242, rng.randint(1000, 99999)])
+    template = rng.choice(HOSTS)
+    url = template.format(n=n, slug=rng.choice(WORDS)) if template else template
+    name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 7)))
+    return {"id": url, "name": name or rng.choice(["", None]), "organization": rng.choice(ORGS)}
+
+
+def _perturb(rng: random.Random, tender: dict) -> dict:
+    """A near-duplicate: same tender listed with small differences"""
+    copy = dict(tender)
+    if copy["name"] and rng.random() < 0.5:
+        words = copy["name"].split()
+        rng.shuffle(words)
+        copy["name"] = " ".join(words + ([rng.choice(WORDS)] if rng.random() < 0.5 else []))
+    if rng.random() < 0.3:
+        copy["organization"] = rng.choice(ORGS)
+    if rng.random() < 0.2:
+        copy["id"] = _random_tender(rng)["id"]
+    return copy
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_pair_tenders_matches_legacy_loop(seed):
+    rng = random.Random(seed)
+    right = [_random_tender(rng) for _ in range(rng.randint(0, 40))]
+    left = [_perturb(rng, rng.choice(right)) if right and rng.random() < 0.6 else _random_tender(rng)
+            for _ in range(rng.randint(0, 40))]
+
+    assert pair_tenders(left, right) == legacy_pairs(left, right)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_is_same_tender_matches_legacy(seed):
+    rng = random.Random(1000 + seed)
+    tenders = [_random_tender(rng) for _ in range(30)]
+    tenders += [_perturb(rng, t) for t in tenders]
+    for a in tenders:
+        for b in tenders:
+            assert is_same_tender(a, b) == legacy_is_same_tender(a, b)
+
+
+def test_first_match_skips_taken_candidates():
+    right = [
+        {"id": "https://platformazakupowa.pl/transakcja/12345", "name": "Remont szkoły", "organization": "Gmina Wieliczka"},
+        {"id": "https://platformazakupowa.pl/transakcja/12345", "name": "Remont szkoły", "organization": "Gmina Wieliczka"},
+    ]
+    index = TenderMatchIndex(right)
+
+    assert index.first_match(right[0], taken=set()) == (0, True)
+    assert index.first_match(right[0], taken={0}) == (1, True)
+    assert index.first_match(right[0], taken={0, 1}) is None